@@ -0,0 +1,100 @@
+"""Allocations per child when wrapping drive item listings.
+
+Compares the shared DriveItems parent of DriveItem.Children with the old
+per-child Drives -> Drive -> DriveItems chain, on pages modelled on a large
+document library. Items are kept, as a caller collecting them would.
+
+    PYTHONPATH=src python benchmarks/bench_drive_items.py [--items 100000]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+import mgraph_client
+from mgraph_client.drives import DriveItem
+from mgraph_client.resources import Resource
+
+URL = "https://graph.microsoft.com/v1.0/drives/d1/items/root/children"
+
+
+# The previous DriveItem.Children._get_obj, one parent chain per child.
+class PerChildParents(DriveItem.Children):
+    __slots__ = ()
+
+    def _get_obj(self, klass, client, data):
+        drive_items = client.drives.by_id(data["parentReference"]["driveId"]).items
+        return klass(client, data=data, parent=drive_items)
+
+
+def make_page(size: int) -> dict:
+    return {
+        "value": [
+            {
+                "id": f"01BYE5RZ{i:012d}",
+                "name": f"Report {i}.docx",
+                "size": 1000 + i,
+                "parentReference": {"driveId": "d1", "id": "root"},
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def count_resources() -> int:
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, Resource))
+
+
+def run(children_class: type, page: dict) -> dict:
+    client = mgraph_client.MgraphClient("bench", "bench", access_token="token")
+    children = children_class(client, data=page, parent=None)
+    items = len(page["value"])
+
+    gc.collect()
+    resources = count_resources()
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    kept = list(children.iter_fetched_items())
+    seconds = time.perf_counter() - start
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+    resources = count_resources() - resources
+    del kept
+
+    tracemalloc.start()
+    kept = list(children.iter_fetched_items())
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+
+    return {
+        "us_per_child": seconds / items * 1e6,
+        "resources_per_child": resources / items,
+        "blocks_per_child": blocks / items,
+        "bytes_per_child": retained / items,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    page = make_page(args.items)
+    print(f"{args.items} children")
+    print(f"{'':<22}{'us':>8}{'resources':>11}{'blocks':>8}{'bytes':>8}")
+    for name, children_class in (
+        ("per-child parents", PerChildParents),
+        ("shared parent", DriveItem.Children),
+    ):
+        r = run(children_class, page)
+        print(
+            f"{name:<22}{r['us_per_child']:8.2f}{r['resources_per_child']:11.2f}"
+            f"{r['blocks_per_child']:8.2f}{r['bytes_per_child']:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Time `import mgraph_client` in fresh interpreters against a budget.
+
+The budget applies to the package's own share, requests is imported first
+and timed apart. Also checks that the lazily loaded dependencies, msal,
+asyncio and the model modules, are not imported. Exits with 1 when the
+median is over budget or a lazy module was loaded, so it can gate CI.
+
+    PYTHONPATH=src python benchmarks/bench_import.py [--runs 20] [--budget-ms 80]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+LAZY_MODULES = [
+    "msal",
+    "asyncio",
+    "httpx",
+    "numpy",
+    "orjson",
+    "msgspec",
+    "mgraph_client.async_client",
+    "mgraph_client.device_management",
+    "mgraph_client.directory_objects",
+    "mgraph_client.drives",
+    "mgraph_client.groups",
+    "mgraph_client.sites",
+    "mgraph_client.users",
+]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import requests
+requests_seconds = time.perf_counter() - start
+import mgraph_client
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "requests_seconds": requests_seconds,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT % LAZY_MODULES],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=80.0)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    total = statistics.median(run["seconds"] for run in runs) * 1000
+    requests = statistics.median(run["requests_seconds"] for run in runs) * 1000
+    own = (
+        statistics.median(run["seconds"] - run["requests_seconds"] for run in runs)
+        * 1000
+    )
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+
+    print(f"import mgraph_client  {total:8.1f} ms (median of {args.runs})")
+    print(f"  of which requests   {requests:8.1f} ms")
+    print(f"  mgraph_client own   {own:8.1f} ms")
+    print(f"  budget              {args.budget_ms:8.1f} ms")
+    if loaded:
+        print(f"Lazy modules were imported: {', '.join(loaded)}")
+    if loaded or own > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare the JSON decoders on Graph sized pages.
+
+Pages hold 999 drive items, each expanded with the nested createdBy,
+lastModifiedBy and parentReference objects Graph returns, modelled on
+tests/test.json.
+
+    PYTHONPATH=src python benchmarks/bench_json_decoders.py [--pages 20]
+"""
+
+import argparse
+import json
+import time
+
+from mgraph_client.decoders import DECODERS, MsgspecDecoder, get_decoder
+from mgraph_client.drives import DriveItem
+
+
+def make_page(page: int, size: int = 999) -> bytes:
+    user = {
+        "user": {
+            "email": "MeganB@contoso.com",
+            "id": "48d31887-5fad-4d73-a9f5-3c356e68a038",
+            "displayName": "Megan Bowen",
+        }
+    }
+    items = [
+        {
+            "@odata.etag": f'"{{{page:08d}-{i:04d}}},1"',
+            "id": f"01BYE5RZ{page:06d}{i:06d}",
+            "name": f"Report {page}-{i}.docx",
+            "size": 1000 + i,
+            "webUrl": f"https://contoso.sharepoint.com/Documents/Report%20{page}-{i}.docx",
+            "createdDateTime": "2017-07-27T02:41:36Z",
+            "lastModifiedDateTime": f"2018-03-27T07:34:{i % 60:02d}.1234567Z",
+            "createdBy": user,
+            "lastModifiedBy": user,
+            "parentReference": {
+                "driveId": "b!-RIj2DuyvEyV1T4NlOaMHk8XkS_I8MdFlUCq1BlcjgmhRfAj3",
+                "driveType": "business",
+                "id": "01BYE5RZ56Y2GOVW7725BZO354PWSELRRZ",
+                "path": "/drive/root:",
+            },
+            "file": {
+                "mimeType": "application/vnd.openxmlformats-officedocument"
+                ".wordprocessingml.document",
+                "hashes": {"quickXorHash": "7CE0pRbNHQ3MS5A4GpnCjjuNJ5I="},
+            },
+        }
+        for i in range(size)
+    ]
+    return json.dumps(
+        {
+            "value": items,
+            "@odata.nextLink": f"https://graph.microsoft.com/v1.0/next?page={page}",
+        }
+    ).encode()
+
+
+def measure(func, pages: list[bytes]) -> float:
+    start = time.perf_counter()
+    for content in pages:
+        func(content)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [make_page(i) for i in range(args.pages)]
+    items = args.pages * 999
+    megabytes = sum(map(len, pages)) / 1e6
+    print(f"{args.pages} pages, {items} items, {megabytes:.1f} MB")
+
+    for name in DECODERS:
+        try:
+            decoder = get_decoder(name)
+        except ImportError:
+            print(f"{name:<18} not installed")
+            continue
+
+        runs = {"decode": decoder.decode}
+        if isinstance(decoder, MsgspecDecoder):
+            runs["decode structs"] = decoder.get_page_decoder(DriveItem).decode
+
+        for label, func in runs.items():
+            seconds = min(measure(func, pages) for _ in range(args.repeat))
+            print(
+                f"{name:<8}{label:<16}{seconds * 1000:9.1f} ms"
+                f"{items / seconds:12.0f} items/s{megabytes / seconds:8.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
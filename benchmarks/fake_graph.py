@@ -0,0 +1,287 @@
+"""A local stand-in for Microsoft Graph, served over real HTTP.
+
+Serves synthetic data under the same paths the client uses:
+
+    GET  /v1.0/groups, /v1.0/users, /v1.0/deviceManagement/managedDevices
+    GET  /v1.0/groups/{id}, /v1.0/users/{id}, ...
+    GET  /v1.0/drives/{drive}/root/children
+    GET  /v1.0/drives/{drive}/items/{item}/children
+    POST /v1.0/$batch
+
+Collections are paged with $top and $skiptoken and link to the next page with
+@odata.nextLink, and can be filtered with startswith(<property>,'...'). Every `throttle_every`-th request is answered with a 429 and
+a Retry-After header. Links point at https://graph.microsoft.com, use
+GraphTransport to send them to this server instead.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, quote, urlsplit
+
+from mgraph_client.transport import HttpTransport
+
+GRAPH_URL = "https://graph.microsoft.com"
+
+COLLECTIONS = {
+    "groups": lambda i: {
+        "id": f"group-{i:08d}",
+        "displayName": f"Group {i}",
+        "mail": f"group{i}@contoso.com",
+        "mailEnabled": i % 2 == 0,
+        "securityEnabled": True,
+    },
+    "users": lambda i: {
+        "id": f"user-{i:08d}",
+        "displayName": f"User {i}",
+        "userPrincipalName": f"user{i}@contoso.com",
+        "mail": f"user{i}@contoso.com",
+        "accountEnabled": True,
+    },
+    "deviceManagement/managedDevices": lambda i: {
+        "id": f"device-{i:08d}",
+        "deviceName": f"DESKTOP-{i:06d}",
+        "operatingSystem": "Windows",
+        "lastSyncDateTime": f"2024-01-{i % 28 + 1:02d}T08:15:00.1234567Z",
+    },
+}
+
+
+class FakeGraph:
+    def __init__(
+        self,
+        items: int = 10000,
+        page_size: int = 100,
+        tree_breadth: int = 5,
+        tree_depth: int = 3,
+        files_per_folder: int = 20,
+        throttle_every: int = 0,
+        retry_after: float = 0.0,
+        latency: float = 0.0,
+    ) -> None:
+        self.items = items
+        self.page_size = page_size
+        self.tree_breadth = tree_breadth
+        self.tree_depth = tree_depth
+        self.files_per_folder = files_per_folder
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.latency = latency
+
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, str], list[str]] = {}
+        self._filtered: dict[tuple[str, str], list[int]] = {}
+
+    def handle(
+        self, method: str, path: str, query: dict[str, str], body: Any
+    ) -> tuple[int, dict[str, str], Any]:
+        with self._lock:
+            self.requests += 1
+            throttle = self.throttle_every and self.requests % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            error = {"error": {"code": "TooManyRequests", "message": "Throttled"}}
+            return 429, {"Retry-After": str(self.retry_after)}, error
+        return self.route(method, path, query, body)
+
+    def route(
+        self, method: str, path: str, query: dict[str, str], body: Any
+    ) -> tuple[int, dict[str, str], Any]:
+        path = path.removeprefix("/v1.0")
+        if method == "POST" and path == "/$batch":
+            return 200, {}, self.batch(body)
+        if method != "GET":
+            return 405, {}, {"error": {"code": "MethodNotAllowed"}}
+
+        match = re.fullmatch(r"/drives/([^/]+)/(?:root|items/([^/]+))/children", path)
+        if match:
+            drive_id, item_id = match.groups()
+            return 200, {}, self.children(path, drive_id, item_id or "root", query)
+
+        collection = path.strip("/")
+        if collection in COLLECTIONS:
+            make_item = COLLECTIONS[collection]
+            if "$filter" in query:
+                indexes = self.filter(collection, query["$filter"])
+                if indexes is None:
+                    return 400, {}, {"error": {"code": "BadRequest"}}
+                return 200, {}, self.page(path, make_item, indexes, query)
+            return 200, {}, self.page(path, make_item, self.items, query)
+
+        collection, _, item_id = collection.rpartition("/")
+        if collection in COLLECTIONS and item_id.split("-")[-1].isdigit():
+            return 200, {}, COLLECTIONS[collection](int(item_id.split("-")[-1]))
+        return 404, {}, {"error": {"code": "itemNotFound", "message": path}}
+
+    # `items` is the collection size, or the indexes of the filtered items.
+    def page(
+        self, path: str, make_item: Any, items: int | list[int], query: dict[str, str]
+    ) -> dict[str, Any]:
+        indexes = range(items) if isinstance(items, int) else items
+        top = int(query.get("$top", self.page_size))
+        start = int(query.get("$skiptoken", 0))
+        end = min(start + top, len(indexes))
+        page: dict[str, Any] = {"value": [make_item(i) for i in indexes[start:end]]}
+        if end < len(indexes):
+            link = f"{GRAPH_URL}/v1.0{path}?$top={top}&$skiptoken={end}"
+            if "$filter" in query:
+                link += f"&$filter={quote(query['$filter'])}"
+            page["@odata.nextLink"] = link
+        return page
+
+    def filter(self, collection: str, value: str) -> list[int] | None:
+        match = re.fullmatch(r"startswith\((\w+),'(.*)'\)", value)
+        if match is None:
+            return None
+        with self._lock:
+            indexes = self._filtered.get((collection, value))
+        if indexes is None:
+            name, prefix = match.group(1), match.group(2).replace("''", "'")
+            values = self.values(collection, name)
+            indexes = [i for i, v in enumerate(values) if v.startswith(prefix)]
+            with self._lock:
+                self._filtered[(collection, value)] = indexes
+        return indexes
+
+    # The property as a string for every item, shared by all its filters.
+    def values(self, collection: str, name: str) -> list[str]:
+        with self._lock:
+            values = self._values.get((collection, name))
+        if values is None:
+            make_item = COLLECTIONS[collection]
+            values = [str(make_item(i).get(name, "")) for i in range(self.items)]
+            with self._lock:
+                self._values[(collection, name)] = values
+        return values
+
+    # Folder "root" holds `tree_breadth` folders named "<parent>.<n>" and
+    # `files_per_folder` files, down to `tree_depth` levels.
+    def children(
+        self, path: str, drive_id: str, item_id: str, query: dict[str, str]
+    ) -> dict[str, Any]:
+        depth = 0 if item_id == "root" else item_id.count(".")
+        folders = self.tree_breadth if depth < self.tree_depth else 0
+        reference = {"driveId": drive_id, "id": item_id}
+
+        def make_item(i: int) -> dict[str, Any]:
+            if i < folders:
+                child_id = f"{item_id}.{i}"
+                return {
+                    "id": child_id,
+                    "name": f"Folder {child_id}",
+                    "folder": {"childCount": self.tree_breadth},
+                    "parentReference": reference,
+                }
+            child_id = f"{item_id}-f{i - folders}"
+            return {
+                "id": child_id,
+                "name": f"File {child_id}.docx",
+                "size": 1000 + i,
+                "file": {"mimeType": "application/octet-stream"},
+                "lastModifiedDateTime": "2024-01-31T08:15:00.1234567Z",
+                "parentReference": reference,
+            }
+
+        return self.page(path, make_item, folders + self.files_per_folder, query)
+
+    @property
+    def drive_tree_size(self) -> int:
+        folders = sum(
+            self.tree_breadth**depth for depth in range(1, self.tree_depth + 1)
+        )
+        return folders + (folders + 1) * self.files_per_folder
+
+    def batch(self, body: dict[str, Any]) -> dict[str, Any]:
+        responses = []
+        for request in body["requests"]:
+            parts = urlsplit(request["url"])
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            status, headers, content = self.route(
+                request["method"], parts.path, query, request.get("body")
+            )
+            responses.append(
+                {
+                    "id": request["id"],
+                    "status": status,
+                    "headers": headers,
+                    "body": content,
+                }
+            )
+        return {"responses": responses}
+
+
+class FakeGraphServer:
+    def __init__(self, graph: FakeGraph, host: str = "127.0.0.1", port: int = 0):
+        self.graph = graph
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, with Nagle every
+            # response would wait for a delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._respond("GET")
+
+            def do_POST(self) -> None:
+                self._respond("POST")
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _respond(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+                status, headers, content = graph.handle(method, parts.path, query, body)
+                payload = json.dumps(content).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGraphServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# Sends Graph urls to the fake server and records the latency of each request.
+class GraphTransport(HttpTransport):
+    def __init__(self, server_url: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.server_url = server_url
+        self.latencies: list[float] = []
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        url = url.replace(GRAPH_URL, self.server_url, 1)
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
@@ -0,0 +1,233 @@
+"""Offline benchmark suite, run against the local fake Graph server.
+
+    PYTHONPATH=src python benchmarks/run.py --output results.json
+    PYTHONPATH=src python benchmarks/run.py --compare results.json
+
+Each scenario runs twice, once for timing and once under tracemalloc for the
+peak memory, each time against a new server and client. Results are printed
+and optionally written as JSON, --compare prints the change against an
+earlier results file.
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from fake_graph import COLLECTIONS, FakeGraph, FakeGraphServer, GraphTransport
+
+import mgraph_client
+import mgraph_client.device_management
+import mgraph_client.groups
+import mgraph_client.users
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+from mgraph_client.retry import RetryPolicy
+from mgraph_client.sharding import prefix_filters
+
+
+class FakeTokenApp:
+    def acquire_token_for_client(self, scopes: list[str]) -> dict[str, Any]:
+        return {
+            "access_token": "token",
+            "expires_in": 3600,
+            "token_source": "identity_provider",
+        }
+
+
+def make_client(server: FakeGraphServer, workers: int) -> mgraph_client.MgraphClient:
+    transport = GraphTransport(server.url, pool_size=workers, max_per_host=workers)
+    client = mgraph_client.MgraphClient(
+        "bench",
+        "bench",
+        "secret",
+        transport=transport,
+        retry_policy=RetryPolicy(max_retries=10, backoff_factor=0.01),
+        _test=True,
+    )
+    client._app = FakeTokenApp()
+    return client
+
+
+def list_items(client: mgraph_client.MgraphClient, args: argparse.Namespace) -> int:
+    groups = Groups(client).top(args.page_size).get()
+    return sum(1 for _ in groups.iter_all_items())
+
+
+def stream_prefetch(
+    client: mgraph_client.MgraphClient, args: argparse.Namespace
+) -> int:
+    groups = Groups(client).top(args.page_size).get()
+    return sum(1 for _ in groups.stream_items(prefetch=2))
+
+
+# Shards on the longest id prefixes that give at most four shards per worker,
+# ids are zero padded so these split the groups evenly.
+def sharded_listing(
+    client: mgraph_client.MgraphClient, args: argparse.Namespace
+) -> int:
+    ids = [COLLECTIONS["groups"](i)["id"] for i in range(args.items)]
+    prefixes = [""]
+    for length in range(1, len(ids[-1]) + 1):
+        candidates = sorted({id_[:length] for id_ in ids})
+        if len(candidates) > 4 * args.workers:
+            break
+        prefixes = candidates
+    groups = Groups(client).top(args.page_size)
+    shards = prefix_filters("id", prefixes)
+    return sum(1 for _ in groups.sharded(shards, max_workers=args.workers))
+
+
+def drive_walk(client: mgraph_client.MgraphClient, args: argparse.Namespace) -> int:
+    root = Drives(client).by_id("d1").root
+    return sum(1 for _ in root.walk(max_workers=args.workers))
+
+
+def bulk_lookups(client: mgraph_client.MgraphClient, args: argparse.Namespace) -> int:
+    groups = Groups(client)
+    items = [groups.by_id(f"group-{i:08d}") for i in range(args.lookups)]
+    with client.batch() as batch:
+        for item in items:
+            batch.get(item)
+    return sum(1 for req in batch if req.ok)
+
+
+SCENARIOS: dict[str, tuple[Callable, dict[str, Any]]] = {
+    "list_items": (list_items, {}),
+    "stream_prefetch": (stream_prefetch, {}),
+    "sharded_listing": (sharded_listing, {}),
+    "drive_walk": (drive_walk, {}),
+    "bulk_lookups": (bulk_lookups, {}),
+    "throttled_listing": (list_items, {"throttle_every": 10}),
+}
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round(p * (len(values) - 1)))]
+
+
+def run_once(
+    func: Callable, graph_kwargs: dict[str, Any], args: argparse.Namespace
+) -> tuple[float, int, FakeGraph, mgraph_client.MgraphClient]:
+    graph = FakeGraph(
+        items=args.items,
+        page_size=args.page_size,
+        tree_breadth=args.tree_breadth,
+        tree_depth=args.tree_depth,
+        files_per_folder=args.files_per_folder,
+        latency=args.latency,
+        **graph_kwargs,
+    )
+    with FakeGraphServer(graph) as server:
+        with make_client(server, args.workers) as client:
+            start = time.perf_counter()
+            items = func(client, args)
+            seconds = time.perf_counter() - start
+    return seconds, items, graph, client
+
+
+def run_scenario(
+    func: Callable, graph_kwargs: dict[str, Any], args: argparse.Namespace
+) -> dict[str, Any]:
+    seconds, items, graph, client = run_once(func, graph_kwargs, args)
+    latencies = client._transport.latencies  # type: ignore
+
+    tracemalloc.start()
+    try:
+        run_once(func, graph_kwargs, args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(seconds, 4),
+        "items": items,
+        "requests": graph.requests,
+        "throttled": graph.throttled,
+        "requests_per_sec": round(graph.requests / seconds, 1),
+        "items_per_sec": round(items / seconds, 1),
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_memory_mb": round(peak / 1e6, 2),
+        "token_acquisitions": client.token_acquisitions,
+    }
+
+
+def get_version() -> str:
+    try:
+        return importlib.metadata.version("mgraph_client")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f"\nCompared with {baseline['meta']['timestamp']}")
+    for name, metrics in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in ("items_per_sec", "latency_p99_ms", "peak_memory_mb"):
+            if before.get(key):
+                changes.append(f"{key} {metrics[key] / before[key] - 1:+.1%}")
+        print(f"{name:<20}{', '.join(changes)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scenarios", nargs="*", help=", ".join(SCENARIOS))
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--tree-breadth", type=int, default=5)
+    parser.add_argument("--tree-depth", type=int, default=3)
+    parser.add_argument("--files-per-folder", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"Scenario does not exist, '{name}'")
+
+    results: dict[str, Any] = {
+        "meta": {
+            "version": get_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "args": {
+                k: v for k, v in vars(args).items() if k not in ("output", "compare")
+            },
+        },
+        "results": {},
+    }
+    for name in args.scenarios or SCENARIOS:
+        func, graph_kwargs = SCENARIOS[name]
+        metrics = results["results"][name] = run_scenario(func, graph_kwargs, args)
+        print(
+            f"{name:<20}{metrics['seconds']:8.3f} s{metrics['items_per_sec']:12.0f} items/s"
+            f"{metrics['requests_per_sec']:9.0f} req/s"
+            f"  p50 {metrics['latency_p50_ms']:.2f} ms  p99 {metrics['latency_p99_ms']:.2f} ms"
+            f"  peak {metrics['peak_memory_mb']:.1f} MB"
+            f"  tokens {metrics['token_acquisitions']}"
+        )
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,33 @@
 import json
+import math
+import threading
+import time
+import weakref
 
-from msal import ConfidentialClientApplication, PublicClientApplication
+from typing import TYPE_CHECKING, Any, Callable
 
-from mgraph_client import directory_objects
+import requests
 
-from .resources import R
-from .resources import Resource as _R
+from .batch import Batch
+from .cache import ResponseCache, SQLiteResponseCache
+from .decoders import JsonDecoder, get_decoder
+from .delta import DeltaStore, JsonFileDeltaStore, SQLiteDeltaStore
+from .instrumentation import Hook, PrometheusMetrics, RequestEvent, WrapEvent
+from .ratelimit import AdaptiveRateLimiter
+from .resources import R, get_model
+from .retry import RetryPolicy
+from .transfers import Download, UploadSession
+from .transport import (
+    AsyncLocalTransport,
+    AsyncTransport,
+    HttpTransport,
+    HttpxTransport,
+    LocalTransport,
+    Transport,
+)
+
+if TYPE_CHECKING:
+    from .async_client import AsyncMgraphClient
 
 # from .groups import Groups
 # from .service_principals import ServicePrincipals
@@ -13,12 +35,21 @@ from .resources import Resource as _R
 # from .users import Users
 
 
+# The async client pulls in asyncio, it is imported on first use.
+def __getattr__(name: str) -> Any:
+    if name == "AsyncMgraphClient":
+        from .async_client import AsyncMgraphClient
+
+        return AsyncMgraphClient
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
 class Resource:
     def __set_name__(self, owner, name) -> None:
         self.name = "".join(map(lambda x: x.title(), name.split("_")))
 
     def __get__(self, obj, objtype=None) -> R:
-        klass = _R.MODELS[self.name]
+        klass = get_model(self.name)
         return klass(obj)
 
     def __set__(self, obj, value) -> None:
@@ -30,11 +61,14 @@ class Resource:
 
 class MgraphClient:
 
+    IS_ASYNC = False
+
     device_management = Resource()
     directory_objects = Resource()
     drives = Resource()
     groups = Resource()
     sites = Resource()
+    users = Resource()
 
     def __init__(
         self,
@@ -42,9 +76,75 @@ class MgraphClient:
         tenant_id: str,
         client_secret: str | None = None,
         scopes: list[str] | None = None,
+        transport: Transport | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        token_refresh_skew: float = 300.0,
+        json_decoder: str | JsonDecoder = "auto",
+        hooks: list[Hook] | None = None,
+        access_token: str | None = None,
         _test: bool = False,
     ):
-        if not _test:
+        # MSAL is imported and the application built when a token is first
+        # needed, never with an injected access token.
+        self._app: Any = None
+        self._credentials = (client_id, tenant_id, client_secret)
+        self._test = _test
+
+        if scopes is None:
+            scopes = ["https://graph.microsoft.com/.default"]
+
+        self._scopes = scopes
+        self._transport = transport or HttpTransport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._cache_scope = f"{tenant_id}/{client_id}"
+        self.json_decoder = get_decoder(json_decoder)
+        # Called with a RequestEvent or WrapEvent, nothing is timed while
+        # the list is empty.
+        self.hooks: list[Hook] = list(hooks or ())
+        # Shared parents of listed drive items, see drives.get_drive_items.
+        self._drive_items: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+        self.token_refresh_skew = token_refresh_skew
+        self.token_acquisitions = 0
+        self._token: str | None = None
+        self._token_refresh_at = 0.0
+        self._token_headers: dict[str, str] = {}
+        self._token_lock = threading.Lock()
+        if access_token is not None:
+            # Used as is and never refreshed, the caller owns its lifetime.
+            self._set_token(access_token, math.inf)
+
+    def __enter__(self) -> "MgraphClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def _access_token(self) -> str:
+        if time.monotonic() >= self._token_refresh_at:
+            with self._token_lock:
+                # Another thread may have refreshed while this one was waiting.
+                if time.monotonic() >= self._token_refresh_at:
+                    self._refresh_token()
+        return self._token  # type: ignore
+
+    @property
+    def _headers(self) -> dict[str, str]:
+        self._access_token
+        return self._token_headers
+
+    def _get_app(self) -> Any:
+        if self._app is None:
+            if self._test:
+                raise ValueError("Token application is not set in test mode.")
+            from msal import ConfidentialClientApplication, PublicClientApplication
+
+            client_id, tenant_id, client_secret = self._credentials
             if client_secret:
                 self._app = ConfidentialClientApplication(
                     client_id=client_id,
@@ -53,48 +153,195 @@ class MgraphClient:
                 )
             else:
                 self._app = PublicClientApplication(client_id=client_id)
+        return self._app
 
-        if scopes is None:
-            scopes = ["https://graph.microsoft.com/.default"]
-
-        self._scopes = scopes
-
-    @property
-    def _access_token(self):
-        result: dict[str, str] = self._app.acquire_token_for_client(scopes=self._scopes)  # type: ignore
+    def _refresh_token(self) -> None:
+        result: dict[str, Any] = self._get_app().acquire_token_for_client(
+            scopes=self._scopes
+        )
         access_token = result.get("access_token")
         if access_token is None:
             raise ValueError(f"Failed to acquire token, {result}")
 
-        return access_token
+        if result.get("token_source") != "cache":
+            self.token_acquisitions += 1
 
-    @property
-    def _headers(self):
-        return {"Authorization": f"Bearer {self._access_token}"}
+        expires_in = float(result.get("expires_in", 0))
+        self._set_token(
+            access_token, time.monotonic() + expires_in - self.token_refresh_skew
+        )
+
+    def _set_token(self, access_token: str, refresh_at: float) -> None:
+        self._token = access_token
+        self._token_headers = {"Authorization": f"Bearer {access_token}"}
+        self._token_refresh_at = refresh_at
+
+    def batch(self, max_retries: int = 3) -> Batch:
+        return Batch(self, max_retries=max_retries)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    # Emits the RequestEvent the response was held back with by
+    # _request(decode=True), once the decoding time is known.
+    def _decode(self, response: Any, decode: Callable | None = None) -> Any:
+        if decode is None:
+            decode = self.json_decoder.decode
+        event = getattr(response, "_mgraph_event", None) if self.hooks else None
+        if event is None:
+            return decode(response.content)
+
+        start = time.perf_counter()
+        try:
+            return decode(response.content)
+        finally:
+            event.add("decode", time.perf_counter() - start)
+            response._mgraph_event = None
+            self._emit(event)
+
+    def _emit(self, event: Any) -> None:
+        for hook in self.hooks:
+            hook(event)
+
+    def _get_event(self, method: str, url: str, resource: Any) -> RequestEvent | None:
+        if not self.hooks:
+            return None
+        return RequestEvent(method, url, resource and type(resource).__name__)
 
-    # @property
-    # def device_management(self) -> DeviceManagement:
-    #     return DeviceManagement(self)
+    # Successful responses that the caller decodes are emitted by _decode.
+    def _finish_event(
+        self, event: RequestEvent, response: Any, attempt: int, decode: bool
+    ) -> None:
+        event.retries = attempt
+        if decode and 200 <= response.status_code < 300:
+            response._mgraph_event = event
+        else:
+            self._emit(event)
 
-    # @property
-    # def drives(self) -> Drives:
-    #     return Drives(self)
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        idempotent: bool | None = None,
+        auth: bool = True,
+        resource: Any = None,
+        decode: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        transport = self._transport
+        policy = self.retry_policy
+        limiter = self.rate_limiter
+        event = self._get_event(method, url, resource)
+        attempt = 0
+        while True:
+            start = _clock(event)
+            request_headers = self._headers if auth else {}
+            if auth:
+                _add_phase(event, "token", start)
+            if headers:
+                request_headers = {**request_headers, **headers}
+
+            if limiter is not None:
+                start = _clock(event)
+                limiter.acquire(url)
+                _add_phase(event, "wait", start)
+            start = self._start_exchange(event)
+            try:
+                response = transport.request(
+                    method, url, headers=request_headers, **kwargs
+                )
+            except transport.CONNECTION_ERRORS as e:
+                delay = self._on_error(event, e, method, attempt, idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self._on_response(
+                    event,
+                    response,
+                    start,
+                    method,
+                    url,
+                    attempt,
+                    idempotent,
+                    decode,
+                    kwargs.get("stream", False),
+                )
+                if delay is None:
+                    return response
+                response.close()
+
+            start = _clock(event)
+            policy.sleep(delay)
+            _add_phase(event, "wait", start)
+            attempt += 1
+
+    # The per-attempt bookkeeping of _request, shared with the async client.
+    def _start_exchange(self, event: RequestEvent | None) -> float:
+        if event is None:
+            return 0.0
+        self._transport.pop_connect_time()
+        return time.perf_counter()
+
+    # Returns the delay before the next attempt, or None when the error is
+    # raised to the caller.
+    def _on_error(
+        self,
+        event: RequestEvent | None,
+        error: Exception,
+        method: str,
+        attempt: int,
+        idempotent: bool | None,
+    ) -> float | None:
+        if event is not None:
+            event.add_error(error, self._transport.pop_connect_time())
+        policy = self.retry_policy
+        if not policy.is_retriable(method, None, attempt, idempotent):
+            if event is not None:
+                event.retries = attempt
+                self._emit(event)
+            return None
+        return policy.backoff(attempt)
+
+    # Returns the delay before the next attempt, or None when the response is
+    # returned to the caller.
+    def _on_response(
+        self,
+        event: RequestEvent | None,
+        response: Any,
+        start: float,
+        method: str,
+        url: str,
+        attempt: int,
+        idempotent: bool | None,
+        decode: bool,
+        stream: bool,
+    ) -> float | None:
+        if event is not None:
+            event.add_exchange(
+                response,
+                time.perf_counter() - start,
+                self._transport.pop_connect_time(),
+                stream,
+            )
+        status = response.status_code
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(url, status)
+        policy = self.retry_policy
+        if not policy.is_retriable(method, status, attempt, idempotent):
+            if event is not None:
+                self._finish_event(event, response, attempt, decode)
+            return None
+        return policy.get_delay(response.headers, attempt)
 
-    # @property
-    # def groups(self):
-    #     return Groups(self)
 
-    # @property
-    # def service_principals(self):
-    #     return ServicePrincipals(self)
+def _clock(event: RequestEvent | None) -> float:
+    return 0.0 if event is None else time.perf_counter()
 
-    # @property
-    # def sites(self) -> Sites:
-    #     return Sites(self)
 
-    # @property
-    # def users(self):
-    #     return Users(self)
+def _add_phase(event: RequestEvent | None, phase: str, start: float) -> None:
+    if event is not None:
+        event.add(phase, time.perf_counter() - start)
 
 
 # class JsonDataStore:
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import Any
+
+from . import MgraphClient, _add_phase, _clock
+from .transport import AsyncTransport, HttpxTransport
+
+
+class AsyncMgraphClient(MgraphClient):
+
+    IS_ASYNC = True
+
+    def __init__(
+        self,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str | None = None,
+        scopes: list[str] | None = None,
+        transport: AsyncTransport | None = None,
+        **kwargs,
+    ):
+        super().__init__(
+            client_id,
+            tenant_id,
+            client_secret,
+            scopes,
+            transport=transport or HttpxTransport(),  # type: ignore
+            **kwargs,
+        )
+        self._token_alock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncMgraphClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:  # type: ignore
+        await self._transport.close()  # type: ignore
+
+    async def _aheaders(self) -> dict[str, str]:
+        if time.monotonic() >= self._token_refresh_at:
+            async with self._token_alock:
+                # MSAL is blocking, keep it off the event loop.
+                await asyncio.to_thread(getattr, self, "_access_token")
+        return self._token_headers
+
+    async def _request(  # type: ignore
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        idempotent: bool | None = None,
+        auth: bool = True,
+        resource: Any = None,
+        decode: bool = False,
+        **kwargs,
+    ) -> Any:
+        transport: AsyncTransport = self._transport  # type: ignore
+        policy = self.retry_policy
+        limiter = self.rate_limiter
+        event = self._get_event(method, url, resource)
+        attempt = 0
+        while True:
+            start = _clock(event)
+            request_headers = await self._aheaders() if auth else {}
+            if auth:
+                _add_phase(event, "token", start)
+            if headers:
+                request_headers = {**request_headers, **headers}
+
+            if limiter is not None:
+                delay = limiter.reserve(url)
+                if delay:
+                    start = _clock(event)
+                    await asyncio.sleep(delay)
+                    _add_phase(event, "wait", start)
+            start = self._start_exchange(event)
+            try:
+                response = await transport.request(
+                    method, url, headers=request_headers, **kwargs
+                )
+            except transport.CONNECTION_ERRORS as e:
+                delay = self._on_error(event, e, method, attempt, idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self._on_response(
+                    event,
+                    response,
+                    start,
+                    method,
+                    url,
+                    attempt,
+                    idempotent,
+                    decode,
+                    kwargs.get("stream", False),
+                )
+                if delay is None:
+                    return response
+                await transport.release(response)
+
+            start = _clock(event)
+            policy.record(delay)
+            await asyncio.sleep(delay)
+            _add_phase(event, "wait", start)
+            attempt += 1
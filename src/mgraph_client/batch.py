@@ -0,0 +1,324 @@
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+import requests
+
+from .resources import MultiValuedResource, Resource, raise_for_status
+
+if TYPE_CHECKING:
+    from mgraph_client import MgraphClient
+    from mgraph_client.retry import RetryPolicy
+
+
+# https://learn.microsoft.com/en-us/graph/json-batching
+class BatchRequest:
+
+    def __init__(
+        self,
+        request_id: str,
+        method: str,
+        resource: Resource,
+        url: str,
+        body: dict[str, Any] | None = None,
+        depends_on: "Iterable[BatchRequest]" = (),
+    ) -> None:
+        self.id = request_id
+        self.method = method
+        self.resource = resource
+        self.url = url
+        self.body = body
+        self.depends_on = tuple(depends_on)
+
+        self.status: int | None = None
+        self.headers: dict[str, str] = {}
+        self.response: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+    # A throttled request was not run, so it is resent whatever its method.
+    # Other failures may have run, only idempotent methods are resent.
+    def is_retriable(self, policy: "RetryPolicy") -> bool:
+        if self.status == 429:
+            return True
+        return (
+            self.status in policy.retry_statuses and self.method in policy.retry_methods
+        )
+
+    @property
+    def retry_after(self) -> float | None:
+        value = self.headers.get("Retry-After") or self.headers.get("retry-after")
+        try:
+            return float(value)  # type: ignore
+        except (TypeError, ValueError):
+            return None
+
+    def payload(self, pending: set[str]) -> dict[str, Any]:
+        relative_url = self.url.removeprefix(Resource.URL)
+        payload: dict[str, Any] = {
+            "id": self.id,
+            "method": self.method,
+            "url": relative_url,
+        }
+
+        headers = dict(self.resource._request_headers or {})
+        if self.body is not None:
+            payload["body"] = self.body
+            headers["Content-Type"] = "application/json"
+        if headers:
+            payload["headers"] = headers
+
+        # Dependencies completed in an earlier round are not part of this batch.
+        depends_on = [req.id for req in self.depends_on if req.id in pending]
+        if depends_on:
+            payload["dependsOn"] = depends_on
+        return payload
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(
+                f"{self.status} error for batch request {self.method} '{self.url}', "
+                f"{self.response}"
+            )
+
+    def _set_response(self, response: dict[str, Any]) -> None:
+        self.status = int(response["status"])
+        self.headers = response.get("headers") or {}
+        self.response = response.get("body")
+
+    def _apply(self) -> None:
+        resource = self.resource
+        cache = resource._client.cache
+        if cache is not None and self.method in ("PATCH", "DELETE"):
+            cache.invalidate(resource.url, resource._client._cache_scope)
+        if not self.ok:
+            return
+        if self.method == "GET":
+            if isinstance(resource, MultiValuedResource):
+                resource._mdata.clear()
+                resource._current_page = 0
+                resource._mdata[0] = self.response
+            else:
+                resource._data = self.response
+            resource._has_changed = False
+        else:
+            resource._has_changed = True
+
+
+class Batch:
+
+    MAX_REQUESTS = 20
+
+    def __init__(self, client: "MgraphClient", max_retries: int = 3) -> None:
+        self._client = client
+        self._requests: list[BatchRequest] = []
+        self.max_retries = max_retries
+
+    def __enter__(self) -> "Batch":
+        if self._client.IS_ASYNC:
+            raise TypeError("Batches of the async client require 'async with'.")
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is None:
+            self.execute()
+
+    async def __aenter__(self) -> "Batch":
+        return self
+
+    async def __aexit__(self, exc_type, *args) -> None:
+        if exc_type is None:
+            await self.execute()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __iter__(self) -> Iterator[BatchRequest]:
+        return iter(self._requests)
+
+    @property
+    def errors(self) -> list[BatchRequest]:
+        return [req for req in self._requests if not req.ok]
+
+    def get(
+        self, resource: Resource, depends_on: Iterable[BatchRequest] = ()
+    ) -> BatchRequest:
+        if not resource.RequestMethod.GET:
+            raise ValueError(f"Endpoint does not support GET method, '{resource.url}'")
+        return self._add(
+            "GET", resource, resource.url_with_query_params, None, depends_on
+        )
+
+    def patch(
+        self,
+        resource: Resource,
+        data: dict[str, Any],
+        depends_on: Iterable[BatchRequest] = (),
+    ) -> BatchRequest:
+        if not resource.RequestMethod.PATCH:
+            raise ValueError(
+                f"Endpoint does not support PATCH method, '{resource.url}'"
+            )
+        return self._add("PATCH", resource, resource.url, data, depends_on)
+
+    def post(
+        self,
+        resource: Resource,
+        payload: dict[str, Any],
+        depends_on: Iterable[BatchRequest] = (),
+    ) -> BatchRequest:
+        if not resource.RequestMethod.POST:
+            raise ValueError(f"Endpoint does not support POST method, '{resource.url}'")
+        return self._add("POST", resource, resource.url, payload, depends_on)
+
+    def delete(
+        self, resource: Resource, depends_on: Iterable[BatchRequest] = ()
+    ) -> BatchRequest:
+        if not resource.RequestMethod.DELETE:
+            raise ValueError(
+                f"Endpoint does not support DELETE method, '{resource.url}'"
+            )
+        return self._add("DELETE", resource, resource.url, None, depends_on)
+
+    def execute(self) -> list[BatchRequest]:
+        if self._client.IS_ASYNC:
+            return self._aexecute()  # type: ignore
+        pending = [req for req in self._requests if req.status is None]
+
+        attempt = 0
+        while pending:
+            for chunk in self._chunks(pending):
+                response = self._client._request(**self._get_request(chunk))
+                self._on_response(chunk, response)
+
+            retry = self._get_retriable(pending, attempt)
+            if not retry:
+                break
+
+            self._client.retry_policy.sleep(self._get_retry_delay(retry, attempt))
+            pending = retry
+            attempt += 1
+
+        return self._apply()
+
+    async def _aexecute(self) -> list[BatchRequest]:
+        import asyncio
+
+        pending = [req for req in self._requests if req.status is None]
+
+        attempt = 0
+        while pending:
+            for chunk in self._chunks(pending):
+                response = await self._client._request(**self._get_request(chunk))
+                self._on_response(chunk, response)
+
+            retry = self._get_retriable(pending, attempt)
+            if not retry:
+                break
+
+            delay = self._get_retry_delay(retry, attempt)
+            self._client.retry_policy.record(delay)
+            await asyncio.sleep(delay)
+            pending = retry
+            attempt += 1
+
+        return self._apply()
+
+    def _add(
+        self,
+        method: str,
+        resource: Resource,
+        url: str,
+        body: dict[str, Any] | None,
+        depends_on: Iterable[BatchRequest],
+    ) -> BatchRequest:
+        depends_on = tuple(depends_on)
+        for req in depends_on:
+            if req not in self._requests:
+                raise ValueError(f"Dependency is not part of this batch, '{req.id}'")
+
+        req = BatchRequest(
+            str(len(self._requests) + 1), method, resource, url, body, depends_on
+        )
+        self._requests.append(req)
+        return req
+
+    def _chunks(self, pending: list[BatchRequest]) -> Iterator[list[BatchRequest]]:
+        # Requests linked through dependsOn must be sent in the same batch.
+        groups: dict[str, list[BatchRequest]] = {}
+        group_of: dict[str, str] = {}
+        pending_ids = {req.id for req in pending}
+
+        for req in pending:
+            group_ids = {
+                group_of[dep.id] for dep in req.depends_on if dep.id in pending_ids
+            }
+            group = [req]
+            for group_id in sorted(group_ids, key=int):
+                group = groups.pop(group_id) + group
+            for member in group:
+                group_of[member.id] = req.id
+            groups[req.id] = sorted(group, key=lambda x: int(x.id))
+
+        chunk: list[BatchRequest] = []
+        for group in sorted(groups.values(), key=lambda x: int(x[0].id)):
+            if len(group) > self.MAX_REQUESTS:
+                raise ValueError(
+                    f"Dependent requests exceed the batch limit, {self.MAX_REQUESTS}"
+                )
+            if len(chunk) + len(group) > self.MAX_REQUESTS:
+                yield chunk
+                chunk = []
+            chunk.extend(group)
+        if chunk:
+            yield chunk
+
+    # The _request arguments of one $batch POST.
+    def _get_request(self, chunk: list[BatchRequest]) -> dict[str, Any]:
+        pending = {req.id for req in chunk}
+        payload = {"requests": [req.payload(pending) for req in chunk]}
+
+        # A batch made of GETs only is safe to resend as a whole.
+        idempotent = all(req.method == "GET" for req in chunk)
+        return {
+            "method": "POST",
+            "url": f"{Resource.URL}/$batch",
+            "json": payload,
+            "idempotent": idempotent,
+            "decode": True,
+        }
+
+    def _on_response(self, chunk: list[BatchRequest], response: Any) -> None:
+        raise_for_status(response)
+
+        by_id = {req.id: req for req in chunk}
+        for item in self._client._decode(response)["responses"]:
+            by_id[item["id"]]._set_response(item)
+
+    def _apply(self) -> list[BatchRequest]:
+        for req in self._requests:
+            req._apply()
+        return self._requests
+
+    def _get_retriable(
+        self, pending: list[BatchRequest], attempt: int
+    ) -> list[BatchRequest]:
+        policy = self._client.retry_policy
+        if attempt >= self.max_retries or policy.is_exhausted:
+            return []
+        retry = {req.id for req in pending if req.is_retriable(policy)}
+        if not retry:
+            return []
+
+        # 424 Failed Dependency is resent together with its retried dependency.
+        for req in pending:
+            if req.status == 424 and any(dep.id in retry for dep in req.depends_on):
+                retry.add(req.id)
+
+        return [req for req in pending if req.id in retry]
+
+    def _get_retry_delay(self, retry: list[BatchRequest], attempt: int) -> float:
+        delays = [req.retry_after for req in retry if req.retry_after is not None]
+        if delays:
+            return max(delays)
+        return self._client.retry_policy.backoff(attempt)
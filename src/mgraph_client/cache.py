@@ -0,0 +1,245 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheEntry:
+
+    __slots__ = ("data", "etag", "expires")
+
+    def __init__(self, data: dict[str, Any], etag: str | None, expires: float):
+        self.data = data
+        self.etag = etag
+        self.expires = expires
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires
+
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-get?view=graph-rest-1.0#optional-request-headers
+#
+# Entries are keyed by url and a scope, the tenant and application of the
+# client, so clients of different tenants can share one cache. Invalidating
+# without a scope drops the url in every scope.
+class ResponseCache:
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
+
+    def get(self, key: str, scope: str = "") -> CacheEntry | None:
+        entry = self._get_entry(key, scope)
+        if entry is None:
+            return None
+        if entry.is_fresh:
+            self._count("hits")
+        elif entry.etag is None:
+            return None
+        return entry
+
+    def store(
+        self, key: str, data: dict[str, Any], etag: str | None, scope: str = ""
+    ) -> None:
+        self._count("misses")
+        self._set_entry(key, scope, CacheEntry(data, etag, time.time() + self.ttl))
+
+    def revalidated(self, key: str, entry: CacheEntry, scope: str = "") -> None:
+        self._count("revalidations")
+        expires = time.time() + self.ttl
+        self._set_entry(key, scope, CacheEntry(entry.data, entry.etag, expires))
+
+    def invalidate(self, url: str, scope: str | None = None) -> None:
+        self._delete_entries(url, scope)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _get_entry(self, key: str, scope: str = "") -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None:
+                self._entries.move_to_end((scope, key))
+            return entry
+
+    def _set_entry(self, key: str, scope: str, entry: CacheEntry) -> None:
+        with self._lock:
+            entries = self._entries
+            entries[scope, key] = entry
+            entries.move_to_end((scope, key))
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def _delete_entries(self, url: str, scope: str | None) -> None:
+        # The url itself and every query variant of it, e.g. ?$select=...
+        prefix = f"{url}?"
+        with self._lock:
+            for entry_scope, key in list(self._entries):
+                if scope is not None and entry_scope != scope:
+                    continue
+                if key == url or key.startswith(prefix):
+                    del self._entries[entry_scope, key]
+
+
+# Shared between runs and worker processes. Bodies are stored as zlib
+# compressed JSON, the database runs in WAL mode so readers do not block the
+# writer, and each thread and forked process opens its own connection.
+#
+# A hit only writes its access time once it is `touch_interval` seconds old,
+# so concurrent readers do not queue on the writer lock, and the LRU order is
+# exact to that interval. Entries are counted every `prune_margin` stores and
+# pruned back to max_entries once they exceed it by the margin.
+class SQLiteResponseCache(ResponseCache):
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_entries: int = 100000,
+        ttl: float = 86400.0,
+        timeout: float = 30.0,
+        compress_level: int = 6,
+        touch_interval: float = 60.0,
+        prune_margin: int | None = None,
+    ) -> None:
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        self._path = os.fspath(path)
+        self._timeout = timeout
+        self._compress_level = compress_level
+        self.touch_interval = touch_interval
+        if prune_margin is None:
+            prune_margin = max_entries // 10
+        self.prune_margin = prune_margin
+        self._stores = 0
+        self._local = threading.local()
+
+        conn = self._connect()
+        with conn:
+            # Entries of files written before scopes were added are dropped.
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(responses)")]
+            if columns and "scope" not in columns:
+                conn.execute("DROP TABLE responses")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (scope TEXT NOT NULL, "
+                "key TEXT NOT NULL, body BLOB NOT NULL, etag TEXT, expires REAL, "
+                "accessed REAL, PRIMARY KEY (scope, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None or local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=self._timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            local.conn = conn
+            local.pid = os.getpid()
+        return conn
+
+    def _get_entry(self, key: str, scope: str = "") -> CacheEntry | None:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT body, etag, expires, accessed FROM responses "
+            "WHERE scope = ? AND key = ?",
+            (scope, key),
+        ).fetchone()
+        if row is None:
+            return None
+
+        body, etag, expires, accessed = row
+        now = time.time()
+        if accessed is None or now - accessed >= self.touch_interval:
+            with conn:
+                conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE scope = ? AND key = ?",
+                    (now, scope, key),
+                )
+        return CacheEntry(json.loads(zlib.decompress(body)), etag, expires)
+
+    def _set_entry(self, key: str, scope: str, entry: CacheEntry) -> None:
+        body = zlib.compress(
+            json.dumps(entry.data, separators=(",", ":")).encode(),
+            self._compress_level,
+        )
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, key, body, entry.etag, entry.expires, time.time()),
+            )
+        with self._lock:
+            self._stores += 1
+            prune = self._stores % max(self.prune_margin, 1) == 0
+        if prune:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count <= self.max_entries + self.prune_margin:
+            return
+        with conn:
+            # Expired entries without an etag can never be revalidated.
+            conn.execute(
+                "DELETE FROM responses WHERE etag IS NULL AND expires < ?",
+                (time.time(),),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses "
+                "ORDER BY accessed LIMIT max((SELECT COUNT(*) FROM responses) - ?, 0))",
+                (self.max_entries,),
+            )
+
+    def _delete_entries(self, url: str, scope: str | None) -> None:
+        prefix = f"{url}?"
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "DELETE FROM responses WHERE (? IS NULL OR scope = ?) "
+                "AND (key = ? OR substr(key, 1, ?) = ?)",
+                (scope, scope, url, len(prefix), prefix),
+            )
+
+
+def get_etag(response: Any, data: dict[str, Any]) -> str | None:
+    return response.headers.get("ETag") or data.get("@odata.etag")
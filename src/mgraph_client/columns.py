@@ -0,0 +1,135 @@
+import datetime
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .fields import (
+    BooleanField,
+    CharField,
+    DateTimeField,
+    Field,
+    IntegerField,
+    get_fields,
+)
+
+if TYPE_CHECKING:
+    from .resources import MultiValuedResource
+
+
+class DictionaryColumn:
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: Any, categories: Any) -> None:
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> list[Any]:
+        categories = self.categories
+        return [None if code < 0 else categories[code] for code in self.codes]
+
+
+# Builds one column per model Field straight from the raw pages, no item is
+# wrapped in its resource class. With numpy, datetimes become datetime64[us]
+# (NaT for null), integers int64 and booleans bool, as masked arrays when a
+# value is null. Strings stay object arrays unless dictionary encoded.
+def export_columns(
+    resource: "MultiValuedResource",
+    fields: Iterable[str] | None = None,
+    use_numpy: bool | None = None,
+    dictionary: bool = False,
+) -> dict[str, Any]:
+    model_fields = get_fields(resource._get_item_class())
+    if fields is None:
+        names = list(model_fields)
+    else:
+        names = list(fields)
+        for name in names:
+            if name not in model_fields:
+                raise ValueError(f"Field does not exist, '{name}'")
+
+    np = _import_numpy(required=bool(use_numpy)) if use_numpy is not False else None
+    items = [item for page in resource._mdata for item in resource._get_values(page)]
+
+    columns = {}
+    for name in names:
+        field = model_fields[name]
+        if np is None:
+            column: Any = field.get_values(items)
+            if dictionary and isinstance(field, CharField):
+                column = _encode(column, list)
+        elif isinstance(field, DateTimeField):
+            column = _datetime_array(np, field, items)
+        elif isinstance(field, (IntegerField, BooleanField)):
+            dtype = np.int64 if isinstance(field, IntegerField) else np.bool_
+            column = _masked_array(np, field.get_values(items), dtype)
+        else:
+            values = field.get_values(items)
+            if dictionary and isinstance(field, CharField):
+                column = _encode(values, lambda x: np.array(x, dtype=object))
+                column.codes = np.array(column.codes, dtype=np.int32)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+        columns[name] = column
+    return columns
+
+
+def _import_numpy(required: bool) -> Any:
+    try:
+        import numpy
+    except ImportError:
+        if required:
+            raise ImportError(
+                "Package is required for array columns, 'numpy'. "
+                "Install with 'pip install mgraph_client[numpy]'."
+            )
+        return None
+    return numpy
+
+
+def _datetime_array(np: Any, field: Field, items: list[dict[str, Any]]) -> Any:
+    # Graph timestamps are UTC with a trailing Z, which numpy parses
+    # directly once the Z is dropped. Anything else, e.g. a +02:00 offset
+    # that numpy would warn about, goes through Python.
+    name = field.name
+    values = [item.get(name) for item in items]
+    if all(val is None or (isinstance(val, str) and val[-1:] == "Z") for val in values):
+        try:
+            return np.array(
+                ["NaT" if val is None else val[:-1] for val in values],
+                dtype="datetime64[us]",
+            )
+        except ValueError:
+            pass
+    return np.array(
+        ["NaT" if val is None else _naive_utc(val) for val in field.get_values(items)],
+        dtype="datetime64[us]",
+    )
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _masked_array(np: Any, values: list[Any], dtype: Any) -> Any:
+    mask = [value is None for value in values]
+    if not any(mask):
+        return np.array(values, dtype=dtype)
+    filled = [dtype(0) if value is None else value for value in values]
+    return np.ma.masked_array(np.array(filled, dtype=dtype), mask=mask)
+
+
+def _encode(values: list[Any], to_array: Any) -> DictionaryColumn:
+    index: dict[Any, int] = {}
+    codes = []
+    append = codes.append
+    for value in values:
+        if value is None:
+            append(-1)
+        else:
+            append(index.setdefault(value, len(index)))
+    return DictionaryColumn(codes, to_array(list(index)))
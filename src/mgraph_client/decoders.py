@@ -0,0 +1,149 @@
+import json
+from typing import Any
+
+from .fields import BooleanField, DateTimeField, Field, IntegerField, get_fields
+
+
+class JsonDecoder:
+
+    name = "json"
+
+    def decode(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonDecoder(JsonDecoder):
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self.decode = orjson.loads  # type: ignore
+
+
+# Also decodes pages straight into msgspec Structs built from a model's
+# Fields, so a listing can be read without dicts or resource wrappers.
+class MsgspecDecoder(JsonDecoder):
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._structs: dict[type, type] = {}
+        self._page_decoders: dict[type, Any] = {}
+        self.decode = msgspec.json.Decoder().decode  # type: ignore
+
+    def get_struct(self, model: type) -> type:
+        try:
+            return self._structs[model]
+        except KeyError:
+            pass
+
+        fields = get_fields(model)
+        struct = self._structs[model] = self._msgspec.defstruct(
+            f"{model.__name__}Struct",
+            [(name, _get_type(field) | None, None) for name, field in fields.items()],
+            rename={name: field.name for name, field in fields.items()},
+            kw_only=True,
+            gc=False,
+        )
+        return struct
+
+    def get_page_decoder(self, model: type) -> Any:
+        try:
+            return self._page_decoders[model]
+        except KeyError:
+            pass
+
+        page = self._msgspec.defstruct(
+            f"{model.__name__}Page",
+            [
+                ("value", list[self.get_struct(model)], []),  # type: ignore
+                ("next_link", str | None, None),
+            ],
+            rename={"next_link": "@odata.nextLink"},
+            kw_only=True,
+        )
+        converters = [
+            (name, field.get_value)
+            for name, field in get_fields(model).items()
+            if isinstance(field, (DateTimeField, IntegerField, BooleanField))
+        ]
+        decoder = self._page_decoders[model] = StructPageDecoder(
+            self._msgspec.json.Decoder(page), converters
+        )
+        return decoder
+
+
+# Typed values are decoded leniently and then converted by their Field, so a
+# struct holds what the resource's attribute would, e.g. timestamps cut to
+# microseconds by DateTimeField rather than rounded by msgspec, and a number
+# sent as a string does not fail the whole page.
+class StructPageDecoder:
+
+    def __init__(self, decoder: Any, converters: list[tuple[str, Any]]) -> None:
+        self._decoder = decoder
+        self._converters = converters
+
+    def decode(self, content: bytes) -> Any:
+        page = self._decoder.decode(content)
+        structs = page.value
+        for name, get_value in self._converters:
+            # Listings repeat the same values a lot, each is converted once.
+            converted: dict[Any, Any] = {}
+            for struct in structs:
+                val = getattr(struct, name)
+                if val is None:
+                    continue
+                try:
+                    value = converted[val]
+                except KeyError:
+                    value = converted[val] = get_value(val)
+                setattr(struct, name, value)
+        return page
+
+
+DECODERS: dict[str, type[JsonDecoder]] = {
+    "orjson": OrjsonDecoder,
+    "msgspec": MsgspecDecoder,
+    "json": JsonDecoder,
+}
+
+
+# "auto" picks the first installed of orjson, msgspec and the stdlib.
+def get_decoder(decoder: str | JsonDecoder = "auto") -> JsonDecoder:
+    if isinstance(decoder, JsonDecoder):
+        return decoder
+    if decoder != "auto":
+        try:
+            klass = DECODERS[decoder]
+        except KeyError:
+            raise ValueError(f"JSON decoder is not supported, '{decoder}'")
+        try:
+            return klass()
+        except ImportError:
+            raise ImportError(
+                f"Package is required for the JSON decoder, '{decoder}'. "
+                f"Install with 'pip install mgraph_client[{decoder}]'."
+            )
+
+    for klass in DECODERS.values():
+        try:
+            return klass()
+        except ImportError:
+            continue
+    return JsonDecoder()
+
+
+def _get_type(field: Field) -> Any:
+    if isinstance(field, DateTimeField):
+        return str
+    if isinstance(field, IntegerField):
+        return int | str
+    if isinstance(field, BooleanField):
+        return bool | str
+    # CharField is also used for nested objects, e.g. parentReference.
+    return Any
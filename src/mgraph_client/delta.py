@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from mgraph_client import MgraphClient
+
+    from .resources import R
+
+
+# https://learn.microsoft.com/en-us/graph/delta-query-overview
+class DeltaStore(ABC):
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, delta_link: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class JsonFileDeltaStore(DeltaStore):
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self._path = os.fspath(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self._path, "r") as f:
+                self._data: dict[str, str] = json.load(f)
+        except FileNotFoundError:
+            self._data = {}
+
+    def get(self, key: str) -> str | None:
+        return self._data.get(key)
+
+    def set(self, key: str, delta_link: str) -> None:
+        with self._lock:
+            self._data[key] = delta_link
+            self._save()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        # Write then rename, so a crash never leaves a half written file.
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self._path)
+
+
+class SQLiteDeltaStore(DeltaStore):
+
+    def __init__(self, path: str | os.PathLike, timeout: float = 30.0) -> None:
+        self._path = os.fspath(path)
+        self._timeout = timeout
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS delta_links "
+            "(key TEXT PRIMARY KEY, delta_link TEXT NOT NULL, updated REAL)"
+        )
+
+    def get(self, key: str) -> str | None:
+        rows = self._execute("SELECT delta_link FROM delta_links WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def set(self, key: str, delta_link: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO delta_links VALUES (?, ?, ?)",
+            (key, delta_link, time.time()),
+        )
+
+    def delete(self, key: str) -> None:
+        self._execute("DELETE FROM delta_links WHERE key = ?", (key,))
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[Any]:
+        conn = sqlite3.connect(self._path, timeout=self._timeout)
+        try:
+            with conn:
+                return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+
+# Mixed into a MultiValuedResource whose parent is the collection being
+# tracked, e.g. /groups/delta. Items are parented to that collection so their
+# urls match the ones returned by a normal listing.
+class DeltaQuery:
+
+    __slots__ = ()
+
+    _client: "MgraphClient"
+    _parent: Any
+    _mdata: dict[int, dict[str, Any]]
+    _current_page: int
+
+    @property
+    def relative_url(self) -> str:
+        return "/delta"
+
+    @property
+    def url_with_query_params(self) -> str:
+        return self.stored_delta_link or super().url_with_query_params  # type: ignore
+
+    @property
+    def key(self) -> str:
+        return self._key or super().url_with_query_params  # type: ignore
+
+    @property
+    def stored_delta_link(self) -> str | None:
+        store = self._store
+        if store is None:
+            return None
+        return store.get(self.key)
+
+    @property
+    def delta_link(self) -> str | None:
+        return self._mdata.get(self._current_page, {}).get("@odata.deltaLink")
+
+    def iter_changes(self, prefetch: int = 0) -> Iterator["R"]:
+        self.get()  # type: ignore
+        yield from self.stream_items(prefetch=prefetch)  # type: ignore
+        self.save()
+
+    def save(self) -> None:
+        delta_link = self.delta_link
+        if delta_link is None:
+            raise ValueError("Delta link is only available after the last page.")
+        if self._store is not None:
+            self._store.set(self.key, delta_link)
+
+    def reset(self) -> None:
+        if self._store is not None:
+            self._store.delete(self.key)
+
+    def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
+        self._store: DeltaStore | None = kwargs.get("store")
+        self._key: str | None = kwargs.get("key")
+
+    def _get_obj(
+        self, klass: type["R"], client: "MgraphClient", data: dict[str, Any]
+    ) -> "R":
+        return klass(client, data=data, parent=self._parent)
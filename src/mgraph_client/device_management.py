@@ -5,6 +5,8 @@ from .resources import MultiValuedResource, Resource, SingleValuedResource
 
 
 class DeviceManagement(Resource):
+    __slots__ = ()
+
     @property
     def relative_url(self) -> str:
         return "/deviceManagement"
@@ -16,6 +18,7 @@ class DeviceManagement(Resource):
 
 # https://learn.microsoft.com/en-us/graph/api/intune-devices-manageddevice-list?view=graph-rest-1.0
 class ManagedDevices(MultiValuedResource):
+    __slots__ = ()
 
     ITEM_CLASS = "ManagedDevice"
 
@@ -29,6 +32,7 @@ class ManagedDevices(MultiValuedResource):
 
 # https://learn.microsoft.com/en-us/graph/api/intune-devices-manageddevice-get?view=graph-rest-1.0
 class ManagedDevice(SingleValuedResource):
+    __slots__ = ("_device_id",)
 
     id = CharField(fallback="device_id")
 
@@ -3,11 +3,12 @@ from mgraph_client.resources import Resource
 
 
 class DirectoryObjects(Resource):
+    __slots__ = ()
 
     ITEM_CLASS = "DirectoryObject"
 
     @property
-    def relative_endpoint(self):
+    def relative_url(self) -> str:
         return "/directoryObjects"
 
     def by_id(self, dir_obj_id: str) -> "DirectoryObject":
@@ -15,6 +16,7 @@ class DirectoryObjects(Resource):
 
 
 class DirectoryObject(Resource):
+    __slots__ = ("_dir_obj_id",)
 
     @property
     def relative_url(self) -> str:
@@ -28,6 +30,7 @@ class DirectoryObject(Resource):
 
 
 class Reference(Resource):
+    __slots__ = ()
 
     @property
     def relative_url(self):
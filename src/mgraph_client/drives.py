@@ -1,7 +1,30 @@
-from typing import TYPE_CHECKING, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator
+from urllib.parse import quote
 
+from .delta import DeltaQuery, DeltaStore
 from .fields import CharField, DateTimeField, IntegerField
-from .resources import MultiValuedResource, R, Resource, SingleValuedResource
+from .prefetch import WorkerQueue
+from .resources import (
+    MultiValuedResource,
+    R,
+    Resource,
+    SingleValuedResource,
+    quote_query_value,
+    raise_for_status,
+)
+from .transfers import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_PART_SIZE,
+    FRAGMENT_UNIT,
+    ContentChangedError,
+    Download,
+    Source,
+    UploadSession,
+    get_reader,
+    get_size,
+)
 
 if TYPE_CHECKING:
     from mgraph_client import MgraphClient
@@ -12,6 +35,7 @@ if TYPE_CHECKING:
 
 # https://learn.microsoft.com/en-us/graph/api/drive-list?view=graph-rest-1.0&tabs=http
 class Drives(Resource):
+    __slots__ = ()
 
     @property
     def relative_url(self):
@@ -29,6 +53,7 @@ class Drives(Resource):
 
 # https://learn.microsoft.com/en-us/graph/api/drive-get?view=graph-rest-1.0&tabs=http
 class DefaultDrive(SingleValuedResource):
+    __slots__ = ()
 
     id = CharField(fallback="drive_id")
     created_date_time = DateTimeField()
@@ -56,8 +81,12 @@ class DefaultDrive(SingleValuedResource):
 
 
 class Drive(DefaultDrive):
+    __slots__ = ("_drive_id",)
 
+    # Weakly referenceable so the client can share one per drive, see
+    # get_drive_items.
     class DriveItems(Resource):
+        __slots__ = ("__weakref__",)
 
         @property
         def relative_url(self) -> str:
@@ -109,17 +138,25 @@ class Drive(DefaultDrive):
 
 # https://learn.microsoft.com/en-us/graph/api/driveitem-get?view=graph-rest-1.0&tabs=http
 class DriveItem(SingleValuedResource):
+    __slots__ = ("_item_id",)
 
     class RequestQueryParam(SingleValuedResource.RequestQueryParam):
         SEARCH = True
 
     class Children(MultiValuedResource):
+        __slots__ = ("_drive_items",)
+
         class RequestQueryParam(MultiValuedResource.RequestQueryParam):
             FILTER = False
             TOP = True
 
         ITEM_CLASS = "DriveItem"
 
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Holds the shared parents of this listing's items, by drive id.
+            self._drive_items: dict[str, Drive.DriveItems] = {}
+
         @property
         def relative_url(self):
             return f"/children"
@@ -127,9 +164,76 @@ class DriveItem(SingleValuedResource):
         def _get_obj(
             self, klass: type[R], client: "MgraphClient", data: dict[str, Any]
         ) -> R:
-            drive_items = client.drives.by_id(data["parentReference"]["driveId"]).items
+            drive_items = self._get_drive_items(data["parentReference"]["driveId"])
             return klass(client, data=data, parent=drive_items)
 
+        def _get_drive_items(self, drive_id: str) -> "Drive.DriveItems":
+            try:
+                return self._drive_items[drive_id]
+            except KeyError:
+                drive_items = self._drive_items[drive_id] = get_drive_items(
+                    self._client, drive_id
+                )
+                return drive_items
+
+    # https://learn.microsoft.com/en-us/graph/api/driveitem-put-content?view=graph-rest-1.0
+    class Content(Resource):
+        __slots__ = ()
+
+        class RequestMethod(Resource.RequestMethod):
+            PUT = True
+
+        @property
+        def relative_url(self) -> str:
+            return "/content"
+
+        # https://learn.microsoft.com/en-us/graph/api/driveitem-put-content?view=graph-rest-1.0
+        def put(
+            self,
+            content: bytes,
+            content_type: str = "application/octet-stream",
+            conflict_behavior: str | None = None,
+        ) -> "Resource":
+            if conflict_behavior is None:
+                return super().put(content, content_type)
+            value = quote_query_value(conflict_behavior)
+            return self._send(
+                "PUT",
+                f"{self.url}?@microsoft.graph.conflictBehavior={value}",
+                data=content,
+                headers={"Content-Type": content_type},
+            )
+
+    # https://learn.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0
+    class CreateUploadSession(Resource):
+        __slots__ = ()
+
+        class RequestMethod(Resource.RequestMethod):
+            POST = True
+
+        @property
+        def relative_url(self) -> str:
+            return "/createUploadSession"
+
+        def create(
+            self,
+            conflict_behavior: str = "replace",
+            fragment_size: int = 32 * FRAGMENT_UNIT,
+            max_workers: int = 1,
+        ) -> UploadSession:
+            _require_sync_client(self._client, "create_upload_session")
+            self.post(
+                {"item": {"@microsoft.graph.conflictBehavior": conflict_behavior}}
+            )
+            return UploadSession(
+                self._client,
+                self._response.json()["uploadUrl"],
+                fragment_size=fragment_size,
+                max_workers=max_workers,
+            )
+
+    SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024
+
     created_date_time = DateTimeField()
     id = CharField(fallback="item_id")
     last_modified_date_time = DateTimeField()
@@ -146,11 +250,152 @@ class DriveItem(SingleValuedResource):
     def children(self) -> "DriveItem.Children":
         return self.Children(self._client, parent=self)
 
+    @property
+    def is_folder(self) -> bool:
+        return "folder" in self._data
+
+    def walk(
+        self,
+        max_workers: int = 8,
+        max_depth: int | None = None,
+        folder_filter: Callable[["DriveItem"], bool] | None = None,
+        extensions: Iterable[str] | None = None,
+        select: str | None = None,
+        page_size: int | None = None,
+    ) -> "DriveWalker":
+        return DriveWalker(
+            self,
+            max_workers=max_workers,
+            max_depth=max_depth,
+            folder_filter=folder_filter,
+            extensions=extensions,
+            select=select,
+            page_size=page_size,
+        )
+
+    @property
+    def content(self) -> "DriveItem.Content":
+        return self.Content(self._client, parent=self)
+
+    def create_upload_session(
+        self,
+        conflict_behavior: str = "replace",
+        fragment_size: int = 32 * FRAGMENT_UNIT,
+        max_workers: int = 1,
+    ) -> UploadSession:
+        return self.CreateUploadSession(self._client, parent=self).create(
+            conflict_behavior=conflict_behavior,
+            fragment_size=fragment_size,
+            max_workers=max_workers,
+        )
+
     def by_relative_path(self, relative_path: str) -> "DriveByRelativePath":
         return DriveByRelativePath(
             self._client, parent=self, relative_path=relative_path
         )
 
+    # Small files go up in one request, anything larger through an upload
+    # session. With a filename the file is created below this item, otherwise
+    # this item's own content is replaced.
+    def upload(
+        self,
+        source: Source,
+        filename: str | None = None,
+        size: int | None = None,
+        fragment_size: int = 32 * FRAGMENT_UNIT,
+        max_workers: int = 1,
+        conflict_behavior: str = "replace",
+    ) -> "DriveItem":
+        _require_sync_client(self._client, "upload")
+        if filename is not None:
+            # The name is part of the url path, '#', '?' or '%' would end it.
+            return self.by_relative_path(quote(filename, safe="/")).upload(
+                source,
+                size=size,
+                fragment_size=fragment_size,
+                max_workers=max_workers,
+                conflict_behavior=conflict_behavior,
+            )
+
+        reader = get_reader(source)
+        try:
+            size = get_size(reader, size)
+            if size <= self.SIMPLE_UPLOAD_LIMIT:
+                content = self.content.put(
+                    reader.read(0, size), conflict_behavior=conflict_behavior
+                )
+                data = content._response.json()
+            else:
+                session = self.create_upload_session(
+                    conflict_behavior=conflict_behavior,
+                    fragment_size=fragment_size,
+                    max_workers=max_workers,
+                )
+                data = session.upload(reader, size)
+        finally:
+            reader.close()
+
+        drive_items = get_drive_items(self._client, data["parentReference"]["driveId"])
+        item = DriveItem(self._client, data=data, parent=drive_items)
+        if self._client.cache is not None:
+            self._client.cache.invalidate(item.url, self._client._cache_scope)
+        return item
+
+    # https://learn.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0
+    #
+    # An item that changes while it is downloaded is read again, with its new
+    # size, etag and url, and downloaded from the start.
+    def download(
+        self,
+        target: str | os.PathLike | BinaryIO,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = 1,
+        part_size: int = DOWNLOAD_PART_SIZE,
+        resume: bool = True,
+        max_restarts: int = 3,
+    ) -> int:
+        _require_sync_client(self._client, "download")
+
+        is_path = isinstance(target, (str, os.PathLike))
+        origin = None
+        if not is_path and target.seekable():  # type: ignore
+            origin = target.tell()  # type: ignore
+        restarts = 0
+        while True:
+            download = self._get_download(chunk_size, max_workers, part_size)
+            try:
+                return download.to(target, resume=resume)
+            except ContentChangedError:
+                restarts += 1
+                if restarts > max_restarts or not (is_path or origin is not None):
+                    raise
+                if origin is not None:
+                    target.seek(origin)  # type: ignore
+                    target.truncate()  # type: ignore
+
+    def _get_download(
+        self, chunk_size: int, max_workers: int, part_size: int
+    ) -> Download:
+        # Download urls expire after a short time, so always ask for a new one.
+        response = self._client._request(
+            "GET", f"{self.url}?$select=id,size,eTag,@microsoft.graph.downloadUrl"
+        )
+        raise_for_status(response)
+        data = response.json()
+        download_url = data.get("@microsoft.graph.downloadUrl")
+        if download_url is None:
+            raise ValueError(f"Item has no content to download, '{self.url}'")
+
+        return Download(
+            self._client,
+            download_url,
+            data["size"],
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            part_size=part_size,
+            etag=data.get("eTag"),
+        )
+
     def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
         _item_id = kwargs.get("item_id") or self.id
         if _item_id is None:
@@ -161,11 +406,17 @@ class DriveItem(SingleValuedResource):
 
 
 class RootDriveItem(DriveItem):
+    __slots__ = ()
 
     @property
     def relative_url(self) -> str:
         return "/root"
 
+    def delta(
+        self, store: DeltaStore | None = None, key: str | None = None
+    ) -> "DriveItemDelta":
+        return DriveItemDelta(self._client, parent=self, store=store, key=key)
+
     def by_relative_path(self, relative_path: str) -> "DriveByRelativePath":
         return DriveByRelativePath(
             self._client, parent=self, relative_path=relative_path
@@ -176,12 +427,29 @@ class RootDriveItem(DriveItem):
 
 
 class DriveByRelativePath(DriveItem):
+    __slots__ = ("_relative_path",)
 
     class Children(DriveItem.Children):
+        __slots__ = ()
+
         @property
         def relative_url(self):
             return f":/children"
 
+    class Content(DriveItem.Content):
+        __slots__ = ()
+
+        @property
+        def relative_url(self) -> str:
+            return ":/content"
+
+    class CreateUploadSession(DriveItem.CreateUploadSession):
+        __slots__ = ()
+
+        @property
+        def relative_url(self) -> str:
+            return ":/createUploadSession"
+
     @property
     def relative_url(self) -> str:
         return f":/{self._relative_path}"
@@ -197,6 +465,126 @@ class DriveByRelativePath(DriveItem):
         self._relative_path = _relative_path
 
 
+# Uploads and downloads read and write files from worker threads, they are
+# only available on the sync client.
+def _require_sync_client(client: "MgraphClient", name: str) -> None:
+    if client.IS_ASYNC:
+        raise TypeError(f"Method is not supported by the async client, '{name}'")
+
+
+# The /drives/{id}/items parent of items read from a listing. One instance
+# per drive is shared by every listing of the client and dropped once no item
+# refers to it, so a walk does not build a Drives, Drive and DriveItems chain
+# for each child.
+def get_drive_items(client: "MgraphClient", drive_id: str) -> Drive.DriveItems:
+    drive_items = client._drive_items.get(drive_id)
+    if drive_items is None:
+        drive = Drive(client, parent=Drives(client), drive_id=drive_id)
+        drive_items = client._drive_items[drive_id] = drive.items
+    return drive_items
+
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-delta?view=graph-rest-1.0
+class DriveItemDelta(DeltaQuery, DriveItem.Children):
+    __slots__ = ("_store", "_key")
+
+    def _get_obj(
+        self, klass: type[R], client: "MgraphClient", data: dict[str, Any]
+    ) -> R:
+        # Items removed from the drive may come back without a parent reference,
+        # they belong to the drive the delta is listed on. A default drive that
+        # was not fetched has no id, its items are listed below /drive/items.
+        drive_id = (data.get("parentReference") or {}).get("driveId")
+        if drive_id is None:
+            drive = self._parent._parent
+            drive_id = drive.id
+            if drive_id is None:
+                return klass(
+                    client, data=data, parent=Drive.DriveItems(client, parent=drive)
+                )
+        return klass(client, data=data, parent=self._get_drive_items(drive_id))
+
+
+# Breadth-first crawl below a drive item. Each folder is listed by one worker,
+# its pages are streamed, and sub-folders are queued as soon as they are seen,
+# so a large or slow folder does not hold up its siblings.
+class DriveWalker:
+
+    REQUIRED_FIELDS = ("id", "name", "folder", "file", "parentReference")
+
+    def __init__(
+        self,
+        root: DriveItem,
+        max_workers: int = 8,
+        max_depth: int | None = None,
+        folder_filter: Callable[[DriveItem], bool] | None = None,
+        extensions: Iterable[str] | None = None,
+        select: str | None = None,
+        page_size: int | None = None,
+        queue_size: int = 10000,
+    ) -> None:
+        if extensions is not None:
+            extensions = {f".{ext.lower().lstrip('.')}" for ext in extensions}
+        if select is not None:
+            fields = [field.strip() for field in select.split(",")]
+            fields += [field for field in self.REQUIRED_FIELDS if field not in fields]
+            select = ",".join(fields)
+
+        self.root = root
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.folder_filter = folder_filter
+        self.extensions = extensions
+        self.select = select
+        self.page_size = page_size
+        self.queue_size = queue_size
+
+    def __iter__(self) -> Iterator[DriveItem]:
+        results = WorkerQueue(maxsize=self.queue_size)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            executor.submit(results.worker(self._list, self.root, 1, results))
+            for item, depth in results:
+                if depth is not None:
+                    executor.submit(results.worker(self._list, item, depth, results))
+                if self._include(item):
+                    yield item
+        finally:
+            results.stop()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # Folders to descend into are put with the depth of their children.
+    def _list(self, folder: DriveItem, depth: int, results: WorkerQueue) -> None:
+        children = folder.children
+        if self.select:
+            children.select(self.select)
+        if self.page_size:
+            children.top(self.page_size)
+        children.get()
+
+        for item in children.stream_items():
+            child_depth = depth + 1 if self._descend(item, depth) else None
+            if not results.put((item, child_depth)):
+                return
+
+    def _descend(self, item: DriveItem, depth: int) -> bool:
+        if not item.is_folder:
+            return False
+        if self.max_depth is not None and depth >= self.max_depth:
+            return False
+        if self.folder_filter is not None and not self.folder_filter(item):
+            return False
+        return True
+
+    def _include(self, item: DriveItem) -> bool:
+        if self.extensions is None:
+            return True
+        if item.is_folder:
+            return False
+        return os.path.splitext(item.name or "")[1].lower() in self.extensions
+
+
 # class DriveItemChildren(MultiValuedResource):
 #     ITEM_CLASS = "DriveItem"
 
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import datetime
-from typing import Any, AnyStr
+from typing import Any, AnyStr, Iterable
 
 
 class Field(ABC):
@@ -13,17 +13,30 @@ class Field(ABC):
         names = name.split("_")
         self.name = "".join([names[0]] + [i.title() for i in names[1:]])
 
+    # Decoded values are kept on the instance for as long as its _data is the
+    # same object, get() replaces _data and with it every decoded value.
     def __get__(self, obj, objtype=None) -> Any:
         if obj is None:
             return self
+        data = obj._data
+        if obj._decoded_data is data:
+            decoded = obj._decoded
+            try:
+                return decoded[self._name]
+            except KeyError:
+                pass
+        else:
+            decoded = obj._decoded = {}
+            obj._decoded_data = data
+
         try:
-            val = obj._data[self.name]
+            val = data[self.name]
         except KeyError:
             if self.fallback:
                 return getattr(obj, f"_{self.fallback}", None)
             return None
-        else:
-            return self.get_value(val)
+        value = decoded[self._name] = None if val is None else self.get_value(val)
+        return value
 
     def __set__(self, obj, value) -> None:
         if self.is_readonly:
@@ -37,6 +50,14 @@ class Field(ABC):
     def get_value(self, *args, **kwargs) -> Any:
         pass
 
+    def get_values(self, items: Iterable[dict[str, Any]]) -> list[Any]:
+        name = self.name
+        get_value = self.get_value
+        return [
+            None if (val := item.get(name)) is None else get_value(val)
+            for item in items
+        ]
+
 
 class CharField(Field):
     def get_value(self, val: Any):
@@ -48,11 +69,40 @@ class IntegerField(Field):
         return int(val)
 
 
+# Graph sends up to 7 fractional digits, e.g. 2024-01-31T08:15:00.1234567Z,
+# fromisoformat keeps the first 6.
 class DateTimeField(Field):
     def get_value(self, val: Any) -> datetime.datetime:
         return datetime.datetime.fromisoformat(str(val))
 
+    def get_values(self, items: Iterable[dict[str, Any]]) -> list[Any]:
+        # Listings repeat the same timestamps a lot, each is parsed once.
+        name = self.name
+        fromisoformat = datetime.datetime.fromisoformat
+        parsed: dict[str, datetime.datetime] = {}
+        values = []
+        append = values.append
+        for item in items:
+            val = item.get(name)
+            if val is None:
+                append(None)
+                continue
+            try:
+                append(parsed[val])
+            except KeyError:
+                append(parsed.setdefault(val, fromisoformat(val)))
+        return values
+
 
 class BooleanField(Field):
     def get_value(self, val: Any):
         return bool(val)
+
+
+def get_fields(klass: type) -> dict[str, Field]:
+    fields: dict[str, Field] = {}
+    for base in reversed(klass.__mro__):
+        for name, attr in vars(base).items():
+            if isinstance(attr, Field):
+                fields[name] = attr
+    return fields
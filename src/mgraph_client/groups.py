@@ -1,10 +1,16 @@
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+from .delta import DeltaQuery, DeltaStore
 from .resources import SingleValuedResource, MultiValuedResource
 from .fields import CharField, BooleanField
 from . import directory_objects as do
 
+if TYPE_CHECKING:
+    from .batch import BatchRequest
+
 
 class Groups(MultiValuedResource):
+    __slots__ = ()
+
     class RequestQueryParam(MultiValuedResource.RequestQueryParam):
         TOP = True
         SEARCH = True
@@ -19,8 +25,28 @@ class Groups(MultiValuedResource):
     def by_id(self, group_id: str) -> "Group":
         return Group(self._client, parent=self, group_id=group_id)
 
+    def delta(
+        self, store: DeltaStore | None = None, key: str | None = None
+    ) -> "GroupsDelta":
+        return GroupsDelta(self._client, parent=self, store=store, key=key)
+
+
+# https://learn.microsoft.com/en-us/graph/api/group-delta?view=graph-rest-1.0
+class GroupsDelta(DeltaQuery, MultiValuedResource):
+    __slots__ = ("_store", "_key")
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        FILTER = False
+        ORDERBY = False
+
+    ITEM_CLASS = "Group"
+
 
 class Group(SingleValuedResource):
+    __slots__ = ("_group_id",)
+
+    class RequestMethod(SingleValuedResource.RequestMethod):
+        PATCH = True
 
     id = CharField()
     description = CharField()
@@ -46,17 +72,48 @@ class Group(SingleValuedResource):
         self._group_id = group_id
 
 
+class MembershipResult:
+
+    def __init__(self) -> None:
+        self.added: list[str] = []
+        self.removed: list[str] = []
+        self.failed: dict[str, "BatchRequest"] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+# https://learn.microsoft.com/en-us/graph/api/group-post-members?view=graph-rest-1.0#example-2-add-multiple-members-to-a-group-in-a-single-request
 class Members(MultiValuedResource):
+    __slots__ = ()
 
     ITEM_CLASS = "User"
+    MAX_BIND = 20
 
     class Reference(do.Reference):
+        __slots__ = ()
+
         class RequestMethod(do.Reference.RequestMethod):
             POST = True
 
         def get_payload_from_arg(self, dir_obj_id: str):
             return {"@odata.id": self._client.directory_objects.by_id(dir_obj_id).url}
 
+    # https://learn.microsoft.com/en-us/graph/api/group-delete-members?view=graph-rest-1.0
+    class DirectoryObject(do.DirectoryObject):
+        __slots__ = ()
+
+        class Reference(do.Reference):
+            __slots__ = ()
+
+            class RequestMethod(do.Reference.RequestMethod):
+                DELETE = True
+
+        @property
+        def ref(self) -> "Members.DirectoryObject.Reference":
+            return self.Reference(self._client, parent=self)
+
     @property
     def relative_url(self):
         return f"/members"
@@ -65,21 +122,99 @@ class Members(MultiValuedResource):
     def ref(self):
         return Members.Reference(self._client, parent=self)
 
-    def by_directory_object_id(self, dir_obj_id: str) -> do.DirectoryObject:
-        return do.DirectoryObject(self._client, parent=self, dir_obj_id=dir_obj_id)
-
-    def add(self, user_ids: str | Iterable[str]):
-        pass
-
-    # def get_payload_from_args(self, *args: str):
-    #     dir_objs = do.DirectoryObjects()
-    #     return {"members@odata.bind": [dir_objs.by_id(arg).url for arg in args]}
-
-
-# class DirectoryObject(do.DirectoryObject):
-#     class Reference(do.Reference):
-#         DELETE = True
-
-#     @property
-#     def ref(self):
-#         return DirectoryObject.Reference(self._client, parent=self)
+    def by_directory_object_id(self, dir_obj_id: str) -> "Members.DirectoryObject":
+        return self.DirectoryObject(self._client, parent=self, dir_obj_id=dir_obj_id)
+
+    def iter_ids(self) -> Iterator[str]:
+        members = Members(self._client, parent=self._parent).select("id")
+        members.get()
+        for member in members.stream_items():
+            yield member.id
+
+    # Up to 20 members are bound per PATCH and up to 20 PATCHes go in one
+    # $batch. A chunk is rejected as a whole when any of its ids is, so the
+    # ids of a failed chunk are added again one $ref at a time to find out
+    # which of them failed.
+    def add(
+        self, dir_obj_ids: str | Iterable[str], max_retries: int = 3
+    ) -> MembershipResult:
+        if isinstance(dir_obj_ids, str):
+            dir_obj_ids = [dir_obj_ids]
+        dir_obj_ids = list(dict.fromkeys(dir_obj_ids))
+        directory_objects = self._client.directory_objects
+        result = MembershipResult()
+
+        chunks = [
+            dir_obj_ids[i : i + self.MAX_BIND]
+            for i in range(0, len(dir_obj_ids), self.MAX_BIND)
+        ]
+        with self._client.batch(max_retries=max_retries) as batch:
+            requests = [
+                batch.patch(
+                    self._parent,
+                    {
+                        "members@odata.bind": [
+                            directory_objects.by_id(dir_obj_id).url
+                            for dir_obj_id in chunk
+                        ]
+                    },
+                )
+                for chunk in chunks
+            ]
+
+        retry = []
+        for chunk, req in zip(chunks, requests):
+            if req.ok:
+                result.added.extend(chunk)
+            elif len(chunk) == 1:
+                result.failed[chunk[0]] = req
+            else:
+                retry.extend(chunk)
+
+        if retry:
+            ref = self.ref
+            with self._client.batch(max_retries=max_retries) as batch:
+                requests = [
+                    batch.post(ref, ref.get_payload_from_arg(dir_obj_id))
+                    for dir_obj_id in retry
+                ]
+            for dir_obj_id, req in zip(retry, requests):
+                if req.ok:
+                    result.added.append(dir_obj_id)
+                else:
+                    result.failed[dir_obj_id] = req
+        return result
+
+    def remove(
+        self, dir_obj_ids: str | Iterable[str], max_retries: int = 3
+    ) -> MembershipResult:
+        if isinstance(dir_obj_ids, str):
+            dir_obj_ids = [dir_obj_ids]
+        dir_obj_ids = list(dict.fromkeys(dir_obj_ids))
+        result = MembershipResult()
+
+        with self._client.batch(max_retries=max_retries) as batch:
+            requests = [
+                batch.delete(self.by_directory_object_id(dir_obj_id).ref)
+                for dir_obj_id in dir_obj_ids
+            ]
+        for dir_obj_id, req in zip(dir_obj_ids, requests):
+            # Already gone is as good as removed.
+            if req.ok or req.status == 404:
+                result.removed.append(dir_obj_id)
+            else:
+                result.failed[dir_obj_id] = req
+        return result
+
+    def sync(
+        self, dir_obj_ids: Iterable[str], remove: bool = True, max_retries: int = 3
+    ) -> MembershipResult:
+        desired = dict.fromkeys(dir_obj_ids)
+        current = set(self.iter_ids())
+
+        result = self.add([i for i in desired if i not in current], max_retries)
+        if remove:
+            removed = self.remove([i for i in current if i not in desired], max_retries)
+            result.removed = removed.removed
+            result.failed.update(removed.failed)
+        return result
@@ -0,0 +1,329 @@
+import bisect
+import threading
+from typing import Any, Callable, Iterable
+
+Hook = Callable[[Any], None]
+
+
+# One per call of MgraphClient._request, retries included. Phases are summed
+# over the attempts and stay None when they did not happen, e.g. connect for
+# a pooled connection or decode for a response that was not parsed:
+#   token    getting the access token, MSAL when it has to be refreshed
+#   wait     rate limiter and retry sleeps
+#   connect  new connections, TCP and TLS
+#   ttfb     sending the request until the response headers arrive
+#   body     reading the response body
+#   decode   JSON decoding
+class RequestEvent:
+
+    __slots__ = (
+        "method",
+        "url",
+        "resource",
+        "status",
+        "retries",
+        "error",
+        "request_bytes",
+        "response_bytes",
+        "token",
+        "wait",
+        "connect",
+        "ttfb",
+        "body",
+        "decode",
+    )
+
+    PHASES = ("token", "wait", "connect", "ttfb", "body", "decode")
+
+    def __init__(self, method: str, url: str, resource: str | None = None) -> None:
+        self.method = method
+        self.url = url
+        self.resource = resource
+        self.status: int | None = None
+        self.retries = 0
+        self.error: str | None = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.token: float | None = None
+        self.wait: float | None = None
+        self.connect: float | None = None
+        self.ttfb: float | None = None
+        self.body: float | None = None
+        self.decode: float | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestEvent {self.method} {self.url} status={self.status} "
+            f"retries={self.retries} duration={self.duration:.6f}>"
+        )
+
+    @property
+    def phases(self) -> dict[str, float]:
+        return {
+            phase: value
+            for phase in self.PHASES
+            if (value := getattr(self, phase)) is not None
+        }
+
+    @property
+    def duration(self) -> float:
+        return sum(self.phases.values())
+
+    def add(self, phase: str, seconds: float) -> None:
+        setattr(self, phase, (getattr(self, phase) or 0.0) + seconds)
+
+    # `seconds` is the time spent in Transport.request and `connect` the part
+    # of it spent opening connections. Transports that don't report when the
+    # headers arrived count the whole exchange as ttfb.
+    def add_exchange(
+        self, response: Any, seconds: float, connect: float, stream: bool
+    ) -> None:
+        ttfb = _get_elapsed(response, seconds)
+        if connect:
+            self.add("connect", connect)
+        self.add("ttfb", max(ttfb - connect, 0.0))
+        self.add("body", seconds - ttfb)
+        self.status = response.status_code
+        self.error = None
+        self.request_bytes += _get_request_size(response)
+        self.response_bytes += _get_response_size(response, stream)
+
+    def add_error(self, error: BaseException, connect: float) -> None:
+        if connect:
+            self.add("connect", connect)
+        self.status = None
+        self.error = type(error).__name__
+
+
+# Items of one page wrapped in their resource class, emitted once the page
+# iterator is exhausted or closed. Wrapping is lazy, so this is separate from
+# the RequestEvent of the page.
+class WrapEvent:
+
+    __slots__ = ("resource", "items", "wrap")
+
+    PHASES = ("wrap",)
+
+    def __init__(self, resource: str | None = None) -> None:
+        self.resource = resource
+        self.items = 0
+        self.wrap = 0.0
+
+    def __repr__(self) -> str:
+        return f"<WrapEvent {self.resource} items={self.items} wrap={self.wrap:.6f}>"
+
+    @property
+    def phases(self) -> dict[str, float]:
+        return {"wrap": self.wrap}
+
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[tuple[str, int]]:
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            yield _format_value(bound), total
+
+
+# Aggregates events into counters and histograms, rendered in the Prometheus
+# text exposition format. Register it as a client hook:
+#   metrics = PrometheusMetrics()
+#   client = MgraphClient(..., hooks=[metrics])
+#   metrics.render()
+class PrometheusMetrics:
+
+    METRICS = {
+        "mgraph_requests_total": (
+            "counter",
+            "Requests sent to Graph, retries counted once.",
+        ),
+        "mgraph_request_errors_total": (
+            "counter",
+            "Requests that failed without a response.",
+        ),
+        "mgraph_retries_total": ("counter", "Retried attempts."),
+        "mgraph_request_bytes_total": ("counter", "Request body bytes sent."),
+        "mgraph_response_bytes_total": ("counter", "Response body bytes received."),
+        "mgraph_items_wrapped_total": (
+            "counter",
+            "Listing items wrapped in their resource class.",
+        ),
+        "mgraph_request_duration_seconds": (
+            "histogram",
+            "Total time of a request, all phases and retries.",
+        ),
+        "mgraph_phase_seconds": ("histogram", "Time spent in each request phase."),
+    }
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Any) -> None:
+        resource = ("resource", event.resource or "")
+        with self._lock:
+            if isinstance(event, WrapEvent):
+                self._inc("mgraph_items_wrapped_total", (resource,), event.items)
+                self._observe(
+                    "mgraph_phase_seconds", (("phase", "wrap"), resource), event.wrap
+                )
+                return
+
+            method = ("method", event.method)
+            if event.status is None:
+                labels = (method, ("error", event.error or ""), resource)
+                self._inc("mgraph_request_errors_total", labels)
+            else:
+                labels = (method, ("status", str(event.status)), resource)
+                self._inc("mgraph_requests_total", labels)
+            if event.retries:
+                self._inc("mgraph_retries_total", (method, resource), event.retries)
+            self._inc(
+                "mgraph_request_bytes_total", (method, resource), event.request_bytes
+            )
+            self._inc(
+                "mgraph_response_bytes_total", (method, resource), event.response_bytes
+            )
+
+            phases = event.phases
+            self._observe(
+                "mgraph_request_duration_seconds",
+                (method, resource),
+                sum(phases.values()),
+            )
+            for phase, seconds in phases.items():
+                self._observe(
+                    "mgraph_phase_seconds", (("phase", phase), resource), seconds
+                )
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help) in self.METRICS.items():
+                series = (
+                    self._counters if kind == "counter" else self._histograms
+                ).get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    if isinstance(value, Histogram):
+                        for bound, count in value.cumulative():
+                            bucket = _format_labels((*labels, ("le", bound)))
+                            lines.append(f"{name}_bucket{bucket} {count}")
+                        lines.append(
+                            f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}"
+                        )
+                        lines.append(
+                            f"{name}_count{_format_labels(labels)} {value.count}"
+                        )
+                    else:
+                        lines.append(
+                            f"{name}{_format_labels(labels)} {_format_value(value)}"
+                        )
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _inc(self, name: str, labels: tuple, value: float = 1) -> None:
+        series = self._counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + value
+
+    def _observe(self, name: str, labels: tuple, value: float) -> None:
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+
+def _format_labels(labels: Iterable[tuple[str, Any]]) -> str:
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _get_elapsed(response: Any, seconds: float) -> float:
+    # requests sets elapsed once the headers are parsed, httpx only after the
+    # body has been read, and raises while the response is still open.
+    try:
+        elapsed = response.elapsed.total_seconds()
+    except (AttributeError, RuntimeError):
+        return seconds
+    if 0.0 < elapsed <= seconds:
+        return elapsed
+    return seconds
+
+
+def _get_request_size(response: Any) -> int:
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)
+    if body is None:
+        try:
+            body = getattr(request, "content", None)
+        except Exception:
+            return 0
+    try:
+        return len(body)  # type: ignore
+    except TypeError:
+        return 0
+
+
+def _get_response_size(response: Any, stream: bool) -> int:
+    if not stream:
+        return len(response.content)
+    try:
+        return int(response.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
@@ -0,0 +1,118 @@
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from .transport import raise_for_status
+
+if TYPE_CHECKING:
+    from mgraph_client import MgraphClient
+
+
+# A bounded queue from worker threads to the one thread that iterates it. A
+# put waits for room only until stop(), so a worker never blocks on a
+# consumer that has gone. Each worker from `worker()` is pending until it
+# returns, its exception is raised to the consumer, and iterating yields what
+# the workers put until none is pending.
+class WorkerQueue:
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._pending = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        while self._pending:
+            kind, value = self._queue.get()
+            if kind == "done":
+                self._pending -= 1
+            elif kind == "error":
+                raise value
+            else:
+                yield value
+
+    @property
+    def is_stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # Called by the consumer, the returned callable is run by the worker.
+    def worker(self, fn: Callable[..., None], *args: Any) -> Callable[[], None]:
+        self._pending += 1
+        return lambda: self._run(fn, *args)
+
+    def put(self, item: Any) -> bool:
+        return self._put(("item", item))
+
+    def _run(self, fn: Callable[..., None], *args: Any) -> None:
+        try:
+            fn(*args)
+        except BaseException as e:
+            self._put(("error", e))
+        else:
+            self._put(("done", None))
+
+    def _put(self, item: tuple[str, Any]) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=self.POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+
+# Follows @odata.nextLink in a background thread. The bounded queue is the
+# backpressure: the thread stops fetching once `depth` pages are waiting.
+# close() does not wait for the thread, which can be in a request or in a
+# retry sleep of minutes. It is a daemon and ends at its next stop check.
+class PagePrefetcher:
+
+    def __init__(
+        self,
+        client: "MgraphClient",
+        next_link: str,
+        page: int,
+        headers: dict[str, str] | None = None,
+        depth: int = 1,
+        resource: Any = None,
+    ) -> None:
+        if depth < 1:
+            raise ValueError(f"Prefetch depth must be at least 1, '{depth}'")
+
+        self._client = client
+        self._headers = headers
+        self._resource = resource
+        self._queue = WorkerQueue(maxsize=depth)
+        self._thread = threading.Thread(
+            target=self._queue.worker(self._run, next_link, page), daemon=True
+        )
+        self._thread.start()
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        return iter(self._queue)
+
+    def close(self) -> None:
+        self._queue.stop()
+
+    def _run(self, next_link: str, page: int) -> None:
+        while next_link and not self._queue.is_stopped:
+            response = self._client._request(
+                "GET",
+                next_link,
+                headers=self._headers,
+                resource=self._resource,
+                decode=True,
+            )
+            if self._queue.is_stopped:
+                return
+            raise_for_status(response)
+            data = self._client._decode(response)
+            if not self._queue.put((page, data)):
+                return
+
+            next_link = data.get("@odata.nextLink")
+            page += 1
@@ -0,0 +1,149 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+# https://learn.microsoft.com/en-us/graph/throttling-limits
+
+
+class TokenBucket:
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease: float,
+        success_threshold: int,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.success_threshold = success_threshold
+
+        self.tokens = burst
+        self.throttled = 0
+        self._successes = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.success_threshold:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self._successes = 0
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drop the saved burst so the lower rate applies straight away.
+            self.tokens = min(self.tokens, 0.0)
+
+
+# Additive increase on sustained success, multiplicative decrease on throttling,
+# with one bucket per workload family so Intune and SharePoint limits are
+# tracked separately. reserve() never blocks, so threads and asyncio tasks can
+# share one limiter and sleep in their own way.
+class AdaptiveRateLimiter:
+
+    FAMILIES = {
+        "deviceManagement": "intune",
+        "drives": "sharepoint",
+        "sites": "sharepoint",
+    }
+    THROTTLE_STATUSES = frozenset({429, 503})
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float | None = None,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        success_threshold: int = 20,
+        rates: dict[str, float] | None = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.success_threshold = success_threshold
+        self.rates = rates or {}
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> dict[str, dict[str, float]]:
+        return {
+            family: {"rate": bucket.rate, "throttled": bucket.throttled}
+            for family, bucket in list(self._buckets.items())
+        }
+
+    def family(self, url: str) -> str:
+        parts = urlsplit(url)
+        if not parts.netloc.endswith("graph.microsoft.com"):
+            return parts.netloc
+
+        # Path is /{version}/{segment}/...
+        segments = parts.path.split("/", 3)
+        segment = segments[2] if len(segments) > 2 else ""
+        return self.FAMILIES.get(segment, "graph")
+
+    def bucket(self, url: str) -> TokenBucket:
+        family = self.family(url)
+        try:
+            return self._buckets[family]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if family not in self._buckets:
+                rate = self.rates.get(family, self.rate)
+                self._buckets[family] = TokenBucket(
+                    rate=rate,
+                    burst=self.burst or rate,
+                    min_rate=self.min_rate,
+                    max_rate=self.max_rate or rate * 4,
+                    increase=self.increase,
+                    decrease=self.decrease,
+                    success_threshold=self.success_threshold,
+                )
+            return self._buckets[family]
+
+    def reserve(self, url: str) -> float:
+        return self.bucket(url).reserve()
+
+    def acquire(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+
+    def feedback(self, url: str, status: int | None) -> None:
+        bucket = self.bucket(url)
+        if status in self.THROTTLE_STATUSES:
+            bucket.on_throttle()
+        elif status is not None and status < 500:
+            bucket.on_success()
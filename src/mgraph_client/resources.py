@@ -1,10 +1,16 @@
+import importlib
 from abc import ABC, abstractmethod
+from time import perf_counter
+from urllib.parse import quote
 from pyclbr import Class
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncIterator,
     ClassVar,
+    Iterable,
     Iterator,
+    Sequence,
     TypeAlias,
     TypeVar,
     Union,
@@ -18,15 +24,66 @@ if TYPE_CHECKING:
     from .directory_objects import DirectoryObject
     from .drives import Drive, DefaultDrive
 
-import requests
+from .cache import CacheEntry, ResponseCache, get_etag
+from .columns import export_columns
+from .decoders import MsgspecDecoder
+from .fields import Field
+from .instrumentation import WrapEvent
+from .prefetch import PagePrefetcher
+from .sharding import ShardedListing
+from .transport import raise_for_status
 
 R = TypeVar("R", "ManagedDevice", "DefaultDrive", "Drive", "Resource")
 
 
+# Models looked up by name from outside their own module, the client's
+# resource attributes and cross-module ITEM_CLASS names, e.g. Members items
+# are Users. The module is imported on first lookup, so `import mgraph_client`
+# loads no models.
+MODEL_MODULES = {
+    "DeviceManagement": "device_management",
+    "ManagedDevice": "device_management",
+    "DirectoryObjects": "directory_objects",
+    "Drives": "drives",
+    "DriveItem": "drives",
+    "Groups": "groups",
+    "Group": "groups",
+    "Sites": "sites",
+    "Site": "sites",
+    "Users": "users",
+    "User": "users",
+}
+
+
+def get_model(name: str) -> type["Resource"]:
+    try:
+        return Resource.MODELS[name]
+    except KeyError:
+        pass
+    module = MODEL_MODULES.get(name)
+    if module is not None:
+        importlib.import_module(f"{__package__}.{module}")
+    try:
+        return Resource.MODELS[name]
+    except KeyError:
+        raise ValueError(f"Model does not exist, '{name}'") from None
+
+
+# OData syntax, commas, parentheses, quotes, slashes and colons, is left as
+# is. Spaces, '+', '&', '#', '%' and double quotes are encoded, so $filter
+# and $search values reach Graph unchanged.
+_QUERY_SAFE = "$,()':/@*!-._~"
+
+
+def quote_query_value(value: Any) -> str:
+    return quote(str(value), safe=_QUERY_SAFE)
+
+
 class RequestMethod:
     GET = False
     POST = False
     PATCH = False
+    PUT = False
     DELETE = False
 
 
@@ -75,13 +132,31 @@ class RequestQueryParam:
 
 
 class Resource(ABC):
+    # Listings create one instance per item, so instances carry no __dict__.
+    # Subclasses declare the attributes they add in their own __slots__.
+    __slots__ = (
+        "_client",
+        "_data",
+        "_parent",
+        "_has_changed",
+        "_query_params",
+        "_request_headers",
+        "_response",
+        "_decoded",
+        "_decoded_data",
+        "_url",
+        "_query_string",
+    )
+
     URL = "https://graph.microsoft.com/v1.0"
     MODELS = {}
+    CACHEABLE = False
 
     class RequestMethod:
         GET = False
         POST = False
         PATCH = False
+        PUT = False
         DELETE = False
 
     class RequestQueryParam:
@@ -113,7 +188,12 @@ class Resource(ABC):
         self._data = data
         self._parent = parent
         self._has_changed = has_changed
-        self._query_params: dict[str, Any] = {}
+        self._query_params: dict[str, Any] | None = None
+        self._request_headers: dict[str, str] | None = None
+        self._decoded: dict[str, Any] | None = None
+        self._decoded_data: dict[str, Any] | None = None
+        self._url: str | None = None
+        self._query_string: str | None = None
         # self._get_response = None
         # self._is_post = False
         # for k, v in kwargs.items():
@@ -131,77 +211,71 @@ class Resource(ABC):
     def relative_url(self) -> str:
         pass
 
+    # The path of a resource never changes, so it is built once and children
+    # only append their relative url to the parent's cached one.
     @property
     def url(self) -> str:
-        parent = self._parent
-        if parent is None:
-            return f"{self.URL}{self.relative_url}"
-        return f"{parent.url}{self.relative_url}"
+        url = self._url
+        if url is None:
+            parent = self._parent
+            prefix = self.URL if parent is None else parent.url
+            url = self._url = prefix + self.relative_url
+        return url
 
     @property
     def url_with_query_params(self) -> str:
-        query_params = self.query_params
-        if query_params:
-            return f"{self.url}?{'&'.join(query_params)}"
+        query_string = self._query_string
+        if query_string is None:
+            query_string = self._query_string = "&".join(self.query_params)
+        if query_string:
+            return f"{self.url}?{query_string}"
         return self.url
 
     @property
     def query_params(self) -> list[str]:
-        return [f"${k}={v}" for k, v in self._query_params.items()]
+        if not self._query_params:
+            return []
+        return [f"${k}={quote_query_value(v)}" for k, v in self._query_params.items()]
 
     def get(self) -> "Resource":
         if not self.RequestMethod.GET:
             raise ValueError(f"Endpoint does not support GET method, '{self.url}'")
+        if self._client.IS_ASYNC:
+            return self._aget()  # type: ignore
         if self._has_changed:
-            response = requests.get(
-                self.url_with_query_params, headers=self._client._headers
-            )
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError:
-                print(response.json())
-                raise
-            self._data = response.json()
-            self._has_changed = False
+            entry = self._get_cache_entry()
+            if self._has_changed:
+                response = self._client._request(
+                    "GET",
+                    self.url_with_query_params,
+                    headers=self._get_request_headers(entry),
+                    resource=self,
+                    decode=True,
+                )
+                self._on_get(response, entry)
         return self
 
     def patch(self, data: dict[str, Any]) -> "Resource":
         if not self.RequestMethod.PATCH:
             raise ValueError(f"Endpoint does not support PATCH method, '{self.url}'")
-        response = requests.patch(self.url, headers=self._client._headers, json=data)
-        self._patch_response = response
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
-        return self
+        return self._send("PATCH", json=data)
 
     def post(self, payload: dict[str, Any]) -> "Resource":
         if not self.RequestMethod.POST:
             raise ValueError(f"Endpoint does not support POST method, '{self.url}'")
-        response = requests.post(self.url, headers=self._client._headers, json=payload)
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
-        return self
+        return self._send("POST", json=payload)
+
+    def put(
+        self, content: bytes, content_type: str = "application/octet-stream"
+    ) -> "Resource":
+        if not self.RequestMethod.PUT:
+            raise ValueError(f"Endpoint does not support PUT method, '{self.url}'")
+        return self._send("PUT", data=content, headers={"Content-Type": content_type})
 
     def delete(self) -> "Resource":
         if not self.RequestMethod.DELETE:
             raise ValueError(f"Endpoint does not support DELETE method, '{self.url}'")
-        response = requests.delete(self.url, headers=self._client._headers)
-        self._delete_response = response
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
-        return self
+        return self._send("DELETE")
 
     def select(self, value: str) -> "Resource":
         self._add_query_params("SELECT", value.strip())
@@ -211,23 +285,111 @@ class Resource(ABC):
         self._add_query_params("EXPAND", value.strip())
         return self
 
+    @property
+    def is_removed(self) -> bool:
+        return "@removed" in self._data
+
     def asdict(self) -> dict[str, Any]:
         return self._data
 
     def get_from_raw_relative_url(self, relative_url):
-        return requests.get(f"{self.URL}/{relative_url}", headers=self._client._headers)
+        return self._client._request("GET", f"{self.URL}/{relative_url}")
 
     def _add_query_params(self, key: str, value: str) -> None:
-        if not getattr(self, key, False):
+        if not getattr(self.RequestQueryParam, key, False):
             raise ValueError(f"Query parameter is not supported, '{key}'.")
+        if self._query_params is None:
+            self._query_params = {}
         self._query_params[key.lower()] = value.strip()
+        self._query_string = None
         self._has_changed = True
 
     def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
         pass
 
+    def _send(self, method: str, url: str | None = None, **kwargs) -> "Resource":
+        if self._client.IS_ASYNC:
+            return self._asend(method, url, **kwargs)  # type: ignore
+        response = self._client._request(
+            method, url or self.url, resource=self, **kwargs
+        )
+        self._on_send(method, response)
+        return self
+
+    async def _aget(self) -> "Resource":
+        if self._has_changed:
+            entry = self._get_cache_entry()
+            if self._has_changed:
+                response = await self._client._request(
+                    "GET",
+                    self.url_with_query_params,
+                    headers=self._get_request_headers(entry),
+                    resource=self,
+                    decode=True,
+                )
+                self._on_get(response, entry)
+        return self
+
+    async def _asend(self, method: str, url: str | None = None, **kwargs) -> "Resource":
+        response = await self._client._request(
+            method, url or self.url, resource=self, **kwargs
+        )
+        self._on_send(method, response)
+        return self
+
+    def _get_cache(self) -> "ResponseCache | None":
+        if not self.CACHEABLE:
+            return None
+        return self._client.cache
+
+    def _get_cache_entry(self) -> "CacheEntry | None":
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        entry = cache.get(self.url_with_query_params, self._client._cache_scope)
+        if entry is not None and entry.is_fresh:
+            self._data = entry.data
+            self._has_changed = False
+        return entry
+
+    def _get_request_headers(self, entry: "CacheEntry | None") -> dict[str, str] | None:
+        if entry is None or entry.etag is None:
+            return self._request_headers
+        return {**(self._request_headers or {}), "If-None-Match": entry.etag}
+
+    def _on_get(self, response: Any, entry: "CacheEntry | None" = None) -> None:
+        cache = self._get_cache()
+        if entry is not None and response.status_code == 304:
+            cache.revalidated(  # type: ignore
+                self.url_with_query_params, entry, self._client._cache_scope
+            )
+            self._data = entry.data
+            self._has_changed = False
+            return
+
+        raise_for_status(response)
+        self._data = self._client._decode(response)
+        self._has_changed = False
+        if cache is not None:
+            etag = get_etag(response, self._data)
+            cache.store(
+                self.url_with_query_params, self._data, etag, self._client._cache_scope
+            )
+
+    def _on_send(self, method: str, response: Any) -> None:
+        self._response = response
+        cache = self._client.cache
+        if cache is not None and method in ("PATCH", "PUT", "DELETE"):
+            cache.invalidate(self.url, self._client._cache_scope)
+        raise_for_status(response)
+        self._has_changed = True
+
 
 class SingleValuedResource(Resource):
+    __slots__ = ()
+
+    CACHEABLE = True
+
     class RequestMethod(Resource.RequestMethod):
         GET = True
 
@@ -236,6 +398,10 @@ class SingleValuedResource(Resource):
 
 
 class MultiValuedResource(SingleValuedResource):
+    __slots__ = ("_mdata", "_current_page")
+
+    CACHEABLE = False
+
     class RequestQueryParam(SingleValuedResource.RequestQueryParam):
         FILTER = True
         ORDERBY = True
@@ -253,20 +419,17 @@ class MultiValuedResource(SingleValuedResource):
         super().__init__(*args, **kwargs)
         self._mdata: dict[int, dict[str, Any]] = {0: self._data}
         self._current_page: int = 0
-        self._objects: dict[int, tuple[Any, ...]] = {}
+
+    def __aiter__(self) -> AsyncIterator[R]:
+        return self.aiter_all_items()
 
     @property
     def current_page(self) -> int:
         return self._current_page + 1
 
     @property
-    def current_items(self) -> tuple[R, ...]:
-        current_page = self._current_page
-
-        try:
-            return self._objects[current_page]
-        except KeyError:
-            return tuple(self._iter_objects(current_page))
+    def current_items(self) -> "Page":
+        return self._get_page_items(self._current_page)
 
     def asdict(self) -> dict[str, Any]:
         return self._mdata[self.current_page]["value"]
@@ -278,39 +441,66 @@ class MultiValuedResource(SingleValuedResource):
         return bool(self._mdata.get(self._current_page, {}).get("@odata.nextLink"))
 
     def get_next_items(self) -> "MultiValuedResource":
-        current_page = self._current_page
-        next_page = current_page + 1
-        try:
-            data = self._mdata[next_page]
-        except KeyError:
-            next_link = self._mdata[current_page].get("@odata.nextLink")
-            if next_link:
-                response = requests.get(next_link, headers=self._client._headers)
-
-                try:
-                    response.raise_for_status()
-                except requests.HTTPError:
-                    raise
-
-                data = response.json()
-                self._mdata[next_page] = data
-            else:
-                raise ValueError("No more items")
+        if self._client.IS_ASYNC:
+            return self._aget_next_items()  # type: ignore
+        next_page = self._current_page + 1
+        if next_page not in self._mdata:
+            response = self._client._request(
+                "GET",
+                self._get_next_link(),
+                headers=self._request_headers,
+                resource=self,
+                decode=True,
+            )
+            self._on_next_items(next_page, response)
 
         self._current_page = next_page
         return self
 
     def iter_fetched_items(self) -> Iterator["Resource"]:
-        objects = self._objects
-
-        for page in self._mdata:
-            try:
-                _iter_objects = iter(objects[page])
-            except KeyError:
-                yield from self._iter_objects(page)
-            else:
-                for obj in _iter_objects:
-                    yield obj
+        for page in list(self._mdata):
+            yield from self._iter_objects(page)
+
+    # Decodes one field of every fetched item, or of one page, without
+    # wrapping the items, e.g. field_values("last_modified_date_time").
+    def field_values(self, name: str, page: int | None = None) -> list[Any]:
+        field = getattr(self._get_item_class(), name, None)
+        if not isinstance(field, Field):
+            raise ValueError(f"Field does not exist, '{name}'")
+        pages = list(self._mdata) if page is None else [page - 1]
+        return field.get_values(
+            item for page in pages for item in self._get_values(page)
+        )
+
+    def to_columns(
+        self,
+        fields: Iterable[str] | None = None,
+        use_numpy: bool | None = None,
+        dictionary: bool = False,
+    ) -> dict[str, Any]:
+        return export_columns(self, fields, use_numpy, dictionary)
+
+    # Pages decoded by msgspec straight into Structs of the item's Fields,
+    # nothing is kept on this resource.
+    def iter_structs(self) -> Iterator[Any]:
+        decoder = self._client.json_decoder
+        if not isinstance(decoder, MsgspecDecoder):
+            raise ValueError("JSON decoder is required for structs, 'msgspec'")
+
+        page_decoder = decoder.get_page_decoder(self._get_item_class())
+        next_link = self.url_with_query_params
+        while next_link:
+            response = self._client._request(
+                "GET",
+                next_link,
+                headers=self._request_headers,
+                resource=self,
+                decode=True,
+            )
+            raise_for_status(response)
+            page = self._client._decode(response, page_decoder.decode)
+            yield from page.value
+            next_link = page.next_link
 
     def iter_all_items(self) -> Iterator["Resource"]:
         while self.has_next_items():
@@ -318,23 +508,42 @@ class MultiValuedResource(SingleValuedResource):
         else:
             yield from self.iter_fetched_items()
 
-    def get(self) -> "MultiValuedResource":
-        if not self.RequestMethod.GET:
-            raise ValueError(f"Endpoint does not support GET method, '{self.url}'")
-        if self._has_changed:
-            response = requests.get(
-                self.url_with_query_params, headers=self._client._headers
-            )
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError:
-                print(response.json())
-                raise
-            self._mdata.clear()
-            self._objects.clear()
-            self._has_changed = False
-            self._mdata[0] = response.json()
-        return self
+    def iter_pages(
+        self, keep_pages: bool = True, prefetch: int = 0
+    ) -> Iterator[Iterator[R]]:
+        if prefetch:
+            yield from self._iter_prefetched_pages(keep_pages, prefetch)
+            return
+
+        page = 0
+        while True:
+            yield self._iter_page(page)
+            page += 1
+            if page not in self._mdata:
+                self._current_page = page - 1
+                if not self.has_next_items():
+                    return
+                self.get_next_items()
+            if not keep_pages:
+                self._drop_page(page - 1)
+
+    def stream_items(self, keep_pages: bool = False, prefetch: int = 0) -> Iterator[R]:
+        for items in self.iter_pages(keep_pages, prefetch):
+            yield from items
+
+    # Lists the collection as one partition per $filter, concurrently, e.g.
+    # groups.sharded(prefix_filters("displayName", "abc")). Iterate it in a
+    # for loop, or async for with the async client.
+    def sharded(
+        self,
+        filters: Iterable[str],
+        max_workers: int = 8,
+        key: str | None = "id",
+        queue_size: int = 100,
+    ) -> ShardedListing:
+        return ShardedListing(
+            self, filters, max_workers=max_workers, key=key, queue_size=queue_size
+        )
 
     def filter(self, value: str) -> "MultiValuedResource":
         self._add_query_params("FILTER", value.strip())
@@ -342,20 +551,22 @@ class MultiValuedResource(SingleValuedResource):
 
     def filter__and(self, value: str) -> "MultiValuedResource":
         try:
-            self._query_params["filter"] += f" and {value}"
-        except KeyError:
+            self._query_params["filter"] += f" and {value}"  # type: ignore
+        except (KeyError, TypeError):
             raise ValueError(
                 f"Paremater does not exist. Can't append filter value, '{value}'"
             )
+        self._query_string = None
         return self
 
     def filter__or(self, value: str) -> "MultiValuedResource":
         try:
-            self._query_params["filter"] += f" or {value}"
-        except KeyError:
+            self._query_params["filter"] += f" or {value}"  # type: ignore
+        except (KeyError, TypeError):
             raise ValueError(
                 f"Paremater does not exist. Can't append filter value, '{value}'"
             )
+        self._query_string = None
         return self
 
     def orderby(self, value: str) -> "MultiValuedResource":
@@ -368,25 +579,170 @@ class MultiValuedResource(SingleValuedResource):
 
     def count(self) -> "MultiValuedResource":
         self._add_query_params("COUNT", "true")
-        self._client._headers["ConsistencyLevel"] = "eventual"
+        self._request_headers = {"ConsistencyLevel": "eventual"}
         return self
 
-    def _iter_objects(self, page: int) -> Iterator[R]:
-        klass = self.MODELS[self.ITEM_CLASS]
-        client = self._client
+    async def aiter_pages(self, keep_pages: bool = True) -> AsyncIterator[Iterator[R]]:
+        page = 0
+        while True:
+            yield self._iter_page(page)
+            page += 1
+            if page not in self._mdata:
+                self._current_page = page - 1
+                if not self.has_next_items():
+                    return
+                await self.get_next_items()
+            if not keep_pages:
+                self._drop_page(page - 1)
+
+    async def aiter_all_items(self, keep_pages: bool = True) -> AsyncIterator[R]:
+        async for items in self.aiter_pages(keep_pages):
+            for item in items:
+                yield item
+
+    @classmethod
+    def _get_item_class(cls) -> type[R]:
+        return get_model(cls.ITEM_CLASS)  # type: ignore
+
+    def _get_next_link(self) -> str:
+        next_link = self._mdata[self._current_page].get("@odata.nextLink")
+        if not next_link:
+            raise ValueError("No more items")
+        return next_link
+
+    async def _aget_next_items(self) -> "MultiValuedResource":
+        next_page = self._current_page + 1
+        if next_page not in self._mdata:
+            response = await self._client._request(
+                "GET",
+                self._get_next_link(),
+                headers=self._request_headers,
+                resource=self,
+                decode=True,
+            )
+            self._on_next_items(next_page, response)
 
-        page_objects = []
-        page_objects_apppend = page_objects.append
+        self._current_page = next_page
+        return self
 
-        for item in self._mdata[page]["value"]:
-            # obj = klass(client, data=item, parent=self)
-            obj = self._get_obj(klass, client, item)
-            page_objects_apppend(obj)
-            yield obj
+    def _on_get(self, response: Any, entry: "CacheEntry | None" = None) -> None:
+        raise_for_status(response)
+        self._mdata.clear()
+        self._current_page = 0
+        self._has_changed = False
+        self._mdata[0] = self._client._decode(response)
+
+    def _on_next_items(self, page: int, response: Any) -> None:
+        raise_for_status(response)
+        self._mdata[page] = self._client._decode(response)
+
+    def _get_page_items(self, page: int) -> "Page":
+        return Page(self, self._get_values(page))
+
+    # The values are looked up now, so the page can be dropped before the
+    # caller gets to the items.
+    def _iter_page(self, page: int) -> Iterator[R]:
+        return iter(self._get_page_items(page))
+
+    def _iter_prefetched_pages(
+        self, keep_pages: bool, prefetch: int
+    ) -> Iterator[Iterator[R]]:
+        page = 0
+        while page + 1 in self._mdata:
+            self._current_page = page
+            yield self._iter_page(page)
+            if not keep_pages:
+                self._drop_page(page)
+            page += 1
+
+        self._current_page = page
+        next_link = self._mdata[page].get("@odata.nextLink")
+        if not next_link:
+            yield self._iter_page(page)
+            return
+
+        # Start fetching the next page before the caller processes this one.
+        prefetcher = PagePrefetcher(
+            self._client, next_link, page + 1, self._request_headers, prefetch, self
+        )
+        try:
+            yield self._iter_page(page)
+            for page, data in prefetcher:
+                self._mdata[page] = data
+                self._current_page = page
+                if not keep_pages:
+                    self._drop_page(page - 1)
+                yield self._iter_page(page)
+        finally:
+            prefetcher.close()
+
+    def _drop_page(self, page: int) -> None:
+        data = self._mdata.pop(page, None)
+        if data is self._data:
+            self._data = {}
+
+    def _iter_values(self, values: Iterable[dict[str, Any]]) -> Iterator[R]:
+        klass = self._get_item_class()
+        client = self._client
+        if client.hooks:
+            yield from self._iter_timed_values(klass, client, values)
+            return
+        for item in values:
+            yield self._get_obj(klass, client, item)
+
+    def _iter_timed_values(
+        self, klass: type[R], client: "MgraphClient", values: Iterable[dict[str, Any]]
+    ) -> Iterator[R]:
+        event = WrapEvent(type(self).__name__)
+        try:
+            for item in values:
+                start = perf_counter()
+                obj = self._get_obj(klass, client, item)
+                event.wrap += perf_counter() - start
+                event.items += 1
+                yield obj
+        finally:
+            if event.items:
+                client._emit(event)
 
-        self._objects[page] = tuple(page_objects)
+    def _iter_objects(self, page: int) -> Iterator[R]:
+        return self._iter_values(self._get_values(page))
+
+    # A listing that was never fetched has an empty first page.
+    def _get_values(self, page: int) -> list[dict[str, Any]]:
+        try:
+            return self._mdata[page]["value"]
+        except KeyError:
+            raise ValueError(f"Page has not been fetched, '{self.url}'") from None
 
     def _get_obj(
         self, klass: type[R], client: "MgraphClient", data: dict[str, Any]
     ) -> R:
         return klass(client, data=data, parent=self)
+
+
+# The items of one page. Only the raw values are held; an item is wrapped in
+# its resource class when it is accessed and the wrapper is not kept.
+class Page(Sequence):
+
+    __slots__ = ("_resource", "_values")
+
+    def __init__(
+        self, resource: MultiValuedResource, values: list[dict[str, Any]]
+    ) -> None:
+        self._resource = resource
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._resource._iter_values(self._values[index]))
+        resource = self._resource
+        return resource._get_obj(
+            resource._get_item_class(), resource._client, self._values[index]
+        )
+
+    def __iter__(self) -> Iterator[R]:
+        return self._resource._iter_values(self._values)
@@ -0,0 +1,103 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Any
+
+# https://learn.microsoft.com/en-us/graph/throttling
+# https://learn.microsoft.com/en-us/graph/best-practices-concept#handling-expected-errors
+
+
+class RetryPolicy:
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        max_retry_after: float | None = None,
+        retry_budget: int | None = None,
+        retry_statuses: frozenset[int] | None = None,
+        retry_methods: frozenset[str] | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_budget = retry_budget
+        self.retry_statuses = retry_statuses or self.RETRY_STATUSES
+        self.retry_methods = retry_methods or self.IDEMPOTENT_METHODS
+
+        self.retries = 0
+        self.sleep_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        return {"retries": self.retries, "sleep_time": self.sleep_time}
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self.retry_budget is not None and self.retries >= self.retry_budget
+
+    def is_retriable(
+        self,
+        method: str,
+        status: int | None,
+        attempt: int,
+        idempotent: bool | None = None,
+    ) -> bool:
+        if attempt >= self.max_retries or self.is_exhausted:
+            return False
+        if idempotent is None:
+            idempotent = method.upper() in self.retry_methods
+        if not idempotent:
+            return False
+        # A missing status is a connection error or timeout.
+        return status is None or status in self.retry_statuses
+
+    def get_delay(self, headers: Any, attempt: int) -> float:
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            # Retrying before Retry-After is only throttled again, max_backoff
+            # caps the computed backoff alone.
+            if self.max_retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+            return retry_after
+        return self.backoff(attempt)
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter, so clients throttled together do not retry together.
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def record(self, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.sleep_time += delay
+
+    def sleep(self, delay: float) -> None:
+        self.record(delay)
+        time.sleep(delay)
+
+
+def parse_retry_after(headers: Any) -> float | None:
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
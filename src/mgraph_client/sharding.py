@@ -0,0 +1,187 @@
+import copy
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator
+
+from .prefetch import WorkerQueue
+
+if TYPE_CHECKING:
+    from .resources import MultiValuedResource
+
+
+# Lists one collection as several $filter partitions, each paginated by its
+# own worker, and merges the pages into one stream. Items are deduplicated on
+# `key`, since an item can move between partitions while they are listed,
+# e.g. a device syncing during the crawl. An item that moves the other way
+# can be missed, and the stream follows no $orderby across partitions.
+class ShardedListing:
+
+    def __init__(
+        self,
+        resource: "MultiValuedResource",
+        filters: Iterable[str],
+        max_workers: int = 8,
+        key: str | None = "id",
+        queue_size: int = 100,
+    ) -> None:
+        if not resource.RequestQueryParam.FILTER:
+            raise ValueError(
+                f"Query parameter is not supported, 'FILTER'. '{resource.url}'"
+            )
+        filters = list(filters)
+        if not filters:
+            raise ValueError("At least one filter is required to shard a listing.")
+
+        self.resource = resource
+        self.filters = filters
+        self.max_workers = max_workers
+        self.key = key
+        self.queue_size = queue_size
+
+    def __iter__(self) -> Iterator[Any]:
+        results = WorkerQueue(maxsize=self.queue_size)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        seen: set[Any] = set()
+
+        try:
+            for shard in self.get_shards():
+                executor.submit(results.worker(self._list, shard, results))
+            for shard, values in results:
+                yield from shard._iter_values(self._unseen(values, seen))
+        finally:
+            results.stop()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        # Only the async client needs asyncio, keep it out of the import.
+        import asyncio
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        seen: set[Any] = set()
+
+        # An error ends the listing like "done" does. Cancellation is not an
+        # Exception, a cancelled task puts nothing, the consumer that cancelled
+        # it no longer reads the queue.
+        async def run(shard: "MultiValuedResource") -> None:
+            try:
+                async with semaphore:
+                    await shard.get()
+                    while True:
+                        page = shard._mdata[shard._current_page]
+                        await results.put(("page", shard, page.get("value", [])))
+                        if not shard.has_next_items():
+                            break
+                        await shard.get_next_items()
+                        shard._drop_page(shard._current_page - 1)
+            except Exception as e:
+                await results.put(("error", shard, e))
+            else:
+                await results.put(("done", shard, None))
+
+        tasks = [asyncio.create_task(run(shard)) for shard in self.get_shards()]
+        try:
+            pending = len(tasks)
+            while pending:
+                kind, shard, value = await results.get()
+                if kind == "done":
+                    pending -= 1
+                elif kind == "error":
+                    raise value
+                else:
+                    for item in shard._iter_values(self._unseen(value, seen)):
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # A copy of the resource per filter, and'ed with any filter already set.
+    def get_shards(self) -> list["MultiValuedResource"]:
+        resource = self.resource
+        params = resource._query_params or {}
+        shards = []
+        for value in self.filters:
+            shard = copy.copy(resource)
+            shard._query_params = dict(params)
+            if "filter" in params:
+                value = f"({params['filter']}) and ({value})"
+            shard._query_params["filter"] = value
+            shard._query_string = None
+            shard._data = {}
+            shard._mdata = {0: shard._data}
+            shard._current_page = 0
+            shard._has_changed = True
+            shards.append(shard)
+        return shards
+
+    def _list(self, shard: "MultiValuedResource", results: WorkerQueue) -> None:
+        shard.get()
+        while True:
+            page = shard._mdata[shard._current_page]
+            if not results.put((shard, page.get("value", []))):
+                return
+            if not shard.has_next_items():
+                break
+            shard.get_next_items()
+            shard._drop_page(shard._current_page - 1)
+
+    def _unseen(
+        self, values: list[dict[str, Any]], seen: set[Any]
+    ) -> Iterator[dict[str, Any]]:
+        key = self.key
+        for data in values:
+            if key is not None:
+                value = data.get(key)
+                if value is not None:
+                    if value in seen:
+                        continue
+                    seen.add(value)
+            yield data
+
+
+# Partitions of a datetime field, e.g. lastSyncDateTime. The first and last
+# windows are open ended so nothing outside [start, end) is lost; items with
+# no value are only listed with include_null.
+def datetime_windows(
+    field: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    shards: int,
+    include_null: bool = False,
+) -> list[str]:
+    if shards < 1:
+        raise ValueError(f"Number of shards must be at least 1, '{shards}'")
+    if end <= start:
+        raise ValueError(f"End must be after start, '{start}' to '{end}'")
+
+    step = (end - start) / shards
+    bounds = [_format_datetime(start + step * i) for i in range(1, shards)]
+    if not bounds:
+        filters = [f"{field} ne null"]
+    else:
+        filters = [f"{field} lt {bounds[0]}"]
+        filters += [
+            f"{field} ge {lower} and {field} lt {upper}"
+            for lower, upper in zip(bounds, bounds[1:])
+        ]
+        filters.append(f"{field} ge {bounds[-1]}")
+    if include_null:
+        filters.append(f"{field} eq null")
+    return filters
+
+
+# Partitions on the first characters of a string field that supports
+# startswith, e.g. displayName.
+def prefix_filters(field: str, prefixes: Iterable[str]) -> list[str]:
+    return [f"startswith({field},'{_quote(prefix)}')" for prefix in prefixes]
+
+
+def _format_datetime(value: datetime.datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _quote(value: str) -> str:
+    return value.replace("'", "''")
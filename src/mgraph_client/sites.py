@@ -8,12 +8,16 @@ from .resources import MultiValuedResource, Resource, SingleValuedResource
 
 
 class Sites(MultiValuedResource):
+    __slots__ = ()
+
     class RequestQueryParam(MultiValuedResource.RequestQueryParam):
         SEARCH = True
         FILTER = False
         ORDERBY = False
 
     class Root(SingleValuedResource):
+        __slots__ = ()
+
         @property
         def relative_url(self) -> str:
             return "/root"
@@ -37,7 +41,7 @@ class Sites(MultiValuedResource):
         return "/sites"
 
     def get(self) -> MultiValuedResource:
-        if self._query_params.get("search") is None:
+        if (self._query_params or {}).get("search") is None:
             raise ValueError(
                 f"GET method is unsupported without search in query params"
             )
@@ -79,6 +83,8 @@ class Sites(MultiValuedResource):
 
 
 class Site(SingleValuedResource):
+    __slots__ = ()
+
     id = CharField()
     description = CharField()
     name = CharField()
@@ -89,7 +95,11 @@ class Site(SingleValuedResource):
 
 
 class SiteById(Site):
+    __slots__ = ("_site_id",)
+
     class DefaultDrive(DefaultDrive):
+        __slots__ = ()
+
         @property
         def relative_url(self) -> str:
             return "/drive"
@@ -158,7 +168,11 @@ class SiteById(Site):
 
 
 class SiteByRelativePath(Site):
+    __slots__ = ("_relative_path",)
+
     class DefaultDrive(DefaultDrive):
+        __slots__ = ()
+
         @property
         def relative_url(self) -> str:
             return ":/drive"
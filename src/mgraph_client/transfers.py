@@ -0,0 +1,412 @@
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator
+
+import requests
+
+from .resources import raise_for_status
+
+if TYPE_CHECKING:
+    from mgraph_client import MgraphClient
+
+Source = bytes | str | os.PathLike | BinaryIO | Iterable[bytes]
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0
+FRAGMENT_UNIT = 320 * 1024
+MAX_FRAGMENT_SIZE = 60 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_PART_SIZE = 64 * 1024 * 1024
+
+
+class FileReader:
+
+    def __init__(self, source: str | os.PathLike | BinaryIO) -> None:
+        if isinstance(source, (str, os.PathLike)):
+            self._file: IO[bytes] = open(source, "rb")
+            self._owned = True
+        else:
+            self._file = source
+            self._owned = False
+        self._offset = self._file.tell()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            position = self._file.tell()
+            size = self._file.seek(0, io.SEEK_END) - self._offset
+            self._file.seek(position)
+        return size
+
+    def read(self, start: int, length: int) -> bytes:
+        with self._lock:
+            self._file.seek(self._offset + start)
+            return self._file.read(length)
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+
+# Only moves forward. The last chunk read stays buffered, so a fragment that
+# failed can be sent again, but nothing older can.
+class IteratorReader:
+
+    def __init__(self, source: Iterable[bytes]) -> None:
+        self._chunks = iter(source)
+        self._buffer = bytearray()
+        self._buffer_start = 0
+
+    def read(self, start: int, length: int) -> bytes:
+        if start < self._buffer_start:
+            raise ValueError(f"Cannot rewind an iterator source to byte {start}")
+
+        del self._buffer[: start - self._buffer_start]
+        self._buffer_start = start
+        while len(self._buffer) < length:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        return bytes(self._buffer[:length])
+
+    def close(self) -> None:
+        pass
+
+
+Reader = FileReader | IteratorReader
+
+
+def get_reader(source: "Source | Reader") -> Reader:
+    if isinstance(source, (FileReader, IteratorReader)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return FileReader(io.BytesIO(source))
+    if isinstance(source, (str, os.PathLike)):
+        return FileReader(source)
+    if hasattr(source, "read") and source.seekable():  # type: ignore
+        return FileReader(source)  # type: ignore
+    if hasattr(source, "read"):
+        return IteratorReader(iter(lambda: source.read(FRAGMENT_UNIT), b""))  # type: ignore
+    return IteratorReader(source)  # type: ignore
+
+
+def get_size(reader: Reader, size: int | None) -> int:
+    if size is not None:
+        return size
+    if not isinstance(reader, FileReader):
+        raise ValueError("Argument is required for iterators, 'size'")
+    return reader.size
+
+
+def parse_ranges(ranges: list[str], size: int) -> list[tuple[int, int]]:
+    parsed = []
+    for value in ranges:
+        start, _, end = value.partition("-")
+        parsed.append((int(start), int(end) if end else size - 1))
+    return parsed
+
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0#upload-bytes-to-the-upload-session
+class UploadSession:
+
+    def __init__(
+        self,
+        client: "MgraphClient",
+        upload_url: str,
+        fragment_size: int = 32 * FRAGMENT_UNIT,
+        max_workers: int = 1,
+        max_resumes: int = 3,
+    ) -> None:
+        if fragment_size % FRAGMENT_UNIT or not 0 < fragment_size <= MAX_FRAGMENT_SIZE:
+            raise ValueError(
+                f"Fragment size must be a multiple of {FRAGMENT_UNIT} bytes and "
+                f"at most {MAX_FRAGMENT_SIZE}, '{fragment_size}'"
+            )
+
+        self._client = client
+        self.upload_url = upload_url
+        self.fragment_size = fragment_size
+        self.max_workers = max_workers
+        self.max_resumes = max_resumes
+
+    def status(self) -> dict[str, Any]:
+        response = self._client._request("GET", self.upload_url, auth=False)
+        raise_for_status(response)
+        return response.json()
+
+    def cancel(self) -> None:
+        response = self._client._request("DELETE", self.upload_url, auth=False)
+        raise_for_status(response)
+
+    def upload(
+        self, source: "Source | Reader", size: int | None = None
+    ) -> dict[str, Any]:
+        reader = get_reader(source)
+        try:
+            return self._upload(reader, get_size(reader, size))
+        finally:
+            if reader is not source:
+                reader.close()
+
+    def _upload(self, reader: Reader, size: int) -> dict[str, Any]:
+        ranges = [(0, size - 1)]
+        resumes = 0
+        while True:
+            fragments = list(self._iter_fragments(ranges))
+            try:
+                if self.max_workers > 1 and isinstance(reader, FileReader):
+                    result = self._upload_concurrently(reader, fragments, size)
+                else:
+                    result = self._upload_sequentially(reader, fragments, size)
+            except (requests.HTTPError, *self._client._transport.CONNECTION_ERRORS):
+                resumes += 1
+                if resumes > self.max_resumes:
+                    raise
+                result = None
+
+            if result is not None:
+                return result
+
+            next_ranges = self.status().get("nextExpectedRanges") or []
+            if not next_ranges:
+                raise ValueError("Upload session has no missing ranges but no item.")
+            ranges = parse_ranges(next_ranges, size)
+
+    def _iter_fragments(
+        self, ranges: list[tuple[int, int]]
+    ) -> Iterator[tuple[int, int]]:
+        fragment_size = self.fragment_size
+        for start, end in ranges:
+            for offset in range(start, end + 1, fragment_size):
+                yield offset, min(offset + fragment_size, end + 1) - 1
+
+    def _upload_sequentially(
+        self,
+        reader: Reader,
+        fragments: list[tuple[int, int]],
+        size: int,
+    ) -> dict[str, Any] | None:
+        result = None
+        for start, end in fragments:
+            result = self._put(reader.read(start, end - start + 1), start, end, size)
+        return result
+
+    def _upload_concurrently(
+        self, reader: FileReader, fragments: list[tuple[int, int]], size: int
+    ) -> dict[str, Any] | None:
+        # Graph only completes the item once every range has arrived, whichever
+        # fragment that happens to be.
+        def put(fragment: tuple[int, int]) -> dict[str, Any] | None:
+            start, end = fragment
+            return self._put(reader.read(start, end - start + 1), start, end, size)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(put, fragments))
+        return next((result for result in results if result is not None), None)
+
+    def _put(
+        self, data: bytes, start: int, end: int, size: int
+    ) -> dict[str, Any] | None:
+        if len(data) != end - start + 1:
+            raise ValueError(f"Source ended before byte {end} of {size}")
+
+        response = self._client._request(
+            "PUT",
+            self.upload_url,
+            headers={
+                "Content-Length": str(len(data)),
+                "Content-Range": f"bytes {start}-{end}/{size}",
+            },
+            data=data,
+            auth=False,
+        )
+        # Range already received, e.g. a fragment resent after a lost response.
+        if response.status_code == 416:
+            return None
+        raise_for_status(response)
+        if response.status_code in (200, 201):
+            return response.json()
+        return None
+
+
+# A resumed range was answered with the whole item, its etag no longer matches.
+class ContentChangedError(ValueError):
+    pass
+
+
+# Writes a pre-authenticated @microsoft.graph.downloadUrl to a path or a
+# writable buffer, one chunk at a time. Large files written to a path can be
+# split into Range requests fetched by a thread pool, each part written at its
+# own offset of a preallocated file.
+#
+# A download to a path keeps a "<path>.parts" file, with the item's etag and
+# size and the finished parts, until it completes. Only a download with a
+# matching .parts file is resumed, any other file at the path is replaced.
+# Resumed ranges are sent with If-Range, a 200 reply means the item changed
+# and raises ContentChangedError. The url and size belong to the old version,
+# so the caller has to read the item again before it starts over.
+class Download:
+
+    STREAM_ERRORS = (requests.exceptions.ChunkedEncodingError,)
+
+    def __init__(
+        self,
+        client: "MgraphClient",
+        download_url: str,
+        size: int,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = 1,
+        part_size: int = DOWNLOAD_PART_SIZE,
+        max_resumes: int = 3,
+        etag: str | None = None,
+    ) -> None:
+        if chunk_size < 1 or part_size < 1:
+            raise ValueError("Chunk and part size must be positive.")
+
+        self._client = client
+        self.download_url = download_url
+        self.size = size
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self.max_resumes = max_resumes
+        self.etag = etag
+
+    def to(self, target: str | os.PathLike | BinaryIO, resume: bool = True) -> int:
+        if not isinstance(target, (str, os.PathLike)):
+            return self._verify(self._fetch_all(target))
+
+        path = os.fspath(target)
+        try:
+            return self._download(path, resume)
+        except ContentChangedError:
+            # The finished parts are of an older version of the item.
+            os.remove(f"{path}.parts")
+            raise
+
+    def _download(self, path: str, resume: bool) -> int:
+        state = self._load_state(path) if resume else None
+        if (state is not None and "parts" in state) or (
+            self.max_workers > 1 and self.size > self.part_size
+        ):
+            return self._download_parts(path, state)
+
+        offset = 0
+        if state is not None:
+            offset = min(os.path.getsize(path), self.size)
+        self._save_state(path, {})
+        with open(path, "r+b" if offset else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            size = self._fetch_all(f, offset)
+        os.remove(f"{path}.parts")
+        return self._verify(size)
+
+    def _download_parts(self, path: str, state: dict[str, Any] | None) -> int:
+        done: set[int] = set(state.get("parts", ())) if state is not None else set()
+        with open(path, "r+b" if state is not None else "wb") as f:
+            f.truncate(self.size)
+        self._save_state(path, {"parts": sorted(done)})
+
+        lock = threading.Lock()
+
+        def fetch(start: int) -> int:
+            end = min(start + self.part_size, self.size) - 1
+            with open(path, "r+b") as f:
+                f.seek(start)
+                written = self._fetch(f, start, end) - start
+                # A part is only listed once its bytes are on disk.
+                f.flush()
+                os.fsync(f.fileno())
+            with lock:
+                done.add(start)
+                self._save_state(path, {"parts": sorted(done)})
+            return written
+
+        starts = [s for s in range(0, self.size, self.part_size) if s not in done]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            list(executor.map(fetch, starts))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        os.remove(f"{path}.parts")
+        return self._verify(os.path.getsize(path))
+
+    def _fetch_all(self, f: BinaryIO, offset: int = 0) -> int:
+        return self._fetch(f, offset, self.size - 1)
+
+    def _load_state(self, path: str) -> dict[str, Any] | None:
+        try:
+            with open(f"{path}.parts", "r") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if (
+            not isinstance(state, dict)
+            or state.get("etag") != self.etag
+            or state.get("size") != self.size
+            or not os.path.exists(path)
+        ):
+            return None
+        return state
+
+    # Written to a temporary file and renamed, an interrupted write leaves the
+    # previous state.
+    def _save_state(self, path: str, state: dict[str, Any]) -> None:
+        parts_path = f"{path}.parts"
+        with open(f"{parts_path}.tmp", "w") as f:
+            json.dump({"etag": self.etag, "size": self.size, **state}, f)
+        os.replace(f"{parts_path}.tmp", parts_path)
+
+    def _fetch(self, f: BinaryIO, start: int, end: int) -> int:
+        offset = start
+        resumes = 0
+        while offset <= end:
+            headers = None
+            if offset or end < self.size - 1:
+                headers = {"Range": f"bytes={offset}-{end}"}
+                if self.etag is not None:
+                    headers["If-Range"] = self.etag
+            response = None
+            try:
+                response = self._client._request(
+                    "GET", self.download_url, headers=headers, auth=False, stream=True
+                )
+                response.raise_for_status()
+                skip = 0
+                if headers and response.status_code == 200:
+                    if self.etag is not None:
+                        raise ContentChangedError(
+                            f"Item changed during the download, '{self.etag}'"
+                        )
+                    # The server ignored the Range header and sent the whole file.
+                    skip = offset
+                for chunk in response.iter_content(self.chunk_size):
+                    if skip:
+                        chunk, skip = chunk[skip:], max(skip - len(chunk), 0)
+                    chunk = chunk[: end - offset + 1]
+                    f.write(chunk)
+                    offset += len(chunk)
+                    if offset > end:
+                        break
+            except (*self._client._transport.CONNECTION_ERRORS, *self.STREAM_ERRORS):
+                if resumes >= self.max_resumes:
+                    raise
+            else:
+                if offset <= end and resumes >= self.max_resumes:
+                    raise ValueError(f"Download ended at byte {offset} of {self.size}")
+            finally:
+                if response is not None:
+                    response.close()
+            resumes += 1
+        return offset
+
+    def _verify(self, size: int) -> int:
+        if size != self.size:
+            raise ValueError(f"Downloaded {size} bytes, expected {self.size}")
+        return size
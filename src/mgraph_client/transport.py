@@ -0,0 +1,342 @@
+import datetime
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+Handler = Callable[
+    [str, str, dict[str, str], bytes | None],
+    tuple[int, dict[str, str], Any],
+]
+
+
+class Transport(ABC):
+
+    CONNECTION_ERRORS: tuple[type[Exception], ...] = (
+        requests.ConnectionError,
+        requests.Timeout,
+    )
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    # Seconds this thread spent opening connections since the last call.
+    def pop_connect_time(self) -> float:
+        return 0.0
+
+
+class HttpTransport(Transport):
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_per_host: int = 10,
+        pool_block: bool = False,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+    ) -> None:
+        adapter = _TimedHTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=max_per_host,
+            pool_block=pool_block,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        self._session = session
+        self._timeout = (connect_timeout, read_timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        return self._session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            data=data,
+            stream=stream,
+            timeout=self._timeout,
+        )
+
+    def close(self) -> None:
+        self._session.close()
+
+    def pop_connect_time(self) -> float:
+        seconds = getattr(_connect_times, "seconds", 0.0)
+        _connect_times.seconds = 0.0
+        return seconds
+
+
+# Connections record the time spent in connect(), TCP and TLS, per thread.
+_connect_times = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_times.seconds = getattr(_connect_times, "seconds", 0.0) + (
+                time.perf_counter() - start
+            )
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_times.seconds = getattr(_connect_times, "seconds", 0.0) + (
+                time.perf_counter() - start
+            )
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+# In-process stand-in for offline tests and benchmarks. The handler receives
+# (method, url, headers, body) and returns (status, headers, body); a dict or
+# list body is serialized as JSON.
+class LocalTransport(Transport):
+
+    def __init__(self, handler: Handler) -> None:
+        self._handler = handler
+        self.calls = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        if json is not None:
+            body = _dumps(json)
+        elif isinstance(data, str):
+            body = data.encode()
+        else:
+            body = data
+
+        self.calls += 1
+        start = time.perf_counter()
+        status, response_headers, content = self._handler(
+            method, url, dict(headers or {}), body
+        )
+        elapsed = time.perf_counter() - start
+        response = build_response(method, url, status, response_headers, content)
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        response.request.body = body
+        return response
+
+
+class AsyncTransport(ABC):
+
+    CONNECTION_ERRORS: tuple[type[Exception], ...] = ()
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> Any:
+        pass
+
+    async def release(self, response: Any) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def pop_connect_time(self) -> float:
+        return 0.0
+
+
+# Requires the optional httpx dependency, pip install mgraph_client[async]
+class HttpxTransport(AsyncTransport):
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        max_keepalive: int = 20,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        http2: bool = False,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "Package is required for the async client, 'httpx'. "
+                "Install with 'pip install mgraph_client[async]'."
+            )
+
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=max_keepalive
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            http2=http2,
+        )
+        self.CONNECTION_ERRORS = (httpx.TransportError,)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> Any:
+        client = self._client
+        request = client.build_request(
+            method, url, headers=headers, json=json, content=data
+        )
+        return await client.send(request, stream=stream)
+
+    async def release(self, response: Any) -> None:
+        await response.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class AsyncLocalTransport(AsyncTransport):
+
+    CONNECTION_ERRORS = Transport.CONNECTION_ERRORS
+
+    def __init__(self, handler: Handler) -> None:
+        self._transport = LocalTransport(handler)
+
+    @property
+    def calls(self) -> int:
+        return self._transport.calls
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        return self._transport.request(method, url, headers, json, data, stream)
+
+
+# httpx responses of the async client raise httpx.HTTPStatusError, they are
+# raised as requests.HTTPError so both clients fail the same way.
+def raise_for_status(response: Any) -> None:
+    if isinstance(response, requests.Response):
+        response.raise_for_status()
+    elif response.status_code >= 400:
+        raise _http_error(response)
+
+
+def _http_error(response: Any) -> requests.HTTPError:
+    status = response.status_code
+    kind = "Client" if status < 500 else "Server"
+    reason = getattr(response, "reason_phrase", "")
+    return requests.HTTPError(
+        f"{status} {kind} Error: {reason} for url: {response.url}", response=response
+    )
+
+
+def build_response(
+    method: str, url: str, status: int, headers: dict[str, str], content: Any
+) -> requests.Response:
+    headers = CaseInsensitiveDict(headers)
+    if isinstance(content, (dict, list)):
+        content = _dumps(content)
+        headers.setdefault("Content-Type", "application/json")
+    elif isinstance(content, str):
+        content = content.encode()
+    elif content is None:
+        content = b""
+
+    response = requests.Response()
+    response.status_code = status
+    response.headers = headers
+    response.url = url
+    response.encoding = "utf-8"
+    response.reason = _REASONS.get(status, "")
+    response.request = requests.Request(method, url).prepare()
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value).encode()
+
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    202: "Accepted",
+    204: "No Content",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    409: "Conflict",
+    412: "Precondition Failed",
+    416: "Range Not Satisfiable",
+    424: "Failed Dependency",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
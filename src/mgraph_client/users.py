@@ -1,44 +1,75 @@
-from .resources import SingleValueResource, MultiValueResource, ManagedAttr
+from typing import Any
 
+from .delta import DeltaQuery, DeltaStore
+from .fields import BooleanField, CharField
+from .resources import MultiValuedResource, SingleValuedResource
+
+
+# https://learn.microsoft.com/en-us/graph/api/user-list?view=graph-rest-1.0
+class Users(MultiValuedResource):
+    __slots__ = ()
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        TOP = True
+        SEARCH = True
+        COUNT = True
 
-class Users(MultiValueResource):
     ITEM_CLASS = "User"
 
     @property
-    def relative_endpoint(self):
-        return "users"
+    def relative_url(self) -> str:
+        return "/users"
 
-    def by_id(self, user_id):
+    def by_id(self, user_id: str) -> "User":
         return User(self._client, parent=self, user_id=user_id)
 
+    def delta(
+        self, store: DeltaStore | None = None, key: str | None = None
+    ) -> "UsersDelta":
+        return UsersDelta(self._client, parent=self, store=store, key=key)
+
+
+# https://learn.microsoft.com/en-us/graph/api/user-delta?view=graph-rest-1.0
+class UsersDelta(DeltaQuery, MultiValuedResource):
+    __slots__ = ("_store", "_key")
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        FILTER = False
+        ORDERBY = False
+
+    ITEM_CLASS = "User"
+
 
-class User(SingleValueResource):
+# https://learn.microsoft.com/en-us/graph/api/user-get?view=graph-rest-1.0
+class User(SingleValuedResource):
+    __slots__ = ("_user_id",)
 
-    id = ManagedAttr()
-    display_name = ManagedAttr()
-    user_principal_name = ManagedAttr()
-    mail = ManagedAttr()
-    account_enabled = ManagedAttr()
+    id = CharField(fallback="user_id")
+    display_name = CharField()
+    user_principal_name = CharField()
+    mail = CharField()
+    account_enabled = BooleanField()
 
     @property
-    def relative_endpoint(self):
-        return f"{self._parent.relative_endpoint}/{self._user_id}"
+    def relative_url(self) -> str:
+        return f"/{self._user_id}"
 
     @property
-    def member_of(self):
+    def member_of(self) -> "MemberOf":
         return MemberOf(self._client, parent=self)
 
-    def _set_kwargs(self, user_id=None):
-        _user_id = user_id or self._data.get("id")
-        if _user_id is None:
-            raise ValueError("Parameter is required, 'user_id'")
-        self._user_id = _user_id
+    def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
+        user_id = kwargs.get("user_id") or self.id
+        if user_id is None:
+            raise ValueError("Argument is required, 'user_id'")
+        self._user_id = user_id
 
 
-class MemberOf(MultiValueResource):
+class MemberOf(MultiValuedResource):
+    __slots__ = ()
 
     ITEM_CLASS = "Group"
 
     @property
-    def relative_endpoint(self):
-        return f"{self._parent.relative_endpoint}/memberOf"
+    def relative_url(self) -> str:
+        return "/memberOf"
@@ -32,6 +32,7 @@ def request_method():
         "GET": False,
         "POST": False,
         "PATCH": False,
+        "PUT": False,
         "DELETE": False,
     }
 
@@ -61,3 +62,44 @@ def check_request_attributes(request_method, request_query_param):
         "query_param": check_request_query_param,
     }
     return wrapper
+
+
+class FakeTokenApp:
+    def __init__(self, expires_in: int = 3600):
+        self.expires_in = expires_in
+        self.calls = 0
+
+    def acquire_token_for_client(self, scopes):
+        self.calls += 1
+        return {
+            "access_token": f"token-{self.calls}",
+            "expires_in": self.expires_in,
+            "token_type": "Bearer",
+            "token_source": "identity_provider",
+        }
+
+
+@pytest.fixture
+def make_client():
+    def wrapper(handler, **kwargs):
+        transport = mgraph_client.LocalTransport(handler)
+        obj = mgraph_client.MgraphClient(
+            "test", "test", "str", transport=transport, _test=True, **kwargs
+        )
+        obj._app = FakeTokenApp()
+        return obj
+
+    return wrapper
+
+
+@pytest.fixture
+def make_async_client():
+    def wrapper(handler, **kwargs):
+        transport = mgraph_client.AsyncLocalTransport(handler)
+        obj = mgraph_client.AsyncMgraphClient(
+            "test", "test", "str", transport=transport, _test=True, **kwargs
+        )
+        obj._app = FakeTokenApp()
+        return obj
+
+    return wrapper
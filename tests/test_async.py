@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from mgraph_client import AsyncMgraphClient, HttpxTransport
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+
+
+def make_pages(url, count):
+    pages = {}
+    for i in range(count):
+        key = f"{url}/groups" if i == 0 else f"{url}/groups?page={i}"
+        page = {"value": [{"id": f"{i}-{j}"} for j in range(2)]}
+        if i + 1 < count:
+            page["@odata.nextLink"] = f"{url}/groups?page={i + 1}"
+        pages[key] = page
+    return pages
+
+
+def test_async_get(make_async_client, url):
+    async def run():
+        client = make_async_client(lambda *args: (200, {}, {"id": "b!1"}))
+        drive = await Drives(client).by_id("b!1").get()
+        return client, drive
+
+    client, drive = asyncio.run(run())
+    assert drive.id == "b!1"
+    assert not drive._has_changed
+    assert client.token_acquisitions == 1
+
+
+def test_async_iteration(make_async_client, url):
+    pages = make_pages(url, 3)
+
+    async def run():
+        client = make_async_client(lambda m, u, h, b: (200, {}, pages[u]))
+        groups = await Groups(client).get()
+        return [group.id async for group in groups]
+
+    assert asyncio.run(run()) == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+
+
+def test_async_concurrent(make_async_client, url):
+    async def run():
+        client = make_async_client(
+            lambda m, u, h, b: (200, {}, {"id": u.rsplit("/", 1)[-1]})
+        )
+        drives = [Drives(client).by_id(str(i)) for i in range(50)]
+        await asyncio.gather(*(drive.get() for drive in drives))
+        return client, drives
+
+    client, drives = asyncio.run(run())
+    assert [drive.id for drive in drives] == [str(i) for i in range(50)]
+    assert client._app.calls == 1
+
+
+def test_async_retry_and_error(make_async_client):
+    responses = [(429, {"Retry-After": "0"}, {}), (404, {}, {"error": {}})]
+
+    async def run():
+        client = make_async_client(lambda *args: responses.pop(0))
+        await Groups(client).by_id("g1").get()
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(run())
+    assert responses == []
+
+
+def test_async_post(make_async_client, url):
+    seen = []
+
+    def handler(method, request_url, headers, body):
+        seen.append((method, request_url, body))
+        return 204, {}, None
+
+    async def run():
+        client = make_async_client(handler)
+        await Groups(client).by_id("g1").members.ref.post({"@odata.id": "x"})
+
+    asyncio.run(run())
+    assert seen == [("POST", f"{url}/groups/g1/members/$ref", b'{"@odata.id": "x"}')]
+
+
+def test_httpx_transport():
+    httpx = pytest.importorskip("httpx")
+
+    async def run():
+        async with AsyncMgraphClient("test", "test", "str", _test=True) as client:
+            assert isinstance(client._transport, HttpxTransport)
+            assert isinstance(client._transport._client, httpx.AsyncClient)
+
+    asyncio.run(run())
+
+
+def test_httpx_status_error_is_requests_http_error():
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        if request.url.path.endswith("/groups") and not request.url.query:
+            link = "https://graph.microsoft.com/v1.0/groups?page=2"
+            return httpx.Response(200, json={"value": [], "@odata.nextLink": link})
+        return httpx.Response(404, json={"error": {"code": "itemNotFound"}})
+
+    async def run(resource):
+        transport = HttpxTransport()
+        await transport.close()
+        transport._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncMgraphClient(
+            "test", "test", "str", transport=transport, access_token="token"
+        ) as client:
+            groups = Groups(client)
+            if resource == "group":
+                await groups.by_id("g1").get()
+            else:
+                await groups.get()
+                await groups.get_next_items()
+
+    for resource in ("group", "next page"):
+        with pytest.raises(requests.HTTPError) as info:
+            asyncio.run(run(resource))
+        assert info.value.response.status_code == 404
+        assert str(info.value).startswith("404 Client Error: Not Found for url:")
+
+
+def test_async_batch(make_async_client):
+    def handler(method, url, headers, body):
+        requests = json.loads(body)["requests"]
+        responses = [
+            {"id": req["id"], "status": 200, "body": {"id": req["url"][8:]}}
+            for req in requests
+        ]
+        return 200, {}, {"responses": responses}
+
+    async def run():
+        client = make_async_client(handler)
+        drives = [Drives(client).by_id(str(i)) for i in range(3)]
+        async with client.batch() as batch:
+            for drive in drives:
+                batch.get(drive)
+        with pytest.raises(TypeError):
+            with client.batch():
+                pass
+        return batch, drives
+
+    batch, drives = asyncio.run(run())
+    assert [drive.id for drive in drives] == ["0", "1", "2"]
+    assert not batch.errors
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+import requests
+
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+
+
+def make_batch_handler(statuses=None):
+    statuses = statuses or {}
+    seen = []
+
+    def handler(method, url, headers, body):
+        payload = json.loads(body)
+        seen.append(payload["requests"])
+        responses = []
+        for req in payload["requests"]:
+            status = (
+                statuses.get(req["url"], [200]).pop(0)
+                if req["url"] in statuses
+                else 200
+            )
+            item = {"id": req["id"], "status": status, "headers": {}}
+            if status == 429:
+                item["headers"]["Retry-After"] = "0"
+            elif status == 200:
+                item["body"] = {"id": req["url"].rsplit("/", 1)[-1]}
+            responses.append(item)
+        return 200, {}, {"responses": list(reversed(responses))}
+
+    return handler, seen
+
+
+def test_batch_chunks(make_client, url):
+    handler, seen = make_batch_handler()
+    client = make_client(handler)
+    drives = [Drives(client).by_id(str(i)) for i in range(45)]
+
+    with client.batch() as batch:
+        for drive in drives:
+            batch.get(drive)
+
+    assert [len(requests) for requests in seen] == [20, 20, 5]
+    assert seen[0][0] == {"id": "1", "method": "GET", "url": "/drives/0"}
+    assert [drive.id for drive in drives] == [str(i) for i in range(45)]
+    assert not any(drive._has_changed for drive in drives)
+    assert not batch.errors
+
+
+def test_batch_depends_on(make_client):
+    handler, seen = make_batch_handler()
+    client = make_client(handler)
+    group = Groups(client).by_id("g1")
+
+    batch = client.batch()
+    fillers = [batch.get(Drives(client).by_id(str(i))) for i in range(19)]
+    first = batch.get(group)
+    batch.post(group.members.ref, {"@odata.id": "x"}, depends_on=[first])
+    batch.execute()
+
+    assert [len(requests) for requests in seen] == [19, 2]
+    assert seen[1][1]["dependsOn"] == [first.id]
+    assert seen[1][1]["headers"] == {"Content-Type": "application/json"}
+    assert all(req.ok for req in fillers)
+
+
+def test_batch_retries_throttled(make_client):
+    handler, seen = make_batch_handler({"/drives/1": [429, 429, 200]})
+    client = make_client(handler)
+    drives = [Drives(client).by_id(str(i)) for i in range(3)]
+
+    with client.batch() as batch:
+        for drive in drives:
+            batch.get(drive)
+
+    assert [[req["url"] for req in requests] for requests in seen] == [
+        ["/drives/0", "/drives/1", "/drives/2"],
+        ["/drives/1"],
+        ["/drives/1"],
+    ]
+    assert drives[1].id == "1"
+
+
+def test_batch_retries_only_idempotent_failures(make_client):
+    handler, seen = make_batch_handler(
+        {
+            "/drives/0": [504, 200],
+            "/groups/g1/members/$ref": [504],
+            "/groups/g2/members/$ref": [429, 204],
+        }
+    )
+    client = make_client(handler)
+
+    batch = client.batch()
+    batch.get(Drives(client).by_id("0"))
+    failed = batch.post(Groups(client).by_id("g1").members.ref, {"@odata.id": "x"})
+    batch.post(Groups(client).by_id("g2").members.ref, {"@odata.id": "x"})
+    batch.execute()
+
+    assert [[req["url"] for req in requests] for requests in seen] == [
+        ["/drives/0", "/groups/g1/members/$ref", "/groups/g2/members/$ref"],
+        ["/drives/0", "/groups/g2/members/$ref"],
+    ]
+    assert batch.errors == [failed]
+
+
+def test_batch_reports_errors(make_client):
+    handler, seen = make_batch_handler({"/drives/1": [404]})
+    client = make_client(handler)
+
+    batch = client.batch()
+    found = batch.get(Drives(client).by_id("0"))
+    missing = batch.get(Drives(client).by_id("1"))
+    batch.execute()
+
+    assert found.ok
+    assert batch.errors == [missing]
+    with pytest.raises(requests.HTTPError):
+        missing.raise_for_status()
+
+
+def test_batch_unsupported_method(make_client):
+    batch = make_client(None).batch()
+    with pytest.raises(ValueError):
+        batch.delete(Drives(batch._client).by_id("1"))
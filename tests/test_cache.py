@@ -0,0 +1,227 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from mgraph_client import (
+    LocalTransport,
+    MgraphClient,
+    ResponseCache,
+    SQLiteResponseCache,
+)
+from mgraph_client.groups import Group, Groups
+
+
+class EditableGroup(Group):
+    class RequestMethod(Group.RequestMethod):
+        PATCH = True
+
+
+@pytest.fixture
+def server():
+    state = {"etag": 'W/"1"', "calls": []}
+
+    def handler(method, url, headers, body):
+        state["calls"].append((method, url, headers.get("If-None-Match")))
+        if method != "GET":
+            return 204, {}, None
+        if headers.get("If-None-Match") == state["etag"]:
+            return 304, {}, None
+        data = {"id": "g1", "displayName": "Group", "@odata.etag": state["etag"]}
+        return 200, {}, data
+
+    return state, handler
+
+
+def test_cache_hit(make_client, server):
+    state, handler = server
+    client = make_client(handler, cache=ResponseCache())
+
+    first = Groups(client).by_id("g1").get()
+    second = Groups(client).by_id("g1").get()
+
+    assert second.display_name == "Group"
+    assert second._data is first._data
+    assert len(state["calls"]) == 1
+    assert client.cache.metrics == {"hits": 1, "misses": 1, "revalidations": 0}
+
+
+def test_cache_revalidate(make_client, server):
+    state, handler = server
+    client = make_client(handler, cache=ResponseCache(ttl=0))
+
+    Groups(client).by_id("g1").get()
+    group = Groups(client).by_id("g1").get()
+    assert group.display_name == "Group"
+    assert state["calls"][-1][2] == 'W/"1"'
+    assert client.cache.metrics == {"hits": 0, "misses": 1, "revalidations": 1}
+
+    state["etag"] = 'W/"2"'
+    Groups(client).by_id("g1").get()
+    assert client.cache.metrics == {"hits": 0, "misses": 2, "revalidations": 1}
+
+
+def test_cache_key_includes_query(make_client, server):
+    state, handler = server
+    client = make_client(handler, cache=ResponseCache())
+
+    Groups(client).by_id("g1").get()
+    Groups(client).by_id("g1").select("id").get()
+    assert len(state["calls"]) == 2
+
+
+def test_cache_lru(make_client, server):
+    state, handler = server
+    client = make_client(handler, cache=ResponseCache(max_entries=2))
+
+    for group_id in ("g1", "g2", "g3", "g1"):
+        Groups(client).by_id(group_id).get()
+    assert len(state["calls"]) == 4
+    assert [key for _, key in client.cache._entries] == [
+        "https://graph.microsoft.com/v1.0/groups/g3",
+        "https://graph.microsoft.com/v1.0/groups/g1",
+    ]
+
+
+def test_cache_invalidate(make_client, server):
+    state, handler = server
+    client = make_client(handler, cache=ResponseCache())
+    groups = Groups(client)
+    group = EditableGroup(client, parent=groups, group_id="g1")
+    group.get()
+    Groups(client).by_id("g1").select("displayName").get()
+
+    group.patch({"displayName": "Renamed"})
+
+    assert not client.cache._entries
+    Groups(client).by_id("g1").get()
+    assert state["calls"][-1] == ("GET", group.url, None)
+
+
+def test_listing_not_cached(make_client):
+    calls = []
+
+    def handler(method, url, headers, body):
+        calls.append(url)
+        return 200, {}, {"value": []}
+
+    client = make_client(handler, cache=ResponseCache())
+    Groups(client).get()
+    Groups(client).get()
+    assert len(calls) == 2
+
+
+def test_sqlite_cache_persists(make_client, server, tmp_path):
+    state, handler = server
+    path = tmp_path / "cache.db"
+
+    client = make_client(handler, cache=SQLiteResponseCache(path))
+    Groups(client).by_id("g1").get()
+    Groups(client).by_id("g1").get()
+    assert len(state["calls"]) == 1
+
+    client = make_client(handler, cache=SQLiteResponseCache(path))
+    group = Groups(client).by_id("g1").get()
+    assert group.display_name == "Group"
+    assert len(state["calls"]) == 1
+    assert client.cache.metrics == {"hits": 1, "misses": 0, "revalidations": 0}
+
+
+def test_sqlite_cache_revalidate_and_invalidate(make_client, server, tmp_path):
+    state, handler = server
+    client = make_client(handler, cache=SQLiteResponseCache(tmp_path / "c.db", ttl=0))
+
+    Groups(client).by_id("g1").get()
+    Groups(client).by_id("g1").select("id").get()
+    Groups(client).by_id("g1").get()
+    assert state["calls"][-1][2] == 'W/"1"'
+    assert client.cache.revalidations == 1
+
+    client.cache.invalidate(Groups(client).by_id("g1").url)
+    assert len(client.cache) == 0
+
+
+def test_sqlite_cache_lru(make_client, server, tmp_path):
+    state, handler = server
+    cache = SQLiteResponseCache(tmp_path / "c.db", max_entries=2)
+    client = make_client(handler, cache=cache)
+
+    for group_id in ("g1", "g2", "g3"):
+        Groups(client).by_id(group_id).get()
+        time.sleep(0.01)
+    assert len(cache) == 2
+    assert cache._get_entry(Groups(client).by_id("g1").url, client._cache_scope) is None
+
+
+def fill_cache(path, i):
+    cache = SQLiteResponseCache(path)
+    for j in range(20):
+        cache.store(f"key-{i}-{j}", {"id": str(j)}, 'W/"1"')
+    return cache.get("key").data
+
+
+def test_sqlite_cache_processes(tmp_path):
+    path = tmp_path / "c.db"
+    cache = SQLiteResponseCache(path)
+    cache.store("key", {"id": "1"}, None)
+
+    with ProcessPoolExecutor(2) as executor:
+        results = list(executor.map(fill_cache, [path] * 4, range(4)))
+
+    assert results == [{"id": "1"}] * 4
+
+    assert len(cache) == 81
+    assert cache.get("key").data == {"id": "1"}
+
+
+def test_sqlite_cache_hits_do_not_write(tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "c.db")
+    cache.store("key", {"id": "1"}, None)
+    conn = cache._connect()
+
+    changes = conn.total_changes
+    assert cache.get("key").data == {"id": "1"}
+    assert conn.total_changes == changes
+
+    cache.touch_interval = 0
+    cache.get("key")
+    assert conn.total_changes == changes + 1
+
+
+def test_sqlite_cache_prunes_past_margin(tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "c.db", max_entries=10, prune_margin=5)
+    for i in range(15):
+        cache.store(f"key-{i}", {"id": str(i)}, 'W/"1"')
+    assert len(cache) == 15
+
+    for i in range(15, 20):
+        cache.store(f"key-{i}", {"id": str(i)}, 'W/"1"')
+    assert len(cache) == 10
+    assert cache.get("key-9") is None
+    assert cache.get("key-10") is not None
+
+
+@pytest.mark.parametrize("sqlite", [False, True])
+def test_cache_is_scoped_to_tenant(server, tmp_path, sqlite):
+    state, handler = server
+    cache = SQLiteResponseCache(tmp_path / "c.db") if sqlite else ResponseCache()
+    clients = [
+        MgraphClient(
+            "app",
+            tenant_id,
+            transport=LocalTransport(handler),
+            cache=cache,
+            access_token="token",
+        )
+        for tenant_id in ("tenant-1", "tenant-2")
+    ]
+
+    for client in clients:
+        Groups(client).by_id("g1").get()
+        Groups(client).by_id("g1").get()
+    assert len(state["calls"]) == 2
+
+    clients[0].cache.invalidate(Groups(clients[0]).by_id("g1").url, "tenant-1/app")
+    assert cache._get_entry(Groups(clients[1]).by_id("g1").url, "tenant-2/app")
+    cache.invalidate(Groups(clients[1]).by_id("g1").url)
+    assert cache._get_entry(Groups(clients[1]).by_id("g1").url, "tenant-2/app") is None
@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from mgraph_client import LocalTransport, MgraphClient
+from mgraph_client.groups import Groups
+from mgraph_client.resources import MODEL_MODULES, get_model
+
+
+def ok(*args):
+    return 200, {}, {"value": []}
+
+
+def test_token_is_reused(make_client):
+    client = make_client(ok)
+    groups = Groups(client)
+    for _ in range(5):
+        groups._has_changed = True
+        groups.get()
+
+    assert client._app.calls == 1
+    assert client.token_acquisitions == 1
+    assert client._headers is client._headers
+    assert client._headers == {"Authorization": "Bearer token-1"}
+
+
+def test_token_refresh_before_expiry(make_client):
+    client = make_client(ok, token_refresh_skew=60)
+    client._app.expires_in = 3600
+    assert client._access_token == "token-1"
+
+    client._token_refresh_at = time.monotonic() - 1
+    assert client._access_token == "token-2"
+    assert client.token_acquisitions == 2
+
+
+def test_token_cache_hit_not_counted(make_client):
+    client = make_client(ok)
+    client._app.acquire_token_for_client = lambda scopes: {
+        "access_token": "cached",
+        "expires_in": 3600,
+        "token_source": "cache",
+    }
+    assert client._access_token == "cached"
+    assert client.token_acquisitions == 0
+
+
+def test_token_refresh_single_flight(make_client):
+    client = make_client(ok)
+    acquire = client._app.acquire_token_for_client
+
+    def slow_acquire(scopes):
+        time.sleep(0.05)
+        return acquire(scopes)
+
+    client._app.acquire_token_for_client = slow_acquire
+    threads = [threading.Thread(target=lambda: client._access_token) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client._app.calls == 1
+
+
+def test_count_headers_are_per_resource(make_client):
+    seen = []
+
+    def handler(method, url, headers, body):
+        seen.append(headers.get("ConsistencyLevel"))
+        return 200, {}, {"value": []}
+
+    client = make_client(handler)
+    Groups(client).count().get()
+    Groups(client).get()
+
+    assert seen == ["eventual", None]
+    assert "ConsistencyLevel" not in client._headers
+
+
+def test_import_is_lazy():
+    script = """
+import sys
+import mgraph_client
+lazy = ["msal", "asyncio", "mgraph_client.groups", "mgraph_client.users"]
+assert not [m for m in lazy if m in sys.modules], sys.modules.keys()
+
+client = mgraph_client.MgraphClient("test", "test", "str", access_token="t")
+assert type(client.groups).__name__ == "Groups"
+assert "mgraph_client.groups" in sys.modules and "msal" not in sys.modules
+assert mgraph_client.AsyncMgraphClient.IS_ASYNC
+"""
+    subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+
+
+def test_injected_access_token():
+    seen = []
+
+    def handler(method, url, headers, body):
+        seen.append(headers["Authorization"])
+        return 200, {}, {"value": []}
+
+    client = MgraphClient(
+        "test", "test", transport=LocalTransport(handler), access_token="injected"
+    )
+    Groups(client).get()
+
+    assert seen == ["Bearer injected"]
+    assert client._app is None
+    assert client.token_acquisitions == 0
+
+
+def test_get_model():
+    for name, module in MODEL_MODULES.items():
+        assert get_model(name).__module__ == f"mgraph_client.{module}"
+    assert get_model("Members").ITEM_CLASS == "User"
+    with pytest.raises(ValueError):
+        get_model("DoesNotExist")
@@ -0,0 +1,97 @@
+import datetime
+import warnings
+
+import pytest
+
+from mgraph_client.drives import Drives
+
+
+@pytest.fixture
+def children(make_client, url):
+    def item(i, **kwargs):
+        return {
+            "id": str(i),
+            "name": "a.txt" if i % 2 else "b.txt",
+            "size": i * 10,
+            "lastModifiedDateTime": f"2024-01-0{i + 1}T08:15:00.1234567Z",
+            "parentReference": {"driveId": "d1"},
+            **kwargs,
+        }
+
+    pages = {
+        f"{url}/drives/d1/root/children": {
+            "value": [item(0), item(1)],
+            "@odata.nextLink": f"{url}/drives/d1/root/children?page=2",
+        },
+        f"{url}/drives/d1/root/children?page=2": {
+            "value": [item(2, size=None, lastModifiedDateTime=None)]
+        },
+    }
+    client = make_client(lambda method, url, headers, body: (200, {}, pages[url]))
+    children = Drives(client).by_id("d1").root.children.get()
+    children.get_next_items()
+    return children
+
+
+def test_columns_without_numpy(children):
+    columns = children.to_columns(["id", "size", "last_modified_date_time"], False)
+
+    assert columns["id"] == ["0", "1", "2"]
+    assert columns["size"] == [0, 10, None]
+    assert columns["last_modified_date_time"][1] == datetime.datetime(
+        2024, 1, 2, 8, 15, 0, 123456, tzinfo=datetime.timezone.utc
+    )
+
+
+def test_dictionary_columns(children):
+    column = children.to_columns(["name"], False, dictionary=True)["name"]
+
+    assert column.codes == [0, 1, 0]
+    assert column.categories == ["b.txt", "a.txt"]
+    assert column.decode() == ["b.txt", "a.txt", "b.txt"]
+
+
+def test_unknown_column(children):
+    with pytest.raises(ValueError):
+        children.to_columns(["missing"])
+
+
+def test_numpy_columns(children):
+    np = pytest.importorskip("numpy")
+
+    columns = children.to_columns(use_numpy=True, dictionary=True)
+
+    assert set(columns) >= {"id", "name", "size", "last_modified_date_time"}
+    modified = columns["last_modified_date_time"]
+    assert modified.dtype == np.dtype("datetime64[us]")
+    assert modified[0] == np.datetime64("2024-01-01T08:15:00.123456")
+    assert np.isnat(modified[2])
+
+    size = columns["size"]
+    assert size.dtype == np.int64
+    assert list(size.mask) == [False, False, True]
+    assert children.to_columns(["id"], True)["id"].dtype == object
+    assert columns["name"].codes.dtype == np.int32
+    assert list(columns["name"].categories) == ["b.txt", "a.txt"]
+
+
+def test_numpy_columns_with_offsets(make_client, url):
+    np = pytest.importorskip("numpy")
+    values = ["2024-01-01T10:15:00+02:00", "2024-01-01T08:15:00Z", None]
+    page = {
+        "value": [
+            {"id": str(i), "lastModifiedDateTime": value, "parentReference": {}}
+            for i, value in enumerate(values)
+        ]
+    }
+    client = make_client(lambda *args: (200, {}, page))
+    children = Drives(client).by_id("d1").root.children.get()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        modified = children.to_columns(["last_modified_date_time"], use_numpy=True)[
+            "last_modified_date_time"
+        ]
+
+    assert list(modified[:2]) == [np.datetime64("2024-01-01T08:15:00")] * 2
+    assert np.isnat(modified[2])
@@ -0,0 +1,97 @@
+import datetime
+import json
+
+import pytest
+
+from mgraph_client.decoders import JsonDecoder, get_decoder
+from mgraph_client.drives import Drives
+
+
+def test_get_decoder():
+    assert type(get_decoder("json")) is JsonDecoder
+    assert get_decoder("auto").decode(b'{"a": [1]}') == {"a": [1]}
+
+    decoder = JsonDecoder()
+    assert get_decoder(decoder) is decoder
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_decoders(name):
+    if name != "json":
+        pytest.importorskip(name)
+    with open("tests/test.json", "rb") as f:
+        content = f.read()
+
+    assert get_decoder(name).decode(content) == json.loads(content)
+
+
+def test_client_decoder(make_client, url):
+    client = make_client(
+        lambda method, url, headers, body: (200, {}, {"id": "d1"}),
+        json_decoder="json",
+    )
+    assert type(client.json_decoder) is JsonDecoder
+    assert Drives(client).by_id("d1").get().id == "d1"
+
+
+def test_iter_structs(make_client, url):
+    pytest.importorskip("msgspec")
+    pages = {
+        f"{url}/drives/d1/root/children": {
+            "value": [
+                {
+                    "id": "1",
+                    "name": "a.txt",
+                    "size": 10,
+                    "lastModifiedDateTime": "2024-01-31T08:15:00.1234567Z",
+                    "parentReference": {"driveId": "d1"},
+                    "file": {},
+                }
+            ],
+            "@odata.nextLink": f"{url}/drives/d1/root/children?page=2",
+        },
+        f"{url}/drives/d1/root/children?page=2": {"value": [{"id": "2"}]},
+    }
+    client = make_client(
+        lambda method, url, headers, body: (200, {}, pages[url]),
+        json_decoder="msgspec",
+    )
+
+    structs = list(Drives(client).by_id("d1").root.children.iter_structs())
+
+    assert [struct.id for struct in structs] == ["1", "2"]
+    assert structs[0].size == 10
+    assert structs[0].parent_reference == {"driveId": "d1"}
+    assert structs[0].last_modified_date_time.date() == datetime.date(2024, 1, 31)
+    assert structs[1].name is None
+
+
+def test_iter_structs_requires_msgspec(make_client):
+    client = make_client(lambda *args: (200, {}, {}), json_decoder="json")
+    with pytest.raises(ValueError):
+        next(Drives(client).by_id("d1").root.children.iter_structs())
+
+
+def test_iter_structs_match_fields(make_client, url):
+    pytest.importorskip("msgspec")
+    page = {
+        "value": [
+            {
+                "id": "1",
+                "size": "10",
+                "lastModifiedDateTime": "2024-01-31T08:15:00.9999999Z",
+                "parentReference": {"driveId": "d1"},
+            }
+        ]
+    }
+    client = make_client(lambda *args: (200, {}, page), json_decoder="msgspec")
+    children = Drives(client).by_id("d1").root.children
+
+    (struct,) = children.iter_structs()
+    (item,) = children.get().iter_fetched_items()
+
+    assert struct.size == item.size == 10
+    assert struct.last_modified_date_time == item.last_modified_date_time
+    assert struct.last_modified_date_time.second == 0
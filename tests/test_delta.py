@@ -0,0 +1,118 @@
+import pytest
+
+from mgraph_client import JsonFileDeltaStore, SQLiteDeltaStore
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+from mgraph_client.sites import Sites
+from mgraph_client.users import Users
+
+
+@pytest.fixture
+def responses(url):
+    delta_link = f"{url}/groups/delta?$deltatoken=abc"
+    return {
+        f"{url}/groups/delta?$select=displayName": {
+            "value": [{"id": "1", "displayName": "One"}],
+            "@odata.nextLink": f"{url}/groups/delta?$skiptoken=p2",
+        },
+        f"{url}/groups/delta?$skiptoken=p2": {
+            "value": [{"id": "2", "displayName": "Two"}],
+            "@odata.deltaLink": delta_link,
+        },
+        delta_link: {
+            "value": [{"id": "2", "@removed": {"reason": "changed"}}],
+            "@odata.deltaLink": f"{url}/groups/delta?$deltatoken=def",
+        },
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return JsonFileDeltaStore(tmp_path / "delta.json")
+    return SQLiteDeltaStore(tmp_path / "delta.db")
+
+
+def test_delta_urls(client, url):
+    assert Groups(client).delta().url == f"{url}/groups/delta"
+    assert Users(client).delta().url == f"{url}/users/delta"
+    assert Drives(client).by_id("d1").root.delta().url == f"{url}/drives/d1/root/delta"
+
+
+def test_delta_sync(make_client, responses, store, url):
+    calls = []
+
+    def handler(method, request_url, headers, body):
+        calls.append(request_url)
+        return 200, {}, responses[request_url]
+
+    client = make_client(handler)
+
+    delta = Groups(client).delta(store).select("displayName")
+    items = list(delta.iter_changes())
+    assert [(item.id, item.is_removed) for item in items] == [
+        ("1", False),
+        ("2", False),
+    ]
+    assert items[0].url == f"{url}/groups/1"
+    assert store.get(f"{url}/groups/delta?$select=displayName") == (
+        f"{url}/groups/delta?$deltatoken=abc"
+    )
+
+    delta = Groups(client).delta(store).select("displayName")
+    items = list(delta.iter_changes())
+    assert [(item.id, item.is_removed) for item in items] == [("2", True)]
+    assert calls[-1] == f"{url}/groups/delta?$deltatoken=abc"
+    assert delta.delta_link == f"{url}/groups/delta?$deltatoken=def"
+
+    delta.reset()
+    assert delta.stored_delta_link is None
+
+
+def test_delta_store_persists(tmp_path):
+    JsonFileDeltaStore(tmp_path / "delta.json").set("groups", "link")
+    assert JsonFileDeltaStore(tmp_path / "delta.json").get("groups") == "link"
+
+    SQLiteDeltaStore(tmp_path / "delta.db").set("groups", "link")
+    assert SQLiteDeltaStore(tmp_path / "delta.db").get("groups") == "link"
+
+
+def test_drive_delta_items(make_client, url):
+    data = {
+        "value": [
+            {"id": "a", "parentReference": {"driveId": "d2"}},
+            {"id": "b", "deleted": {}, "@removed": {}},
+        ],
+        "@odata.deltaLink": f"{url}/drives/d1/root/delta?token=x",
+    }
+    client = make_client(lambda *args: (200, {}, data))
+    items = list(Drives(client).by_id("d1").root.delta().iter_changes())
+
+    assert items[0].url == f"{url}/drives/d2/items/a"
+    assert items[1].id == "b"
+    assert items[1].url == f"{url}/drives/d1/items/b"
+    assert items[1].is_removed
+
+    site = Sites(client).by_id("s1")
+    _, removed = site.drive.root.delta().iter_changes()
+    assert removed.url == f"{url}/sites/s1/drive/items/b"
+
+
+def test_users(client, url, check_request_attributes):
+    users = client.users
+    assert users.url == f"{url}/users"
+    user = users.by_id("u1")
+    assert user.url == f"{url}/users/u1"
+    assert user.member_of.url == f"{url}/users/u1/memberOf"
+
+    check_request_attributes(users, _type="method", GET=True)
+    check_request_attributes(
+        users,
+        _type="query_param",
+        SELECT=True,
+        FILTER=True,
+        ORDERBY=True,
+        TOP=True,
+        SEARCH=True,
+        COUNT=True,
+    )
@@ -0,0 +1,240 @@
+import io
+import json
+import re
+import threading
+
+import pytest
+
+from mgraph_client.drives import Drives
+from mgraph_client.transfers import ContentChangedError, Download
+
+DOWNLOAD_URL = "https://download.example.com/file/1"
+
+
+class FakeDownloadServer:
+    def __init__(
+        self, url, content, truncate=0, ranges=True, etag='"{f1},1"', changed=None
+    ):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        # (content, etag) of the item once the first download request is sent.
+        self.changed = changed
+        self.truncate = truncate
+        self.ranges = ranges
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, method, request_url, headers, body):
+        with self.lock:
+            self.requests.append((request_url, headers.get("Range")))
+            if not request_url.startswith(DOWNLOAD_URL):
+                return (
+                    200,
+                    {},
+                    {
+                        "id": "f1",
+                        "size": len(self.content),
+                        "eTag": self.etag,
+                        "@microsoft.graph.downloadUrl": DOWNLOAD_URL,
+                    },
+                )
+            assert "Authorization" not in headers
+
+            match = re.match(r"bytes=(\d+)-(\d+)", headers.get("Range", ""))
+            if_range = headers.get("If-Range")
+            if match is None or not self.ranges or if_range not in (None, self.etag):
+                status, content = 200, self.content
+            else:
+                start, end = map(int, match.groups())
+                status, content = 206, self.content[start : end + 1]
+            # Connection dropped part way through the body.
+            if self.truncate:
+                self.truncate -= 1
+                content = content[: len(content) // 2]
+            if self.changed is not None:
+                (self.content, self.etag), self.changed = self.changed, None
+            return status, {}, content
+
+
+@pytest.fixture
+def content():
+    return bytes(range(256)) * 4000 + b"tail"
+
+
+def get_item(client):
+    return Drives(client).by_id("d1").items.by_id("f1")
+
+
+def test_download_to_buffer(make_client, url, content):
+    server = FakeDownloadServer(url, content)
+    buffer = io.BytesIO()
+
+    size = get_item(make_client(server)).download(buffer, chunk_size=1000)
+
+    assert size == len(content)
+    assert buffer.getvalue() == content
+    assert server.requests == [
+        (
+            f"{url}/drives/d1/items/f1?$select=id,size,eTag,@microsoft.graph.downloadUrl",
+            None,
+        ),
+        (DOWNLOAD_URL, None),
+    ]
+
+
+def test_download_resumes_truncated_stream(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content, truncate=1)
+    path = tmp_path / "file.bin"
+
+    get_item(make_client(server)).download(path)
+
+    assert path.read_bytes() == content
+    assert server.requests[-1] == (
+        DOWNLOAD_URL,
+        f"bytes={len(content) // 2}-{len(content) - 1}",
+    )
+
+
+def write_partial(path, data, size, etag='"{f1},1"', **state):
+    path.write_bytes(data)
+    state = {"etag": etag, "size": size, **state}
+    path.with_name(f"{path.name}.parts").write_text(json.dumps(state))
+
+
+def test_download_resumes_partial_file(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+    write_partial(path, content[:1000], len(content))
+
+    get_item(make_client(server)).download(path)
+
+    assert path.read_bytes() == content
+    assert server.requests[-1] == (DOWNLOAD_URL, f"bytes=1000-{len(content) - 1}")
+    assert not (tmp_path / "file.bin.parts").exists()
+
+
+def test_download_replaces_file_without_parts(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"old" * 100)
+
+    get_item(make_client(server)).download(path)
+
+    assert path.read_bytes() == content
+    assert server.requests[-1] == (DOWNLOAD_URL, None)
+
+
+def test_download_restarts_changed_item(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+
+    # The .parts file is of an older version of the item.
+    write_partial(path, b"x" * 1000, len(content), etag='"{f1},0"')
+    get_item(make_client(server)).download(path)
+    assert path.read_bytes() == content
+    assert server.requests[-1] == (DOWNLOAD_URL, None)
+
+    # The item changed after it was read, the resumed range is answered with
+    # the whole item.
+    write_partial(path, b"x" * 1000, len(content), etag='"{f1},0"')
+    download = Download(
+        make_client(server), DOWNLOAD_URL, len(content), etag='"{f1},0"'
+    )
+    with pytest.raises(ContentChangedError):
+        download.to(path)
+    assert not (tmp_path / "file.bin.parts").exists()
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_download_rereads_grown_item(make_client, url, content, tmp_path, max_workers):
+    grown = content + bytes(range(256)) * 40
+    server = FakeDownloadServer(url, content, truncate=1, changed=(grown, '"{f1},2"'))
+    path = tmp_path / "file.bin"
+
+    size = get_item(make_client(server)).download(
+        path, max_workers=max_workers, part_size=100000
+    )
+
+    assert size == len(grown)
+    assert path.read_bytes() == grown
+    assert not (tmp_path / "file.bin.parts").exists()
+
+
+def test_download_to_buffer_rereads_grown_item(make_client, url, content):
+    grown = content + bytes(range(256)) * 40
+    server = FakeDownloadServer(url, content, truncate=1, changed=(grown, '"{f1},2"'))
+    buffer = io.BytesIO(b"head")
+    buffer.seek(4)
+
+    size = get_item(make_client(server)).download(buffer)
+
+    assert size == len(grown)
+    assert buffer.getvalue() == b"head" + grown
+
+
+def test_download_without_range_support(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content, ranges=False)
+    path = tmp_path / "file.bin"
+    write_partial(path, content[:1000], len(content))
+
+    get_item(make_client(server)).download(path)
+
+    assert path.read_bytes() == content
+
+
+def test_parallel_download(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+
+    get_item(make_client(server)).download(path, max_workers=4, part_size=100000)
+
+    assert path.read_bytes() == content
+    assert len(server.requests) == 1 + 11
+    assert not (tmp_path / "file.bin.parts").exists()
+
+
+def test_parallel_download_resumes_parts(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+    partial = content[:100000] + bytes(len(content) - 100000)
+    write_partial(path, partial, len(content), parts=[0])
+
+    get_item(make_client(server)).download(path, max_workers=4, part_size=100000)
+
+    assert path.read_bytes() == content
+    assert "bytes=0-99999" not in [r for _, r in server.requests]
+
+
+def test_download_verifies_size(make_client, url, content):
+    server = FakeDownloadServer(url, content, truncate=10)
+
+    with pytest.raises(ValueError):
+        get_item(make_client(server)).download(io.BytesIO())
+
+
+def test_parallel_download_restarts_changed_item(make_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+    path = tmp_path / "file.bin"
+    partial = b"x" * 100000 + bytes(len(content) - 100000)
+    write_partial(path, partial, len(content), etag='"{f1},0"', parts=[0])
+
+    download = Download(
+        make_client(server),
+        DOWNLOAD_URL,
+        len(content),
+        max_workers=4,
+        part_size=100000,
+        etag='"{f1},0"',
+    )
+    with pytest.raises(ContentChangedError):
+        download.to(path)
+    assert not (tmp_path / "file.bin.parts").exists()
+
+
+def test_download_requires_sync_client(make_async_client, url, content, tmp_path):
+    server = FakeDownloadServer(url, content)
+
+    with pytest.raises(TypeError):
+        get_item(make_async_client(server)).download(tmp_path / "file.bin")
+    assert server.requests == []
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from mgraph_client.drives import Drives
+
+
+@pytest.fixture
+def tree():
+    # root -> a (folder) -> a1.txt, b (folder) -> b1.pdf, c (folder, empty)
+    # root -> r.pdf
+    return {
+        "root": ["a", "r.pdf"],
+        "a": ["a1.txt", "b", "c"],
+        "b": ["b1.pdf"],
+        "c": [],
+    }
+
+
+def make_tree_handler(url, tree, delays=None, page_size=2):
+    delays = delays or {}
+    calls = []
+    lock = threading.Lock()
+
+    def handler(method, request_url, headers, body):
+        path, _, query = request_url.removeprefix(f"{url}/drives/d1/").partition("?")
+        folder = "root" if path.startswith("root") else path.split("/")[1]
+        page = int(query.rsplit("=", 1)[1]) if "page=" in query else 0
+        with lock:
+            calls.append((folder, page, query))
+        time.sleep(delays.get(folder, 0))
+
+        names = tree[folder][page * page_size : (page + 1) * page_size]
+        value = []
+        for name in names:
+            item = {"id": name, "name": name, "parentReference": {"driveId": "d1"}}
+            if name in tree:
+                item["folder"] = {"childCount": len(tree[name])}
+            else:
+                item["file"] = {}
+            value.append(item)
+
+        data = {"value": value}
+        if (page + 1) * page_size < len(tree[folder]):
+            data["@odata.nextLink"] = f"{url}/drives/d1/{path}?page={page + 1}"
+        return 200, {}, data
+
+    return handler, calls
+
+
+def test_walk(make_client, url, tree):
+    handler, calls = make_tree_handler(url, tree)
+    root = Drives(make_client(handler)).by_id("d1").root
+
+    names = sorted(item.name for item in root.walk(max_workers=4))
+    assert names == ["a", "a1.txt", "b", "b1.pdf", "c", "r.pdf"]
+    assert sorted({folder for folder, page, query in calls}) == ["a", "b", "c", "root"]
+
+
+def test_walk_depth_and_filters(make_client, url, tree):
+    handler, calls = make_tree_handler(url, tree)
+    root = Drives(make_client(handler)).by_id("d1").root
+
+    assert sorted(item.name for item in root.walk(max_depth=1)) == ["a", "r.pdf"]
+
+    items = root.walk(extensions=["PDF"], folder_filter=lambda item: item.name != "c")
+    assert sorted(item.name for item in items) == ["b1.pdf", "r.pdf"]
+    assert "c" not in {folder for folder, page, query in calls}
+
+
+def test_walk_select(make_client, url, tree):
+    handler, calls = make_tree_handler(url, tree)
+    root = Drives(make_client(handler)).by_id("d1").items.by_id("a")
+
+    list(root.walk(select="size", page_size=100))
+    assert calls[0] == (
+        "a",
+        0,
+        "$select=size,id,name,folder,file,parentReference&$top=100",
+    )
+
+
+def test_walk_slow_folder_does_not_block(make_client, url):
+    tree = {"root": ["slow", "fast"], "slow": ["s.txt"], "fast": ["f.txt"]}
+    handler, calls = make_tree_handler(url, tree, delays={"slow": 0.3})
+    root = Drives(make_client(handler)).by_id("d1").root
+
+    names = [item.name for item in root.walk(max_workers=2)]
+    assert names.index("f.txt") < names.index("s.txt")
+
+
+def test_walk_error(make_client, url, tree):
+    handler, calls = make_tree_handler(url, tree)
+
+    def failing(method, request_url, headers, body):
+        if "/items/b/" in request_url:
+            return 403, {}, {"error": {"code": "accessDenied"}}
+        return handler(method, request_url, headers, body)
+
+    root = Drives(make_client(failing)).by_id("d1").root
+    with pytest.raises(requests.HTTPError):
+        list(root.walk())
@@ -1,3 +1,4 @@
+import gc
 import json
 from typing import Any, Callable
 import pytest
@@ -147,3 +148,33 @@ def test_drive_item_by_relative_path_children(
     check_request_attributes(
         obj, _type="query_param", SELECT=True, ORDERBY=True, TOP=True
     )
+
+
+def test_children_share_drive_items_parent(make_client, url):
+    def item(item_id, drive_id="d1"):
+        return {"id": item_id, "parentReference": {"driveId": drive_id}}
+
+    pages = {
+        f"{url}/drives/d1/items/a/children": {
+            "value": [item("1"), item("2"), item("3", "d2")]
+        },
+        f"{url}/drives/d1/items/b/children": {"value": [item("4")]},
+    }
+    client = make_client(lambda m, u, h, b: (200, {}, pages[u]))
+    items = client.drives.by_id("d1").items
+
+    first = list(items.by_id("a").children.get().iter_all_items())
+    second = list(items.by_id("b").children.get().iter_all_items())
+
+    assert first[0]._parent is first[1]._parent is second[0]._parent
+    assert first[2]._parent is not first[0]._parent
+    assert [i.url for i in first + second] == [
+        f"{url}/drives/d1/items/1",
+        f"{url}/drives/d1/items/2",
+        f"{url}/drives/d2/items/3",
+        f"{url}/drives/d1/items/4",
+    ]
+
+    del first, second
+    gc.collect()
+    assert len(client._drive_items) == 0
@@ -0,0 +1,63 @@
+import datetime
+
+from mgraph_client.drives import DriveItem
+from mgraph_client.groups import Groups
+
+
+def test_field_values_are_memoized(client):
+    item = DriveItem(
+        client,
+        data={"id": "1", "lastModifiedDateTime": "2024-01-31T08:15:00.1234567Z"},
+        parent=client.drives.by_id("d1").items,
+    )
+
+    modified = item.last_modified_date_time
+    assert modified == datetime.datetime(
+        2024, 1, 31, 8, 15, 0, 123456, tzinfo=datetime.timezone.utc
+    )
+    assert item.last_modified_date_time is modified
+
+    item._data = {"id": "1", "lastModifiedDateTime": "2024-02-01T00:00:00Z"}
+    assert item.last_modified_date_time.month == 2
+
+
+def test_null_field_values(client):
+    item = DriveItem(client, data={"id": "1", "size": None}, parent=None)
+    assert item.size is None
+    assert item.name is None
+
+
+def test_field_values_across_pages(make_client, url):
+    pages = {
+        f"{url}/groups": {
+            "value": [
+                {"id": "1", "displayName": "One", "securityEnabled": True},
+                {"id": "2", "displayName": None},
+            ],
+            "@odata.nextLink": f"{url}/groups?page=2",
+        },
+        f"{url}/groups?page=2": {"value": [{"id": "3", "displayName": "Three"}]},
+    }
+    client = make_client(lambda method, url, headers, body: (200, {}, pages[url]))
+    groups = Groups(client).get()
+    groups.get_next_items()
+
+    assert groups.field_values("display_name") == ["One", None, "Three"]
+    assert groups.field_values("security_enabled", page=1) == [True, None]
+    assert groups.field_values("id", page=2) == ["3"]
+
+
+def test_datetime_field_values(client):
+    field = DriveItem.created_date_time
+    items = [
+        {"createdDateTime": "2024-01-31T08:15:00.1234567Z"},
+        {"createdDateTime": "2024-01-31T08:15:00.1234567Z"},
+        {"createdDateTime": "2024-01-31T08:15:00Z"},
+        {},
+    ]
+    values = field.get_values(items)
+
+    assert values[0] is values[1]
+    assert values[0].microsecond == 123456
+    assert values[2].microsecond == 0
+    assert values[3] is None
@@ -5,6 +5,8 @@ from requests import check_compatibility
 
 from mgraph_client.groups import Groups
 
+import mgraph_client.users
+
 
 @pytest.fixture
 def groups(client) -> Groups:
@@ -26,10 +28,31 @@ def test_groups(groups: Groups, url: str, check_request_attributes: Callable):
     )
 
 
+def test_groups_query_encoding(groups: Groups, url: str):
+    groups.filter("startswith(displayName,'R&D') and mail eq 'a+b@contoso.com'")
+    groups.orderby("displayName desc").top(10).count()
+
+    assert groups.url_with_query_params == (
+        f"{url}/groups?$filter=startswith(displayName,'R%26D')%20and%20"
+        "mail%20eq%20'a%2Bb@contoso.com'&$orderby=displayName%20desc"
+        "&$top=10&$count=true"
+    )
+
+    groups.filter__or("id eq '1#2'")
+    assert "%20or%20id%20eq%20'1%232'&" in groups.url_with_query_params
+
+
+def test_groups_url_is_cached(groups: Groups, url: str):
+    group = groups.by_id("12345")
+    assert group.url is group.url
+    assert groups._url == f"{url}/groups"
+    assert group.members.url == f"{url}/groups/12345/members"
+
+
 def test_group(groups: Groups, url: str, check_request_attributes: Callable):
     obj = groups.by_id("12345")
     assert obj.url == f"{url}/groups/12345"
-    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="method", GET=True, PATCH=True)
     check_request_attributes(obj, _type="query_param", SELECT=True)
 
 
@@ -49,3 +72,85 @@ def test_group_members_ref(
     assert obj.url == f"{url}/groups/12345/members/$ref"
     check_request_attributes(obj, _type="method", POST=True)
     check_request_attributes(obj, _type="query_param")
+
+
+def test_group_member_ref(groups: Groups, url: str, check_request_attributes: Callable):
+    obj = groups.by_id("12345").members.by_directory_object_id("u1").ref
+    assert obj.url == f"{url}/groups/12345/members/u1/$ref"
+    check_request_attributes(obj, _type="method", DELETE=True)
+
+
+def make_membership_handler(url, members, invalid=()):
+    seen = []
+
+    def handler(method, request_url, headers, body):
+        if method == "GET":
+            value = [{"id": member} for member in sorted(members)]
+            return 200, {}, {"value": value}
+
+        payload = json.loads(body)
+        seen.append(payload["requests"])
+        responses = []
+        for req in payload["requests"]:
+            if req["method"] == "PATCH":
+                binds = req["body"]["members@odata.bind"]
+                ids = [bind.rsplit("/", 1)[-1] for bind in binds]
+            elif req["method"] == "POST":
+                ids = [req["body"]["@odata.id"].rsplit("/", 1)[-1]]
+            else:
+                ids = [req["url"].split("/")[-2]]
+
+            status = 204
+            if any(i in invalid for i in ids):
+                status = 400
+            elif req["method"] == "DELETE":
+                members.difference_update(ids)
+            else:
+                members.update(ids)
+            responses.append({"id": req["id"], "status": status, "headers": {}})
+        return 200, {}, {"responses": responses}
+
+    return handler, seen
+
+
+def test_group_members_add_in_chunks(make_client, url):
+    members = set()
+    handler, seen = make_membership_handler(url, members, invalid={"u7"})
+    client = make_client(handler)
+
+    ids = [f"u{i}" for i in range(45)]
+    result = client.groups.by_id("g1").members.add(ids)
+
+    assert members == set(ids) - {"u7"}
+    assert sorted(result.added) == sorted(set(ids) - {"u7"})
+    assert list(result.failed) == ["u7"]
+    assert result.failed["u7"].status == 400
+    assert not result.ok
+    # 3 PATCHes binding 20, 20 and 5 members, then the failed chunk one by one.
+    assert [len(requests) for requests in seen] == [3, 20]
+    assert seen[0][0]["url"] == "/groups/g1"
+    assert seen[0][0]["body"]["members@odata.bind"][0] == (f"{url}/directoryObjects/u0")
+    assert seen[1][0] == {
+        "id": "1",
+        "method": "POST",
+        "url": "/groups/g1/members/$ref",
+        "body": {"@odata.id": f"{url}/directoryObjects/u0"},
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+def test_group_members_sync(make_client, url):
+    members = {"u1", "u2", "u3"}
+    handler, seen = make_membership_handler(url, members)
+    client = make_client(handler)
+
+    result = client.groups.by_id("g1").members.sync(["u2", "u3", "u4"])
+
+    assert members == {"u2", "u3", "u4"}
+    assert result.added == ["u4"]
+    assert result.removed == ["u1"]
+    assert result.ok
+    assert [[(r["method"], r["url"]) for r in requests] for requests in seen] == [
+        [("PATCH", "/groups/g1")],
+        [("DELETE", "/groups/g1/members/u1/$ref")],
+    ]
@@ -0,0 +1,143 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mgraph_client import HttpTransport, PrometheusMetrics, RequestEvent, WrapEvent
+from mgraph_client.groups import Groups
+from mgraph_client.retry import RetryPolicy
+
+
+@pytest.fixture
+def pages(url):
+    return {
+        f"{url}/groups": {
+            "value": [{"id": "1"}, {"id": "2"}],
+            "@odata.nextLink": f"{url}/groups?page=2",
+        },
+        f"{url}/groups?page=2": {"value": [{"id": "3"}]},
+    }
+
+
+def test_listing_events(make_client, pages):
+    events = []
+    client = make_client(lambda m, u, h, b: (200, {}, pages[u]), hooks=[events.append])
+
+    groups = Groups(client).get()
+    assert [group.id for group in groups.iter_all_items()] == ["1", "2", "3"]
+
+    requests = [e for e in events if isinstance(e, RequestEvent)]
+    assert [(e.method, e.status, e.resource, e.retries) for e in requests] == [
+        ("GET", 200, "Groups", 0),
+        ("GET", 200, "Groups", 0),
+    ]
+    for event in requests:
+        assert set(event.phases) == {"token", "ttfb", "body", "decode"}
+        assert event.response_bytes > 0
+        assert event.duration == pytest.approx(sum(event.phases.values()))
+
+    wraps = [e for e in events if isinstance(e, WrapEvent)]
+    assert [(e.resource, e.items) for e in wraps] == [("Groups", 2), ("Groups", 1)]
+
+
+def test_retry_and_error_events(make_client, url):
+    responses = iter([(429, {"Retry-After": "0"}, {}), (404, {}, {"error": {}})])
+    events = []
+    client = make_client(
+        lambda *args: next(responses),
+        hooks=[events.append],
+        retry_policy=RetryPolicy(backoff_factor=0),
+    )
+
+    with pytest.raises(Exception):
+        Groups(client).by_id("g1").get()
+
+    (event,) = events
+    assert (event.status, event.retries, event.decode) == (404, 1, None)
+    assert event.wait is not None
+
+
+def test_post_body_bytes(make_client):
+    events = []
+    client = make_client(lambda *args: (204, {}, None), hooks=[events.append])
+
+    Groups(client).by_id("g1").members.ref.post({"@odata.id": "x"})
+
+    (event,) = events
+    assert (event.method, event.status, event.resource) == ("POST", 204, "Reference")
+    assert event.request_bytes == len(b'{"@odata.id": "x"}')
+    assert event.response_bytes == 0
+
+
+def test_no_hooks(make_client, pages):
+    client = make_client(lambda m, u, h, b: (200, {}, pages[u]))
+    groups = Groups(client).get()
+
+    assert list(groups.current_items)
+    assert client._get_event("GET", "x", groups) is None
+
+
+def test_prometheus_metrics(make_client, url, pages):
+    metrics = PrometheusMetrics(buckets=(0.5, 1.0))
+    responses = iter([(503, {"Retry-After": "0"}, {})])
+
+    def handler(method, request_url, headers, body):
+        return next(responses, (200, {}, pages[request_url]))
+
+    client = make_client(
+        handler, hooks=[metrics], retry_policy=RetryPolicy(backoff_factor=0)
+    )
+    list(Groups(client).get().iter_all_items())
+    text = metrics.render()
+
+    assert "# TYPE mgraph_requests_total counter" in text
+    assert (
+        'mgraph_requests_total{method="GET",status="200",resource="Groups"} 2' in text
+    )
+    assert 'mgraph_retries_total{method="GET",resource="Groups"} 1' in text
+    assert 'mgraph_items_wrapped_total{resource="Groups"} 3' in text
+    assert (
+        'mgraph_phase_seconds_bucket{phase="decode",resource="Groups",le="+Inf"} 2'
+        in text
+    )
+    assert 'mgraph_phase_seconds_count{phase="wrap",resource="Groups"} 2' in text
+
+    metrics.reset()
+    assert metrics.render() == ""
+
+
+def test_prometheus_label_escaping():
+    metrics = PrometheusMetrics()
+    event = RequestEvent("GET", "x", 'a"b\\c')
+    event.status = 200
+    metrics(event)
+    assert 'resource="a\\"b\\\\c"' in metrics.render()
+
+
+def test_http_transport_connect_time():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://%s:%s/" % server.server_address[:2]
+    transport = HttpTransport()
+    try:
+        transport.pop_connect_time()
+        transport.request("GET", url)
+        assert transport.pop_connect_time() > 0
+        transport.request("GET", url)
+        assert transport.pop_connect_time() == 0
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
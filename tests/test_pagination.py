@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from mgraph_client.groups import Groups
+
+
+@pytest.fixture
+def pages(url):
+    pages = {}
+    for i in range(4):
+        key = f"{url}/groups" if i == 0 else f"{url}/groups?page={i}"
+        page = {"value": [{"id": f"{i}-{j}"} for j in range(3)]}
+        if i < 3:
+            page["@odata.nextLink"] = f"{url}/groups?page={i + 1}"
+        pages[key] = page
+    return pages
+
+
+@pytest.fixture
+def groups(make_client, pages):
+    def handler(method, url, headers, body):
+        return 200, {}, pages[url]
+
+    return Groups(make_client(handler)).get()
+
+
+def test_stream_items_fetches_lazily(groups):
+    items = groups.stream_items()
+    assert next(items).id == "0-0"
+    assert groups._client._transport.calls == 1
+
+    assert [next(items).id for _ in range(3)] == ["0-1", "0-2", "1-0"]
+    assert groups._client._transport.calls == 2
+
+
+def test_stream_items_drops_pages(groups):
+    ids = []
+    for item in groups.stream_items():
+        ids.append(item.id)
+        assert len(groups._mdata) <= 2
+
+    assert len(ids) == 12
+    assert list(groups._mdata) == [3]
+    assert groups.current_page == 4
+
+
+def test_stream_items_keep_pages(groups):
+    ids = [item.id for item in groups.stream_items(keep_pages=True)]
+
+    assert ids == [item.id for item in groups.iter_fetched_items()]
+    assert list(groups._mdata) == [0, 1, 2, 3]
+    assert groups.count_fetched_items() == 12
+
+
+def test_iter_pages(groups):
+    pages = [[item.id for item in page] for page in groups.iter_pages(False)]
+    assert pages[1] == ["1-0", "1-1", "1-2"]
+    assert len(pages) == 4
+
+
+def test_prefetch_reads_ahead(groups):
+    pages = groups.iter_pages(keep_pages=False, prefetch=2)
+    first = next(pages)
+    assert [item.id for item in first] == ["0-0", "0-1", "0-2"]
+
+    for _ in range(50):
+        if groups._client._transport.calls == 4:
+            break
+        time.sleep(0.01)
+    assert groups._client._transport.calls == 4
+
+    ids = [item.id for page in pages for item in page]
+    assert ids[0] == "1-0" and len(ids) == 9
+    assert list(groups._mdata) == [3]
+
+
+def test_prefetch_backpressure(make_client, url):
+    fetched = []
+
+    def handler(method, request_url, headers, body):
+        page = int(request_url.rsplit("=", 1)[-1]) if "=" in request_url else 0
+        fetched.append(page)
+        link = {"@odata.nextLink": f"{url}/groups?page={page + 1}"}
+        return 200, {}, {"value": [{"id": str(page)}], **link}
+
+    groups = Groups(make_client(handler)).get()
+    items = groups.stream_items(prefetch=1)
+    assert next(items).id == "0"
+    time.sleep(0.3)
+
+    # One page waiting in the queue and one blocked on put.
+    assert len(fetched) <= 3
+    assert [next(items).id for _ in range(5)] == ["1", "2", "3", "4", "5"]
+    items.close()
+
+
+def test_prefetch_close_does_not_wait_for_request(make_client, pages, url):
+    release = threading.Event()
+    fetched = []
+
+    def handler(method, request_url, headers, body):
+        if request_url != f"{url}/groups":
+            release.wait(5)
+        fetched.append(request_url)
+        return 200, {}, pages[request_url]
+
+    groups = Groups(make_client(handler)).get()
+    items = groups.stream_items(prefetch=1)
+    assert next(items).id == "0-0"
+
+    start = time.perf_counter()
+    items.close()
+    assert time.perf_counter() - start < 1
+    release.set()
+
+    # The request in flight finishes, no other one is sent.
+    for _ in range(50):
+        if len(fetched) == 2:
+            break
+        time.sleep(0.01)
+    time.sleep(0.2)
+    assert fetched == [f"{url}/groups", f"{url}/groups?page=1"]
+
+
+def test_prefetch_propagates_errors(make_client, pages, url):
+    del pages[f"{url}/groups?page=2"]
+
+    def handler(method, request_url, headers, body):
+        try:
+            return 200, {}, pages[request_url]
+        except KeyError:
+            return 404, {}, {"error": {"code": "notFound"}}
+
+    groups = Groups(make_client(handler)).get()
+    ids = []
+    with pytest.raises(requests.HTTPError):
+        for item in groups.stream_items(prefetch=2):
+            ids.append(item.id)
+    assert ids == ["0-0", "0-1", "0-2", "1-0", "1-1", "1-2"]
+
+
+def test_items_are_wrapped_on_access(groups):
+    items = groups.current_items
+    assert len(items) == 3
+    assert [item.id for item in items[1:]] == ["0-1", "0-2"]
+
+    item = items[0]
+    assert item.id == "0-0"
+    assert item._data is groups._mdata[0]["value"][0]
+    assert item._query_params is None
+    assert not hasattr(item, "__dict__")
+
+
+def test_unfetched_listing_raises(make_client):
+    groups = Groups(make_client(None))
+    with pytest.raises(ValueError):
+        list(groups.iter_fetched_items())
+    with pytest.raises(ValueError):
+        groups.current_items
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from mgraph_client import AdaptiveRateLimiter
+from mgraph_client.device_management import DeviceManagement
+
+
+def test_family(url):
+    limiter = AdaptiveRateLimiter()
+    assert limiter.family(f"{url}/deviceManagement/managedDevices") == "intune"
+    assert limiter.family(f"{url}/sites/12345/drive/root") == "sharepoint"
+    assert limiter.family(f"{url}/drives/b!1/items/2/children") == "sharepoint"
+    assert limiter.family(f"{url}/groups?$top=10") == "graph"
+    assert limiter.family(f"{url}/$batch") == "graph"
+    assert limiter.family("https://contoso.sharepoint.com/upload") == (
+        "contoso.sharepoint.com"
+    )
+
+
+def test_reserve_caps_rate(url):
+    limiter = AdaptiveRateLimiter(rate=10, burst=2)
+    delays = [limiter.reserve(f"{url}/groups") for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert 0.05 < delays[2] <= 0.1
+    assert 0.15 < delays[3] <= 0.2
+    assert limiter.reserve(f"{url}/drives") == 0.0
+
+
+def test_aimd(url):
+    limiter = AdaptiveRateLimiter(rate=8, min_rate=1, success_threshold=2)
+    devices = f"{url}/deviceManagement/managedDevices"
+
+    limiter.feedback(devices, 429)
+    limiter.feedback(devices, 429)
+    assert limiter.bucket(devices).rate == 2
+    limiter.feedback(devices, 429)
+    limiter.feedback(devices, 429)
+    assert limiter.bucket(devices).rate == 1
+
+    for _ in range(4):
+        limiter.feedback(devices, 200)
+    assert limiter.bucket(devices).rate == 3
+    assert limiter.metrics == {"intune": {"rate": 3, "throttled": 4}}
+
+
+def test_shared_between_threads(url):
+    limiter = AdaptiveRateLimiter(rate=50, burst=1)
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire(f"{url}/groups")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 requests at 50/s with a burst of one take at least 19 intervals.
+    assert time.monotonic() - start >= 0.35
+
+
+def test_client_feedback(make_client, url):
+    responses = [(429, {"Retry-After": "0"}, {}), (200, {}, {"value": []})]
+    client = make_client(
+        lambda *args: responses.pop(0), rate_limiter=AdaptiveRateLimiter(rate=100)
+    )
+    DeviceManagement(client).managed_devices.get()
+
+    assert client.rate_limiter.metrics["intune"]["throttled"] == 1
+    assert client.rate_limiter.metrics["intune"]["rate"] == 50
@@ -0,0 +1,123 @@
+import pytest
+import requests
+
+from mgraph_client import RetryPolicy
+from mgraph_client.groups import Groups
+from mgraph_client.retry import parse_retry_after
+
+
+def make_handler(responses):
+    calls = []
+
+    def handler(method, url, headers, body):
+        calls.append((method, url))
+        return responses.pop(0)
+
+    return handler, calls
+
+
+def test_retry_after(make_client, url):
+    handler, calls = make_handler(
+        [(429, {"Retry-After": "0"}, {}), (503, {}, {}), (200, {}, {"id": "g1"})]
+    )
+    client = make_client(handler, retry_policy=RetryPolicy(backoff_factor=0))
+    group = Groups(client).by_id("g1").get()
+
+    assert group.id == "g1"
+    assert len(calls) == 3
+    assert client.retry_policy.metrics == {"retries": 2, "sleep_time": 0.0}
+
+
+def test_retry_gives_up(make_client):
+    handler, calls = make_handler([(429, {"Retry-After": "0"}, {})] * 3)
+    client = make_client(handler, retry_policy=RetryPolicy(max_retries=2))
+
+    with pytest.raises(requests.HTTPError):
+        Groups(client).by_id("g1").get()
+    assert len(calls) == 3
+
+
+def test_retry_budget(make_client):
+    handler, calls = make_handler([(429, {"Retry-After": "0"}, {})] * 4)
+    client = make_client(handler, retry_policy=RetryPolicy(retry_budget=1))
+
+    with pytest.raises(requests.HTTPError):
+        Groups(client).by_id("g1").get()
+    with pytest.raises(requests.HTTPError):
+        Groups(client).by_id("g1").get()
+    assert len(calls) == 3
+    assert client.retry_policy.is_exhausted
+
+
+def test_non_idempotent_not_retried(make_client):
+    handler, calls = make_handler([(429, {"Retry-After": "0"}, {})])
+    client = make_client(handler)
+
+    with pytest.raises(requests.HTTPError):
+        Groups(client).by_id("g1").members.ref.post({"@odata.id": "x"})
+    assert len(calls) == 1
+
+
+def test_retry_next_page(make_client, url):
+    page = {"value": [{"id": "1"}], "@odata.nextLink": f"{url}/groups?page=2"}
+    handler, calls = make_handler(
+        [(429, {"Retry-After": "0"}, {}), (200, {}, {"value": [{"id": "2"}]})]
+    )
+    client = make_client(handler)
+    groups = Groups(client, data=page)
+
+    groups.get_next_items()
+    assert groups._mdata == {0: page, 1: {"value": [{"id": "2"}]}}
+    assert [group.id for group in groups.iter_fetched_items()] == ["1", "2"]
+
+
+def test_retry_next_page_failure_keeps_state(make_client, url):
+    page = {"value": [{"id": "1"}], "@odata.nextLink": f"{url}/groups?page=2"}
+    handler, calls = make_handler([(503, {}, {})] * 2)
+    client = make_client(handler, retry_policy=RetryPolicy(1, backoff_factor=0))
+    groups = Groups(client, data=page)
+
+    with pytest.raises(requests.HTTPError):
+        groups.get_next_items()
+    assert groups._mdata == {0: page}
+    assert groups.current_page == 1
+    assert groups.has_next_items()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "7"}) == 7.0
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_backoff_bounds():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+    assert all(0 <= policy.backoff(10) <= 4 for _ in range(100))
+
+
+def test_retry_after_is_not_capped_by_max_backoff():
+    headers = {"Retry-After": "120"}
+    assert RetryPolicy(max_backoff=60).get_delay(headers, 0) == 120
+    assert RetryPolicy(max_retry_after=30).get_delay(headers, 0) == 30
+
+
+def test_non_json_error_raises_http_error(make_client, url):
+    handler, calls = make_handler(
+        [
+            (502, {"Content-Type": "text/html"}, "<html>Bad Gateway</html>"),
+            (
+                200,
+                {},
+                {"value": [{"id": "g1"}], "@odata.nextLink": f"{url}/groups?p=2"},
+            ),
+            (503, {}, None),
+        ]
+    )
+    client = make_client(handler, retry_policy=RetryPolicy(max_retries=0))
+
+    with pytest.raises(requests.HTTPError):
+        Groups(client).by_id("g1").get()
+    groups = Groups(client).get()
+    with pytest.raises(requests.HTTPError):
+        groups.get_next_items()
@@ -0,0 +1,162 @@
+import asyncio
+import contextlib
+import datetime
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+from mgraph_client.sharding import datetime_windows, prefix_filters
+
+
+def make_handler(url, names, page_size=2, delay=0.0, fail=None):
+    state = {"active": 0, "max_active": 0, "filters": []}
+    lock = threading.Lock()
+
+    def handler(method, request_url, headers, body):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            time.sleep(delay)
+            query = parse_qs(urlsplit(request_url).query)
+            value = query["$filter"][0]
+            prefix = re.search(r"startswith\(displayName,'(.*?)'\)", value).group(1)
+            if prefix == fail:
+                return 404, {}, {"error": {"code": "itemNotFound"}}
+            with lock:
+                state["filters"].append(value)
+
+            matches = [n for n in names if n.startswith(prefix)]
+            start = int(query.get("page", ["0"])[0])
+            page = {
+                "value": [
+                    {"id": n.split("-")[-1], "displayName": n}
+                    for n in matches[start : start + page_size]
+                ]
+            }
+            if start + page_size < len(matches):
+                link = request_url.split("&page=")[0]
+                page["@odata.nextLink"] = f"{link}&page={start + page_size}"
+            return 200, {}, page
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    return handler, state
+
+
+NAMES = [f"{c}{i}-{c}{i}" for c in "abc" for i in range(5)]
+
+
+def test_sharded_listing(make_client, url):
+    # "b9-a0" has the id of "a0-a0", it is listed once.
+    handler, state = make_handler(url, NAMES + ["b9-a0"])
+    groups = Groups(make_client(handler)).filter("mailEnabled eq true")
+
+    items = list(groups.sharded(prefix_filters("displayName", "abc")))
+
+    assert sorted(item.id for item in items) == sorted(n.split("-")[1] for n in NAMES)
+    assert items[0].url.startswith(f"{url}/groups/")
+    assert "(mailEnabled eq true) and (startswith(displayName,'a'))" in set(
+        state["filters"]
+    )
+    assert groups._query_params == {"filter": "mailEnabled eq true"}
+
+
+def test_sharded_listing_without_dedupe(make_client, url):
+    handler, _ = make_handler(url, NAMES + ["b9-a0"])
+    groups = Groups(make_client(handler))
+
+    items = list(groups.sharded(prefix_filters("displayName", "abc"), key=None))
+
+    assert len(items) == 16
+
+
+def test_sharded_listing_is_concurrent(make_client, url):
+    handler, state = make_handler(url, NAMES, delay=0.05)
+    groups = Groups(make_client(handler))
+
+    items = list(groups.sharded(prefix_filters("displayName", "abc"), max_workers=3))
+
+    assert len(items) == 15
+    assert state["max_active"] > 1
+
+
+def test_sharded_listing_error(make_client, url):
+    handler, _ = make_handler(url, NAMES, fail="b")
+    groups = Groups(make_client(handler))
+
+    with pytest.raises(requests.HTTPError):
+        list(groups.sharded(prefix_filters("displayName", "abc")))
+
+
+def test_sharded_listing_requires_filter(client):
+    children = Drives(client).by_id("d1").root.children
+    with pytest.raises(ValueError):
+        children.sharded(["size gt 0"])
+    with pytest.raises(ValueError):
+        Groups(client).sharded([])
+
+
+def test_async_sharded_listing(make_async_client, url):
+    handler, _ = make_handler(url, NAMES)
+
+    async def run():
+        groups = Groups(make_async_client(handler))
+        shards = groups.sharded(prefix_filters("displayName", "abc"), max_workers=2)
+        return [item.id async for item in shards]
+
+    assert sorted(asyncio.run(run())) == sorted(n.split("-")[1] for n in NAMES)
+
+
+def test_async_sharded_listing_break(make_async_client, url):
+    handler, _ = make_handler(url, NAMES)
+
+    async def run():
+        groups = Groups(make_async_client(handler))
+        shards = groups.sharded(prefix_filters("displayName", "abc"), queue_size=1)
+        async with contextlib.aclosing(aiter(shards)) as items:
+            async for item in items:
+                break
+        return item.id, asyncio.all_tasks() - {asyncio.current_task()}
+
+    item_id, tasks = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert item_id
+    assert not tasks
+
+
+def test_async_sharded_listing_error(make_async_client, url):
+    handler, _ = make_handler(url, NAMES, fail="b")
+
+    async def run():
+        groups = Groups(make_async_client(handler))
+        shards = groups.sharded(prefix_filters("displayName", "abc"), queue_size=1)
+        try:
+            return [item async for item in shards]
+        finally:
+            assert not asyncio.all_tasks() - {asyncio.current_task()}
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def test_datetime_windows():
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime(2024, 1, 4, tzinfo=datetime.timezone.utc)
+
+    assert datetime_windows("lastSyncDateTime", start, end, 3, include_null=True) == [
+        "lastSyncDateTime lt 2024-01-02T00:00:00Z",
+        "lastSyncDateTime ge 2024-01-02T00:00:00Z"
+        " and lastSyncDateTime lt 2024-01-03T00:00:00Z",
+        "lastSyncDateTime ge 2024-01-03T00:00:00Z",
+        "lastSyncDateTime eq null",
+    ]
+    assert prefix_filters("displayName", ["O'B"]) == ["startswith(displayName,'O''B')"]
+    with pytest.raises(ValueError):
+        datetime_windows("lastSyncDateTime", end, start, 2)
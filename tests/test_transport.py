@@ -0,0 +1,58 @@
+import pytest
+import requests
+
+from mgraph_client import HttpTransport
+from mgraph_client.drives import Drives
+from mgraph_client.groups import Groups
+
+
+def test_http_transport_pool():
+    transport = HttpTransport(
+        pool_size=4, max_per_host=32, connect_timeout=1, read_timeout=2
+    )
+    adapter = transport._session.get_adapter("https://graph.microsoft.com")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert transport._timeout == (1, 2)
+    transport.close()
+
+
+def test_local_transport(make_client, url):
+    seen = []
+
+    def handler(method, request_url, headers, body):
+        seen.append((method, request_url, headers["Authorization"], body))
+        return 200, {}, {"id": "12345", "name": "OneDrive"}
+
+    client = make_client(handler)
+    drive = Drives(client).by_id("12345").get()
+
+    assert drive.name == "OneDrive"
+    assert client._transport.calls == 1
+    assert seen == [("GET", f"{url}/drives/12345", "Bearer token-1", None)]
+
+    Groups(client).by_id("g1").members.ref.post({"@odata.id": "x"})
+    assert seen[-1][:2] == ("POST", f"{url}/groups/g1/members/$ref")
+    assert seen[-1][3] == b'{"@odata.id": "x"}'
+
+
+def test_local_transport_next_page(make_client, url):
+    pages = {
+        f"{url}/groups": {
+            "value": [{"id": "1"}],
+            "@odata.nextLink": f"{url}/groups?page=2",
+        },
+        f"{url}/groups?page=2": {"value": [{"id": "2"}]},
+    }
+
+    def handler(method, request_url, headers, body):
+        return 200, {}, pages[request_url]
+
+    groups = Groups(make_client(handler)).get()
+    assert [group.id for group in groups.iter_all_items()] == ["1", "2"]
+
+
+def test_local_transport_error(make_client):
+    client = make_client(lambda *args: (404, {}, {"error": {"code": "itemNotFound"}}))
+    with pytest.raises(requests.HTTPError):
+        Drives(client).by_id("12345").get()
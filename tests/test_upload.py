@@ -0,0 +1,182 @@
+import io
+import re
+import threading
+
+import pytest
+
+from mgraph_client.drives import Drives
+from mgraph_client.retry import RetryPolicy
+from mgraph_client.transfers import FRAGMENT_UNIT, UploadSession
+
+UPLOAD_URL = "https://upload.example.com/session/1"
+
+
+class FakeUploadServer:
+    def __init__(self, url, fail_at=None):
+        self.url = url
+        self.fail_at = set(fail_at or ())
+        self.received = {}
+        self.total = None
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def missing(self):
+        ranges, offset = [], 0
+        for start in sorted(self.received):
+            if start > offset:
+                ranges.append(f"{offset}-{start - 1}")
+            offset = max(offset, start + len(self.received[start]))
+        if self.total is None or offset < self.total:
+            ranges.append(f"{offset}-")
+        return ranges
+
+    def __call__(self, method, request_url, headers, body):
+        with self.lock:
+            self.requests.append((method, request_url, headers))
+            if request_url.endswith("/createUploadSession"):
+                return 200, {}, {"uploadUrl": UPLOAD_URL}
+            if request_url.split("?")[0].endswith("/content"):
+                self.received[0] = body
+                return 201, {}, self.item(len(body))
+            if method == "GET":
+                return 200, {}, {"nextExpectedRanges": self.missing()}
+
+            start, end, total = map(
+                int,
+                re.match(r"bytes (\d+)-(\d+)/(\d+)", headers["Content-Range"]).groups(),
+            )
+            assert "Authorization" not in headers
+            assert int(headers["Content-Length"]) == len(body) == end - start + 1
+            if start in self.fail_at:
+                self.fail_at.discard(start)
+                return 400, {}, {"error": {"code": "invalidRequest"}}
+            if start in self.received:
+                return 416, {}, None
+            self.total = total
+            self.received[start] = body
+            if not self.missing():
+                return 201, {}, self.item(total)
+            return 202, {}, {"nextExpectedRanges": self.missing()}
+
+    def item(self, size):
+        return {
+            "id": "new",
+            "name": "big.bin",
+            "size": size,
+            "parentReference": {"driveId": "d1"},
+        }
+
+    @property
+    def content(self):
+        return b"".join(self.received[start] for start in sorted(self.received))
+
+
+@pytest.fixture
+def content():
+    return bytes(range(256)) * (14 * FRAGMENT_UNIT // 256 + 7)
+
+
+def test_fragment_size_must_be_multiple_of_unit(client):
+    with pytest.raises(ValueError):
+        UploadSession(client, UPLOAD_URL, fragment_size=FRAGMENT_UNIT + 1)
+
+
+def test_upload_session(make_client, url, content):
+    server = FakeUploadServer(url)
+    client = make_client(server)
+    root = Drives(client).by_id("d1").root
+
+    item = root.upload(io.BytesIO(content), "big.bin", fragment_size=2 * FRAGMENT_UNIT)
+
+    assert server.content == content
+    assert (
+        server.requests[0][1] == f"{url}/drives/d1/root:/big.bin:/createUploadSession"
+    )
+    assert item.id == "new"
+    assert item.url == f"{url}/drives/d1/items/new"
+    assert len(server.requests) == 1 + 8
+
+
+def test_upload_session_resumes(make_client, url, content, tmp_path):
+    server = FakeUploadServer(url, fail_at=[4 * FRAGMENT_UNIT])
+    client = make_client(server, retry_policy=RetryPolicy(backoff_factor=0))
+    path = tmp_path / "big.bin"
+    path.write_bytes(content)
+
+    session = Drives(client).by_id("d1").root.create_upload_session()
+    session.fragment_size = 2 * FRAGMENT_UNIT
+    data = session.upload(path)
+
+    assert data["size"] == len(content)
+    assert server.content == content
+    assert [m for m, _, _ in server.requests].count("GET") == 1
+
+
+def test_upload_session_from_iterator(make_client, url, content):
+    server = FakeUploadServer(url, fail_at=[2 * FRAGMENT_UNIT])
+    client = make_client(server)
+    chunks = (content[i : i + 1000] for i in range(0, len(content), 1000))
+
+    session = UploadSession(client, UPLOAD_URL, fragment_size=2 * FRAGMENT_UNIT)
+    with pytest.raises(ValueError):
+        session.upload(iter(()))
+    session.upload(chunks, size=len(content))
+
+    assert server.content == content
+
+
+def test_parallel_upload_session(make_client, url, content):
+    server = FakeUploadServer(url)
+    client = make_client(server)
+
+    session = UploadSession(
+        client, UPLOAD_URL, fragment_size=FRAGMENT_UNIT, max_workers=4
+    )
+    data = session.upload(io.BytesIO(content))
+
+    assert data["id"] == "new"
+    assert server.content == content
+
+
+def test_small_upload_uses_single_put(make_client, url):
+    server = FakeUploadServer(url)
+    client = make_client(server)
+
+    item = Drives(client).by_id("d1").items.by_id("f1").upload(b"hello" * 10)
+
+    assert [(m, u) for m, u, _ in server.requests] == [
+        (
+            "PUT",
+            f"{url}/drives/d1/items/f1/content"
+            "?@microsoft.graph.conflictBehavior=replace",
+        )
+    ]
+    assert server.requests[0][2]["Content-Type"] == "application/octet-stream"
+    assert item.size == 50
+
+
+def test_small_upload_conflict_behavior(make_client, url):
+    server = FakeUploadServer(url)
+    client = make_client(server)
+
+    Drives(client).by_id("d1").items.by_id("f1").upload(
+        b"hello", filename="a #1?%.txt", conflict_behavior="fail"
+    )
+
+    assert [u for _, u, _ in server.requests] == [
+        f"{url}/drives/d1/items/f1:/a%20%231%3F%25.txt:/content"
+        "?@microsoft.graph.conflictBehavior=fail"
+    ]
+
+
+def test_upload_requires_sync_client(make_async_client, url):
+    server = FakeUploadServer(url)
+    item = Drives(make_async_client(server)).by_id("d1").items.by_id("f1")
+
+    with pytest.raises(TypeError):
+        item.upload(b"hello")
+    with pytest.raises(TypeError):
+        item.upload(b"hello", filename="new.txt")
+    with pytest.raises(TypeError):
+        item.create_upload_session()
+    assert server.requests == []